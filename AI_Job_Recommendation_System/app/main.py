@@ -7,15 +7,29 @@ Initializes the FastAPI application and registers embedding and recommendation r
 
 Routes:
 -------
-- POST `/ingest/job`: Generate and return job embedding.
-- POST `/ingest/user`: Generate and return user embedding.
-- POST `/recommend`: Accepts user embedding and job embeddings, returns top_k recommendations.
-- GET `/health`: Health check endpoint.
+- POST `/ingest/job`: Generate job embedding, store it in the job index and return it.
+- POST `/ingest/jobs`: Bulk version of `/ingest/job` for many jobs in one request.
+- POST `/ingest/user`: Generate user embedding, store it in the user index and return it.
+- DELETE `/jobs/{job_id}`: Remove a job from the job index.
+- POST `/recommend`: Accepts a user id or embedding, returns top_k recommendations from the
+  job index (or from caller-supplied job embeddings, if given).
+- POST `/recommend/batch`: Returns top_k recommendations for many users in one call.
+- GET `/cache/stats`: Embedding cache hit/miss counters.
+- GET `/pool/stats`: Inference pool in-flight/rejected/timed-out counters.
+- GET `/`: Liveness check endpoint.
+- GET `/ready`: Readiness check; 503 until the model is loaded and warmed up, 500 if
+  initialization failed.
 
 Example:
 --------
 $ uvicorn main:app --reload
 
+The model loads in a background thread from the lifespan hook; model-backed routes
+return 503 until `/ready` does. With PRELOAD_MODEL=1 the model is loaded at import so
+`gunicorn --preload -k uvicorn.workers.UvicornWorker` shares it across forked workers.
+With SHARED_INDEX=1 (`python run.py --workers N`) all workers serve the job and user
+indexes from one memory-mapped snapshot instead of a private copy each.
+
 Dependencies:
 -------------
 - FastAPI
@@ -25,9 +39,15 @@ Dependencies:
 """
 
 # ===== main.py =====
-from fastapi import FastAPI
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-from typing import List
+from typing import List, Literal, Optional, Union
 import numpy as np
 from app.services.embedding_utils import (
     initialize_embedding_model,
@@ -36,6 +56,25 @@ from app.services.embedding_utils import (
     clean_text
 )
 from app.services.recommendation_engine import recommend_jobs
+from app.services.text_normalization import clean_texts
+from app.services.vector_index import VectorIndex
+from app.services.attribute_index import AttributeIndex
+from app.services.batcher import EmbeddingBatcher
+from app.services.embedding_cache import EmbeddingCache
+from app.services.skill_table import SkillEmbeddingTable, normalize_skill
+from app.services.inference_pool import (
+    InferencePool,
+    InferencePoolFull,
+    InferenceTimeout,
+    pin_compute_threads
+)
+from app.services.wire_format import (
+    decode_embedding,
+    decode_matrix,
+    encode_batch,
+    encode_embedding,
+    wants_binary
+)
 
 
 import logging
@@ -48,12 +87,163 @@ logger = logging.getLogger(__name__)
 # Log a startup message
 logger.info("Starting the application")
 
-app = FastAPI()
-embed_model = initialize_embedding_model(device='cpu')
+MODEL_NAME = os.getenv('MODEL_NAME', 'all-MiniLM-L6-v2')
+# EMBED_BACKEND=onnx serves an int8-quantized ONNX Runtime export instead of PyTorch
+EMBED_BACKEND = os.getenv('EMBED_BACKEND', 'torch')
+ONNX_THREADS = int(os.getenv('ONNX_THREADS', '0')) or None
+INDEX_DIR = os.getenv('INDEX_DIR', 'data/index')
+# SHARED_INDEX=1 (set by `run.py --workers N`): worker processes map the same index
+# snapshots copy-on-write and exchange changes through the shared write-ahead log
+SHARED_INDEX = os.getenv('SHARED_INDEX', '0') == '1'
+EMBED_MAX_BATCH = int(os.getenv('EMBED_MAX_BATCH', '64'))
+EMBED_MAX_WAIT_MS = float(os.getenv('EMBED_MAX_WAIT_MS', '5'))
+
+# Bounded executor for CPU-bound work: 429 beyond INFERENCE_QUEUE waiting tasks,
+# 504 after INFERENCE_TIMEOUT_S; each task uses at most COMPUTE_THREADS threads.
+INFERENCE_WORKERS = int(os.getenv('INFERENCE_WORKERS', '2'))
+COMPUTE_THREADS = int(os.getenv('COMPUTE_THREADS', '0')) or max(
+    1, (os.cpu_count() or 1) // INFERENCE_WORKERS
+)
+inference_pool = InferencePool(
+    workers=INFERENCE_WORKERS,
+    max_queue=int(os.getenv('INFERENCE_QUEUE', '64')),
+    timeout=float(os.getenv('INFERENCE_TIMEOUT_S', '30'))
+)
+
+# Service state, populated in the background by the lifespan hook
+ready = threading.Event()
+init_error: Optional[str] = None
+embed_model = None
+job_index: Optional[VectorIndex] = None
+job_attrs: Optional[AttributeIndex] = None
+user_index: Optional[VectorIndex] = None
+job_batcher: Optional[EmbeddingBatcher] = None
+skill_table: Optional[SkillEmbeddingTable] = None
+embed_cache: Optional[EmbeddingCache] = None
+
+
+def load_model():
+    """
+    Load the embedding model and run a warm-up encode so the first request does not
+    pay for lazy initialization (thread pools, kernels, tokenizer caches).
+    """
+    model = initialize_embedding_model(
+        MODEL_NAME,
+        device='cpu',
+        backend=EMBED_BACKEND,
+        onnx_dir=os.getenv('ONNX_MODEL_DIR'),
+        num_threads=ONNX_THREADS or COMPUTE_THREADS
+    )
+    pin_compute_threads(COMPUTE_THREADS)
+    generate_job_embeddings(model, ['warm-up encode'])
+    return model
+
+
+def init_services():
+    """
+    Load the model (unless preloaded) and open the per-process indexes, caches and
+    batcher, then mark the service ready. A failure is recorded in `init_error` so
+    `/ready` reports it instead of staying "loading".
+    """
+    global embed_model, job_index, job_attrs, user_index, job_batcher, skill_table, embed_cache
+    global init_error
+    init_error = None
+    try:
+        start = time.perf_counter()
+        if embed_model is None:
+            embed_model = load_model()
+        embed_dim = embed_model.get_sentence_embedding_dimension()
+
+        # Persistent job/user vector indexes, populated by the ingest endpoints
+        job_index = VectorIndex(embed_dim, os.path.join(INDEX_DIR, 'jobs'), shared=SHARED_INDEX)
+        user_index = VectorIndex(embed_dim, os.path.join(INDEX_DIR, 'users'), shared=SHARED_INDEX)
+        # Location / title-token postings for filtered /recommend
+        job_attrs = AttributeIndex(os.path.join(INDEX_DIR, 'job_attrs'), shared=SHARED_INDEX)
+
+        # Coalesce concurrent single-job ingests into batched encodes, run on the
+        # inference pool's workers so they count against its compute limit
+        job_batcher = EmbeddingBatcher(
+            embed_model,
+            max_batch_size=EMBED_MAX_BATCH,
+            max_wait=EMBED_MAX_WAIT_MS / 1000,
+            executor=inference_pool.executor
+        )
+
+        # Precomputed per-skill vectors: user embeddings become a gather + mean
+        skill_table = SkillEmbeddingTable(
+            embed_dim,
+            os.getenv('SKILL_TABLE_DIR', 'data/skills'),
+            model_name=MODEL_NAME,
+            backend=EMBED_BACKEND
+        )
+
+        # Skip re-encoding unchanged job descriptions and skill lists
+        embed_cache = EmbeddingCache(
+            MODEL_NAME,
+            path=os.getenv('EMBED_CACHE_PATH', 'data/cache/embeddings.sqlite3'),
+            max_items=int(os.getenv('EMBED_CACHE_SIZE', '10000')),
+            backend=EMBED_BACKEND
+        )
+        ready.set()
+        logger.info("Service ready in %.1fs", time.perf_counter() - start)
+    except Exception as e:
+        init_error = f'{type(e).__name__}: {e}'
+        logger.exception("Service initialization failed")
+
+
+def close_services():
+    ready.clear()
+    # The batcher drains its queue on the pool's workers, so stop it first
+    if job_batcher is not None:
+        job_batcher.close()
+    inference_pool.shutdown()
+    if embed_cache is not None:
+        embed_cache.close()
+    if skill_table is not None:
+        skill_table.save()
+    if job_index is not None:
+        job_index.close()
+    if job_attrs is not None:
+        job_attrs.close()
+    if user_index is not None:
+        user_index.close()
+
+
+# PRELOAD_MODEL=1 loads the model at import time so a pre-forking server
+# (gunicorn --preload) loads it once and workers share its pages copy-on-write.
+if os.getenv('PRELOAD_MODEL', '0') == '1':
+    embed_model = load_model()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load in the background so the worker starts accepting (liveness) traffic
+    # immediately; /ready reports when the model can serve requests.
+    threading.Thread(target=init_services, name='init-services', daemon=True).start()
+    yield
+    close_services()
+
+
+def require_ready():
+    if init_error is not None:
+        raise HTTPException(status_code=503, detail=f'service failed to initialize: {init_error}')
+    if not ready.is_set():
+        raise HTTPException(status_code=503, detail='model is loading')
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Embedding wire format: JSON float lists, or base64 little-endian float32/float16
+EmbeddingFormat = Literal['json', 'b64f32', 'b64f16']
 
 class JobIn(BaseModel):
     job_id: int
     description: str
+    title: Optional[str] = None       # Indexed for title_keywords filters
+    location: Optional[str] = None    # Indexed for locations filters
+
+class JobsIn(BaseModel):
+    jobs: List[JobIn]
 
 class UserIn(BaseModel):
     user_id: int
@@ -61,50 +251,234 @@ class UserIn(BaseModel):
 
 class RecommendRequest(BaseModel):
     user_id: int
-    user_embedding: List[float]
-    job_ids: List[int]
-    job_embeddings: List[List[float]]
+    user_embedding: Optional[Union[List[float], str]] = None        # Falls back to the stored user embedding
+    job_ids: Optional[List[int]] = None
+    job_embeddings: Optional[Union[List[List[float]], str]] = None  # Legacy: rank these instead of the job index
+    embedding_format: EmbeddingFormat = 'b64f32'    # How string-valued embeddings are encoded
     top_k: int = 100    # Number of recommendations to return
+    locations: Optional[List[str]] = None        # Only jobs in any of these locations
+    title_keywords: Optional[List[str]] = None   # Only jobs whose title has all of these words
+
+class RecommendBatchRequest(BaseModel):
+    user_ids: List[int]
+    user_embeddings: Optional[Union[List[List[float]], str]] = None  # Falls back to the stored user embeddings
+    embedding_format: EmbeddingFormat = 'b64f32'
+    top_k: int = 100
 
-@app.post('/ingest/job')
-def ingest_job(job: JobIn):
+@app.post('/ingest/job', dependencies=[Depends(require_ready)])
+async def ingest_job(job: JobIn, embedding_format: EmbeddingFormat = 'json'):
     """
-    Receive a single job JSON, generate its embedding, and return it.
-    Backend persistence is handled by the caller.
+    Receive a single job JSON, generate its embedding, store it in the job index
+    (replacing any previous embedding for the same job_id) and return it, encoded
+    per the `embedding_format` query parameter.
     """
     text = job.description
     text = clean_text(text)
-    emb = generate_job_embeddings(embed_model, [text])[0]
+    emb = await run_in_threadpool(embed_cache.get, text)
+    if emb is None:
+        # Admitted before the text is queued, so a 429 never reaches the batcher
+        emb = await inference_pool.wait(job_batcher.submit, text)
+        await run_in_threadpool(embed_cache.put, text, emb)
+    await run_in_threadpool(job_index.add, [job.job_id], emb[None, :])
+    await run_in_threadpool(job_attrs.add, job.job_id, job.location, job.title)
     return {
         'status': 'job embedding generated',
         'job_id': job.job_id,
-        'embedding': emb.tolist()
+        'embedding': encode_embedding(emb, embedding_format)
+    }
+
+def _ingest_jobs(batch: JobsIn, embedding_format: str, media_type: Optional[str]):
+    texts = clean_texts(job.description for job in batch.jobs)
+    job_ids = [job.job_id for job in batch.jobs]
+    cached = embed_cache.get_many(texts)
+    missing = [j for j, emb in enumerate(cached) if emb is None]
+    if missing:
+        new_embs = generate_job_embeddings(
+            embed_model, [texts[j] for j in missing], batch_size=EMBED_MAX_BATCH
+        )
+        embed_cache.put_many([texts[j] for j in missing], new_embs)
+        for j, emb in zip(missing, new_embs):
+            cached[j] = emb
+    embs = np.stack(cached)
+    job_index.add(job_ids, embs)
+    job_attrs.add_many(job_ids, [job.location for job in batch.jobs], [job.title for job in batch.jobs])
+    if media_type is not None:
+        return Response(content=encode_batch(job_ids, embs, media_type), media_type=media_type)
+    return {
+        'status': 'job embeddings generated',
+        'jobs': [
+            {'job_id': job_id, 'embedding': encode_embedding(emb, embedding_format)}
+            for job_id, emb in zip(job_ids, embs)
+        ]
     }
 
-@app.post('/ingest/user')
-def ingest_user(user: UserIn):
+@app.post('/ingest/jobs', dependencies=[Depends(require_ready)])
+async def ingest_jobs(
+    batch: JobsIn,
+    embedding_format: EmbeddingFormat = 'json',
+    accept: Optional[str] = Header(default=None)
+):
     """
-    Receive a single user JSON, generate its embedding, and return it.
-    Backend persistence is handled by the caller.
+    Receive many jobs at once, embed them in batches of EMBED_MAX_BATCH, store them
+    in the job index and return their embeddings in request order.
+
+    `Accept: application/octet-stream` or `application/msgpack` returns a binary
+    body of ids + float32 embeddings instead of JSON.
     """
-    emb = generate_user_embedding(embed_model, user.skills)
+    if not batch.jobs:
+        return {'status': 'job embeddings generated', 'jobs': []}
+    return await inference_pool.run(_ingest_jobs, batch, embedding_format, wants_binary(accept))
+
+def _ingest_user(user: UserIn, embedding_format: str):
+    # Key on the strings the skill table actually encodes; mean pooling ignores
+    # skill order, so sort them for a stable key
+    key = '\n'.join(sorted(normalize_skill(skill) for skill in user.skills))
+    emb = embed_cache.get(key, namespace='user')
+    if emb is None:
+        emb = generate_user_embedding(embed_model, user.skills, skill_table)
+        embed_cache.put(key, emb, namespace='user')
+    user_index.add([user.user_id], emb[None, :])
     return {
         'status': 'user embedding generated',
         'user_id': user.user_id,
-        'embedding': emb.tolist()
+        'embedding': encode_embedding(emb, embedding_format)
     }
 
-@app.post('/recommend')
-def recommend(req: RecommendRequest):
+@app.post('/ingest/user', dependencies=[Depends(require_ready)])
+async def ingest_user(user: UserIn, embedding_format: EmbeddingFormat = 'json'):
     """
-    Receive precomputed user embedding and a list of job IDs + job embeddings,
-    compute similarity, and return top_k recommendations.
+    Receive a single user JSON, generate its embedding, store it in the user index
+    and return it, encoded per the `embedding_format` query parameter.
+    """
+    return await inference_pool.run(_ingest_user, user, embedding_format)
+
+@app.delete('/jobs/{job_id}', dependencies=[Depends(require_ready)])
+def delete_job(job_id: int):
     """
-    user_emb = np.array(req.user_embedding, dtype='float32')
-    job_embs = np.array(req.job_embeddings, dtype='float32')
-    recs = recommend_jobs(user_emb, req.job_ids, job_embs, top_k=req.top_k)
+    Remove a job from the job index.
+    """
+    job_attrs.remove(job_id)
+    if not job_index.remove([job_id]):
+        raise HTTPException(status_code=404, detail=f'job {job_id} not found')
+    return {'status': 'job deleted', 'job_id': job_id}
+
+def _check_dim(embs: np.ndarray, name: str):
+    # Vectors must live in the same space as the indexed embeddings
+    if embs.shape[-1] != job_index.dim:
+        raise HTTPException(status_code=422, detail=f'{name} must have {job_index.dim} dimensions')
+
+def _recommend(req: RecommendRequest):
+    if req.user_embedding is not None:
+        try:
+            user_emb = decode_embedding(req.user_embedding, req.embedding_format)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=f'invalid user_embedding: {e}')
+        _check_dim(user_emb, 'user_embedding')
+    else:
+        user_emb = user_index.get(req.user_id)
+        if user_emb is None:
+            raise HTTPException(status_code=404, detail=f'user {req.user_id} not found')
+
+    # Resolve filters to the matching job ids before any similarity is computed
+    allowed = job_attrs.match(req.locations, req.title_keywords)
+
+    if req.job_embeddings is not None:
+        if req.job_ids is None:
+            raise HTTPException(status_code=422, detail='job_ids must match job_embeddings')
+        try:
+            job_embs = decode_matrix(req.job_embeddings, len(req.job_ids), req.embedding_format)
+        except ValueError:
+            raise HTTPException(status_code=422, detail='job_ids must match job_embeddings')
+        _check_dim(job_embs, 'job_embeddings')
+        job_ids = np.asarray(req.job_ids)
+        if allowed is not None:
+            keep = np.isin(job_ids, allowed)
+            job_ids, job_embs = job_ids[keep], job_embs[keep]
+        recs = recommend_jobs(user_emb, job_ids, job_embs, top_k=req.top_k)
+    else:
+        recs = job_index.search(user_emb, top_k=req.top_k, ids=allowed)
     return {'recommendations': recs}
 
+@app.post('/recommend', dependencies=[Depends(require_ready)])
+async def recommend(req: RecommendRequest):
+    """
+    Rank jobs for a user and return top_k recommendations.
+
+    The user embedding is taken from the request or, if omitted, from the user index.
+    Jobs are searched in the job index unless the caller supplies `job_ids` and
+    `job_embeddings`, in which case only those are ranked. `locations` and
+    `title_keywords` restrict ranking to matching jobs (still returning top_k).
+    """
+    return await inference_pool.run(_recommend, req)
+
+def _recommend_batch(req: RecommendBatchRequest):
+    if req.user_embeddings is not None:
+        try:
+            user_embs = decode_matrix(req.user_embeddings, len(req.user_ids), req.embedding_format)
+        except ValueError:
+            raise HTTPException(status_code=422, detail='user_ids must match user_embeddings')
+        _check_dim(user_embs, 'user_embeddings')
+        user_ids = req.user_ids
+    else:
+        user_ids, user_embs = user_index.get_many(req.user_ids)
+
+    found = set(user_ids)
+    missing = [user_id for user_id in req.user_ids if user_id not in found]
+    recs = job_index.search_batch(user_embs, top_k=req.top_k) if user_ids else []
+    return {
+        'recommendations': [
+            {'user_id': user_id, 'recommendations': user_recs}
+            for user_id, user_recs in zip(user_ids, recs)
+        ],
+        'missing': missing
+    }
+
+@app.post('/recommend/batch', dependencies=[Depends(require_ready)])
+async def recommend_batch(req: RecommendBatchRequest):
+    """
+    Rank the whole job index for many users at once with blocked matrix products.
+    Users without a supplied or stored embedding are listed under `missing`.
+    """
+    return await inference_pool.run(_recommend_batch, req)
+
+@app.get('/cache/stats', dependencies=[Depends(require_ready)])
+def cache_stats():
+    """
+    Embedding cache hit/miss counters.
+    """
+    return embed_cache.stats()
+
+@app.get('/pool/stats')
+def pool_stats():
+    """
+    Inference pool in-flight, rejected and timed-out counters.
+    """
+    return inference_pool.stats()
+
+@app.exception_handler(InferencePoolFull)
+async def pool_full_handler(request: Request, exc: InferencePoolFull):
+    return JSONResponse(status_code=429, content={'detail': 'server busy, retry later'},
+                        headers={'Retry-After': '1'})
+
+@app.exception_handler(InferenceTimeout)
+async def pool_timeout_handler(request: Request, exc: InferenceTimeout):
+    return JSONResponse(status_code=504, content={'detail': str(exc)})
+
 @app.get('/')
 def health():
+    """
+    Liveness probe: the process is up (the model may still be loading).
+    """
     return {'status': 'ok'}
+
+@app.get('/ready')
+def readiness():
+    """
+    Readiness probe: 200 once the model is loaded and warmed up, 503 before, and 500
+    with the error if initialization failed (the orchestrator should restart the pod).
+    """
+    if init_error is not None:
+        return JSONResponse(status_code=500, content={'status': 'failed', 'error': init_error})
+    if not ready.is_set():
+        return JSONResponse(status_code=503, content={'status': 'loading'})
+    return {'status': 'ready'}
@@ -0,0 +1,367 @@
+"""
+attribute_index.py
+
+Inverted Attribute Index for Filtered Recommendations
+
+Ranking the whole catalog and filtering afterwards ("jobs in Cairo") forces callers to
+over-fetch and can still return fewer than top_k matches. `AttributeIndex` keeps
+inverted posting sets from location and title-token terms to job ids. A filter is
+resolved to the sorted array of matching ids before any similarity is computed, so
+the vector scan only touches that subset and returns exactly top_k (or every match,
+if there are fewer).
+
+Matching rules:
+---------------
+- `locations`: any of the given locations (OR). A job's location is indexed whole and
+  by each comma-separated part, so "Cairo" matches "Cairo, Egypt".
+- `title_keywords`: every keyword token must appear in the job title (AND). Tokens are
+  Unicode word characters, so non-Latin titles are indexed too; a keyword without any
+  word character matches no job.
+- Terms are case-insensitive and whitespace-normalized.
+
+Persistence:
+------------
+With a `path`, every change is appended to `attrs.jsonl` and replayed on load; the
+log is rewritten from the live state once it is more than twice as long.
+
+Shared (multi-process) mode:
+----------------------------
+With `shared=True`, several worker processes open the same `path`, as with
+`VectorIndex`. Changes are appended to the common log under a shared `flock` on
+`lock` and applied by replaying it, so every worker sees every other worker's jobs
+in the same order; filters pick up other workers' changes at most
+`refresh_interval` seconds late. Rewriting the log takes the lock exclusively, and
+the other workers rebuild their postings from the rewritten log on their next
+refresh (POSIX only).
+
+Key Functions / Classes:
+------------------------
+- `location_terms(location) -> Set[str]`: Index terms for a location string.
+- `title_tokens(title) -> Set[str]`: Lower-cased word tokens of a title.
+- `AttributeIndex(path, shared)`:
+    - `add(item_id, location, title)` / `add_many(ids, locations, titles)`: Index jobs.
+    - `remove(item_id)`: Drop a job's terms.
+    - `match(locations, title_keywords) -> Optional[np.ndarray]`: Sorted ids matching
+      the filter, or None when no filter is given.
+    - `refresh()`: (shared mode) Apply changes made by other processes.
+
+Usage:
+------
+>>> attrs = AttributeIndex()
+>>> attrs.add(42, location="Cairo, Egypt", title="Senior Python Developer")
+>>> attrs.match(locations=["cairo"], title_keywords=["python"])
+array([42])
+
+Dependencies:
+-------------
+- numpy
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no shared mode
+    fcntl = None
+
+_TOKEN_RE = re.compile(r"[\w+#]+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(value: str) -> str:
+    return _SPACE_RE.sub(" ", value.casefold()).strip()
+
+
+def location_terms(location: Optional[str]) -> Set[str]:
+    """
+    The whole normalized location plus each of its comma-separated parts.
+    """
+    if not location:
+        return set()
+    whole = _normalize(location)
+    terms = {part.strip() for part in whole.split(",")}
+    terms.add(whole)
+    terms.discard("")
+    return terms
+
+
+def title_tokens(title: Optional[str]) -> Set[str]:
+    """
+    Case-folded word tokens of a title, in any script ("C++"/"C#" keep their symbols).
+    """
+    return set(_TOKEN_RE.findall(title.casefold())) if title else set()
+
+
+class AttributeIndex:
+    """
+    Thread-safe inverted index from location / title terms to job ids.
+    """
+
+    def __init__(self, path: Optional[str] = None, shared: bool = False, refresh_interval: float = 1.0):
+        if shared and (not path or fcntl is None):
+            raise ValueError("shared mode needs a path and POSIX file locking")
+        self.path = path
+        self.shared = shared
+        self.refresh_interval = refresh_interval
+        self.lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, Set[int]]] = {"location": {}, "title": {}}
+        self._attrs: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        self._log_file = None
+        self._log_count = 0
+        self._log_offset = 0
+        self._log_ino = None
+        self._lock_file = None
+        self._refreshed = 0.0
+        if path:
+            os.makedirs(path, exist_ok=True)
+            if shared:
+                self._lock_file = open(os.path.join(path, "lock"), "ab")
+            # Exclusive while loading: a torn log tail may be truncated
+            with self._flock(fcntl.LOCK_EX if shared else None):
+                self._replay(truncate_torn=True)
+                self._open_log()
+
+    def __len__(self) -> int:
+        return len(self._attrs)
+
+    def add(self, item_id: int, location: Optional[str] = None, title: Optional[str] = None) -> None:
+        """
+        Index (or re-index) one job's location and title.
+        """
+        self.add_many([item_id], [location], [title])
+
+    def add_many(
+        self,
+        ids: Iterable[int],
+        locations: Sequence[Optional[str]],
+        titles: Sequence[Optional[str]],
+    ) -> None:
+        records = [{"id": int(item_id), "location": location, "title": title}
+                   for item_id, location, title in zip(ids, locations, titles)]
+        with self.lock:
+            self._mutate(records)
+
+    def remove(self, item_id: int) -> bool:
+        """
+        Drop a job from the index. Returns whether it was present.
+        """
+        with self.lock:
+            return self._mutate([{"id": int(item_id), "remove": True}]) > 0
+
+    def match(
+        self,
+        locations: Optional[Sequence[str]] = None,
+        title_keywords: Optional[Sequence[str]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Return the sorted ids matching any of `locations` and all `title_keywords`,
+        or None if neither filter is given.
+        """
+        if not locations and not title_keywords:
+            return None
+        with self.lock:
+            self._maybe_refresh()
+            sets: List[Set[int]] = []
+            if locations:
+                postings = self._postings["location"]
+                union: Set[int] = set()
+                for location in locations:
+                    union |= postings.get(_normalize(location), set())
+                sets.append(union)
+            if title_keywords:
+                postings = self._postings["title"]
+                for keyword in title_keywords:
+                    tokens = title_tokens(keyword)
+                    if not tokens:
+                        # Nothing indexable in the keyword, so no title contains it
+                        return np.zeros(0, dtype="int64")
+                    sets.extend(postings.get(token, set()) for token in tokens)
+            # Intersect smallest-first so the working set only shrinks
+            sets.sort(key=len)
+            result = set(sets[0])
+            for other in sets[1:]:
+                if not result:
+                    break
+                result &= other
+        return np.sort(np.fromiter(result, dtype="int64", count=len(result)))
+
+    def refresh(self) -> None:
+        """
+        Shared mode: apply changes other processes appended to the log.
+        """
+        if not self.shared:
+            return
+        with self.lock, self._flock(fcntl.LOCK_SH):
+            self._catch_up()
+
+    def close(self) -> None:
+        with self.lock:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+
+    @property
+    def _log_path(self) -> str:
+        return os.path.join(self.path, "attrs.jsonl")
+
+    def _terms(self, location: Optional[str], title: Optional[str]) -> Dict[str, Set[str]]:
+        return {"location": location_terms(location), "title": title_tokens(title)}
+
+    def _apply_add(self, item_id: int, location: Optional[str], title: Optional[str]) -> None:
+        self._apply_remove(item_id)
+        self._attrs[item_id] = (location, title)
+        for kind, terms in self._terms(location, title).items():
+            postings = self._postings[kind]
+            for term in terms:
+                postings.setdefault(term, set()).add(item_id)
+
+    def _apply_remove(self, item_id: int) -> bool:
+        attrs = self._attrs.pop(item_id, None)
+        if attrs is None:
+            return False
+        for kind, terms in self._terms(*attrs).items():
+            postings = self._postings[kind]
+            for term in terms:
+                ids = postings.get(term)
+                if ids is not None:
+                    ids.discard(item_id)
+                    if not ids:
+                        del postings[term]
+        return True
+
+    @contextmanager
+    def _flock(self, op: Optional[int]):
+        # Cross-process lock on the shared log; a no-op outside shared mode
+        if op is None or self._lock_file is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, op)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _open_log(self) -> None:
+        # Unbuffered in shared mode: one append is one write() under O_APPEND
+        self._log_file = open(self._log_path, "ab", buffering=0 if self.shared else -1)
+        self._log_ino = os.fstat(self._log_file.fileno()).st_ino
+
+    def _apply(self, record: dict) -> bool:
+        if record.get("remove"):
+            return self._apply_remove(record["id"])
+        self._apply_add(record["id"], record.get("location"), record.get("title"))
+        return False
+
+    def _replay(self, truncate_torn: bool = False) -> None:
+        """
+        Apply the complete log records past `_log_offset`.
+        """
+        if not os.path.exists(self._log_path):
+            return
+        with open(self._log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+        good = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            self._apply(record)
+            self._log_count += 1
+            good += len(line)
+        self._log_offset += good
+        if truncate_torn and good != len(data):
+            # Drop a torn trailing record left by a crash mid-write
+            with open(self._log_path, "r+b") as f:
+                f.truncate(self._log_offset)
+
+    def _catch_up(self) -> None:
+        """
+        Shared mode, under the file lock: rebuild from the log if another process
+        rewrote it, then apply records appended since the last catch-up.
+        """
+        if os.stat(self._log_path).st_ino != self._log_ino:
+            self._postings = {"location": {}, "title": {}}
+            self._attrs = {}
+            self._log_offset = self._log_count = 0
+            self._log_file.close()
+            self._open_log()
+        self._replay()
+        self._refreshed = time.monotonic()
+
+    def _maybe_refresh(self) -> None:
+        if self.shared and time.monotonic() - self._refreshed >= self.refresh_interval:
+            with self._flock(fcntl.LOCK_SH):
+                self._catch_up()
+
+    def _mutate(self, records: List[dict]) -> int:
+        """
+        Apply and log a batch of records. Returns how many removed ids were present.
+        """
+        if not records:
+            return 0
+        if not self.shared:
+            removed = sum(self._apply(record) for record in records)
+            self._log(records)
+        else:
+            # Shared mode: append to the common log, then apply it in log order, so
+            # every process sees the same sequence of changes
+            with self._flock(fcntl.LOCK_SH):
+                self._catch_up()
+                removed = sum(1 for r in records if r.get("remove") and r["id"] in self._attrs)
+                self._log(records)
+                self._catch_up()
+        self._maybe_rewrite()
+        return removed
+
+    def _log(self, records: List[dict]) -> None:
+        if self._log_file is None:
+            return
+        data = "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+        self._log_file.write(data)
+        self._log_file.flush()
+        if not self.shared:
+            # Shared mode counts records as they are replayed
+            self._log_count += len(records)
+            self._log_offset += len(data)
+
+    def _maybe_rewrite(self) -> None:
+        if self._log_file is None or self._log_count <= 2 * len(self._attrs) + 1000:
+            return
+        with self._flock(fcntl.LOCK_EX if self.shared else None):
+            if self.shared:
+                # Another process may have rewritten the log while we waited
+                self._catch_up()
+                if self._log_count <= 2 * len(self._attrs) + 1000:
+                    return
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".attrs-")
+        with os.fdopen(fd, "wb") as f:
+            for item_id, (location, title) in self._attrs.items():
+                f.write((json.dumps({"id": item_id, "location": location, "title": title}) + "\n").encode("utf-8"))
+        self._log_file.close()
+        os.replace(tmp, self._log_path)
+        self._open_log()
+        self._log_offset = os.path.getsize(self._log_path)
+        self._log_count = len(self._attrs)
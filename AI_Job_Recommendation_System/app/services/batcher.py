@@ -0,0 +1,138 @@
+"""
+batcher.py
+
+Dynamic Micro-Batching for SBERT Encodes
+
+Single-job ingest requests each carry one short text, and encoding them one at a time
+wastes most of a forward pass. `EmbeddingBatcher` runs a background thread that
+collects texts submitted by concurrent requests for up to `max_wait` seconds (or until
+`max_batch_size` texts are queued), sorts them by length so each padded batch holds
+similarly sized inputs, and embeds them with a single `generate_job_embeddings` call.
+When given an `executor` (the inference pool's), each batch encode runs on one of its
+worker threads, so batched encodes share the pool's compute limit instead of adding an
+extra unbounded thread.
+
+Key Class:
+----------
+- `EmbeddingBatcher(model, max_batch_size, max_wait, executor)`:
+    - `submit(text) -> Future`: Queue a text; the future resolves to its embedding.
+    - `encode(text) -> np.ndarray`: Submit and wait for the embedding.
+    - `close()`: Stop the worker thread after draining queued texts.
+
+Usage:
+------
+>>> batcher = EmbeddingBatcher(embed_model, max_batch_size=64, max_wait=0.005)
+>>> emb = batcher.encode(clean_text(job.description))
+
+Dependencies:
+-------------
+- sentence-transformers
+- numpy
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from app.services.embedding_utils import generate_job_embeddings
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = logging.getLogger(__name__)
+
+_STOP = None
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text encode requests into length-sorted batches.
+    """
+
+    def __init__(
+        self,
+        model: "SentenceTransformer",
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+        executor: Optional[Executor] = None,
+    ):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for embedding and return a future for its vector.
+        """
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Embed a single text through the shared batch and wait for the result.
+        """
+        return self.submit(text).result()
+
+    def close(self) -> None:
+        """
+        Stop the worker thread once all queued texts are embedded.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self) -> Tuple[List[Tuple[str, Future]], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            # Skip texts whose caller already gave up (cancelled future)
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            # Similar lengths per batch keep padding (and wasted compute) low
+            batch.sort(key=lambda item: len(item[0]))
+            texts = [text for text, _ in batch]
+            try:
+                embs = self._encode(texts)
+            except Exception as exc:
+                logger.exception("Batch encode of %d texts failed", len(texts))
+                for _, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (_, future), emb in zip(batch, embs):
+                future.set_result(emb)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self.executor is None:
+            return generate_job_embeddings(self.model, texts, batch_size=len(texts))
+        return self.executor.submit(
+            generate_job_embeddings, self.model, texts, batch_size=len(texts)
+        ).result()
@@ -0,0 +1,349 @@
+"""
+catalog_store.py
+
+Append-Only, Memory-Mapped Job Catalog Store
+
+`JobCache` used to re-read the job CSV, re-clean every row and either load a full
+`.npy` or re-embed the whole catalog on every reload. `CatalogStore` keeps the
+embedded catalog on disk as append-only columnar files so that:
+
+- Startup maps the embedding matrix read-only (`np.memmap`) instead of copying it,
+  and every worker process opening the same store shares the same page-cache pages.
+- `sync()` diffs the current job table against the store by content hash, appends
+  rows only for new or changed jobs, encodes only texts that were never embedded
+  before, and marks replaced or deleted rows as dead.
+
+Layout (one generation `<gen>` is current; rows are append-only within it):
+---------------------------------------------------------------------------
+- `emb.<gen>.f32`: float32 embeddings, row-major (rows x dim).
+- `rows.<gen>.bin`: fixed-size records `(job_id <i8, text_hash V16, row_hash V16)`.
+- `<column>.<gen>.txt` / `<column>.<gen>.off`: UTF-8 blob of a metadata column and
+  its int64 end offsets, one per row.
+- `live.<gen>.<version>.npy`: bool mask of live rows. Every sync writes a new version,
+  so the mask always has exactly the rows of the manifest that names it.
+- `manifest.json`: generation, row count, live mask version and byte sizes of the
+  committed data. It is replaced last, so one rename publishes the new rows and their
+  mask together; bytes past the manifest (a torn append) are ignored and truncated on
+  the next sync.
+
+When dead rows outnumber live ones, `sync()` rewrites the live rows into a new
+generation. Old files are unlinked, but readers that still map them keep a valid view.
+
+Key Class:
+----------
+- `CatalogStore(path, model_name, dim, columns)`:
+    - `sync(df, encode, text_column) -> Dict[str, int]`: Incrementally update from a job table.
+    - `embeddings() -> np.ndarray`: Read-only (rows x dim) memmap, including dead rows.
+    - `records() -> np.ndarray`: Per-row job_id and hashes.
+    - `live() -> np.ndarray`: Bool mask of live rows.
+    - `column(name) -> List[str]`: Decode one metadata column.
+    - `refresh()`: Re-read the manifest written by another process.
+
+Usage:
+------
+>>> store = CatalogStore("data/catalog", model_name="all-MiniLM-L6-v2")
+>>> store.sync(jobs_df, lambda texts: generate_job_embeddings(model, texts))
+>>> sims = store.embeddings() @ user_emb
+
+Dependencies:
+-------------
+- numpy
+- pandas
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer deployments only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ROW_DTYPE = np.dtype([("job_id", "<i8"), ("text_hash", "V16"), ("row_hash", "V16")])
+DEFAULT_COLUMNS = ("Job_title", "Description", "Location")
+
+
+def _digest(*parts: str) -> bytes:
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
+
+
+class CatalogStore:
+    """
+    Disk-backed job catalog: memory-mapped embeddings plus columnar metadata.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model_name: str,
+        dim: Optional[int] = None,
+        columns: Sequence[str] = DEFAULT_COLUMNS,
+        compact_ratio: float = 1.0,
+    ):
+        self.path = path
+        self.model_name = model_name
+        self.dim = dim
+        self.columns = list(columns)
+        self.compact_ratio = compact_ratio
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._manifest: Dict = {}
+        self.refresh()
+
+    def __len__(self) -> int:
+        return self._manifest.get("rows", 0)
+
+    # ----------------------------------------------------------------
+    # Readers
+    # ----------------------------------------------------------------
+
+    def refresh(self) -> None:
+        """
+        Re-read the manifest (e.g. after another process synced the store).
+        """
+        manifest_path = os.path.join(self.path, "manifest.json")
+        manifest, gen = None, 0
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest["model"] != self.model_name or manifest["columns"] != self.columns:
+                logger.warning("Catalog at %s was built for %s; starting a new generation",
+                               self.path, manifest["model"])
+                manifest, gen = None, manifest["gen"] + 1
+            elif self.dim is not None and manifest["dim"] != self.dim:
+                raise ValueError(f"Catalog at {self.path} has dim {manifest['dim']}, expected {self.dim}")
+        if manifest is None:
+            manifest = {"model": self.model_name, "columns": self.columns, "dim": self.dim,
+                        "gen": gen, "rows": 0, "live": 0, "text_bytes": {c: 0 for c in self.columns}}
+        self._manifest = manifest
+        self.dim = manifest["dim"]
+
+    def embeddings(self) -> np.ndarray:
+        """
+        Read-only memmap of all committed rows (dead rows included; see `live()`).
+        """
+        rows = len(self)
+        if rows == 0:
+            return np.empty((0, self.dim or 0), dtype="float32")
+        return np.memmap(self._file("emb", "f32"), dtype="float32", mode="r", shape=(rows, self.dim))
+
+    def records(self) -> np.ndarray:
+        rows = len(self)
+        if rows == 0:
+            return np.empty(0, dtype=ROW_DTYPE)
+        return np.memmap(self._file("rows", "bin"), dtype=ROW_DTYPE, mode="r", shape=(rows,))
+
+    def live(self) -> np.ndarray:
+        """
+        Bool mask of live rows, one entry per committed row.
+        """
+        rows = len(self)
+        if rows == 0:
+            return np.zeros(0, dtype=bool)
+        mask = np.load(self._live_file(self._manifest["live"]))
+        if len(mask) < rows:
+            raise ValueError(f"Live mask of catalog {self.path} has {len(mask)} rows, expected {rows}")
+        return mask[:rows]
+
+    def column(self, name: str) -> List[str]:
+        """
+        Decode a metadata column for every committed row.
+        """
+        rows = len(self)
+        if rows == 0:
+            return []
+        offsets = np.fromfile(self._file(name, "off"), dtype="<i8", count=rows)
+        with open(self._file(name, "txt"), "rb") as f:
+            blob = f.read(int(offsets[-1]))
+        starts = np.concatenate(([0], offsets[:-1]))
+        return [blob[s:e].decode("utf-8") for s, e in zip(starts.tolist(), offsets.tolist())]
+
+    def frame(self) -> pd.DataFrame:
+        """
+        DataFrame of `job_id` plus metadata columns, aligned with `embeddings()` rows.
+        """
+        data = {"job_id": self.records()["job_id"].astype(int)}
+        for name in self.columns:
+            data[name] = self.column(name)
+        return pd.DataFrame(data)
+
+    # ----------------------------------------------------------------
+    # Writer
+    # ----------------------------------------------------------------
+
+    def sync(
+        self,
+        df: pd.DataFrame,
+        encode: Callable[[List[str]], np.ndarray],
+        text_column: str = "text",
+    ) -> Dict[str, int]:
+        """
+        Make the live rows match `df` (one row per `job_id`). Unchanged jobs are kept,
+        new or changed jobs are appended, and only texts without a stored embedding
+        are passed to `encode`. Returns counts of kept/appended/encoded/removed rows.
+        """
+        with self.lock, self._file_lock():
+            self.refresh()
+            records = np.array(self.records())
+            live = self.live()
+            current = {int(records["job_id"][r]): r for r in np.flatnonzero(live)}
+            # Any committed row (dead or alive) can donate its embedding by text hash
+            by_text = {h.tobytes(): r for r, h in enumerate(records["text_hash"])}
+
+            texts = df[text_column].astype(str).tolist()
+            meta = {c: df[c].astype(str).tolist() for c in self.columns}
+            job_ids = df["job_id"].astype("int64").tolist()
+
+            keep, new_rows, seen = [], [], set()
+            for i, job_id in enumerate(job_ids):
+                seen.add(job_id)
+                text_hash = _digest(texts[i])
+                row_hash = _digest(texts[i], *(meta[c][i] for c in self.columns))
+                row = current.get(job_id)
+                if row is not None and records["row_hash"][row].tobytes() == row_hash:
+                    keep.append(row)
+                else:
+                    new_rows.append((i, text_hash, row_hash))
+            removed = sum(1 for job_id in current if job_id not in seen)
+
+            to_encode = list(dict.fromkeys(
+                texts[i] for i, text_hash, _ in new_rows if text_hash not in by_text
+            ))
+            encoded = {}
+            if to_encode:
+                vecs = np.asarray(encode(to_encode), dtype="float32")
+                if self.dim is None:
+                    self.dim = self._manifest["dim"] = int(vecs.shape[1])
+                encoded = dict(zip(to_encode, vecs))
+
+            new_live = np.zeros(len(records) + len(new_rows), dtype=bool)
+            new_live[keep] = True
+            new_live[len(records):] = True
+            stats = {"kept": len(keep), "appended": len(new_rows),
+                     "encoded": len(to_encode), "removed": removed}
+
+            dead = len(new_live) - int(new_live.sum())
+            if new_rows or len(new_live) != len(live) or not np.array_equal(new_live[:len(live)], live):
+                self._append(df, texts, new_rows, records, by_text, encoded, new_live)
+                if dead > self.compact_ratio * max(int(new_live.sum()), 1):
+                    self._compact()
+            logger.info("Synced catalog %s: %s", self.path, stats)
+            return stats
+
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+
+    def _file(self, name: str, ext: str, gen: Optional[int] = None) -> str:
+        gen = self._manifest["gen"] if gen is None else gen
+        return os.path.join(self.path, f"{name}.{gen}.{ext}")
+
+    def _live_file(self, version: int, gen: Optional[int] = None) -> str:
+        return self._file("live", f"{version}.npy", gen)
+
+    def _save_live(self, mask: np.ndarray, version: int, gen: Optional[int] = None) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".live-")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, mask)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._live_file(version, gen))
+
+    def _file_lock(self):
+        lock_file = open(os.path.join(self.path, "lock"), "a")
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file  # closing the file releases the lock
+
+    def _append(self, df, texts, new_rows, records, by_text, encoded, new_live) -> None:
+        manifest = dict(self._manifest, text_bytes=dict(self._manifest["text_bytes"]))
+        old_emb = self.embeddings()
+        rows = len(records)
+        if new_rows:
+            vecs = np.empty((len(new_rows), self.dim), dtype="float32")
+            recs = np.zeros(len(new_rows), dtype=ROW_DTYPE)
+            for j, (i, text_hash, row_hash) in enumerate(new_rows):
+                donor = by_text.get(text_hash)
+                vecs[j] = old_emb[donor] if donor is not None else encoded[texts[i]]
+                recs[j] = (df["job_id"].iloc[i], text_hash, row_hash)
+            positions = [i for i, _, _ in new_rows]
+            self._write_at("emb", "f32", rows * self.dim * 4, vecs.tobytes())
+            self._write_at("rows", "bin", rows * ROW_DTYPE.itemsize, recs.tobytes())
+            for name in self.columns:
+                values = df[name].astype(str).iloc[positions]
+                encoded_values = [v.encode("utf-8") for v in values]
+                base = manifest["text_bytes"][name]
+                ends = base + np.cumsum([len(v) for v in encoded_values], dtype="int64")
+                self._write_at(name, "txt", base, b"".join(encoded_values))
+                self._write_at(name, "off", rows * 8, ends.astype("<i8").tobytes())
+                manifest["text_bytes"][name] = int(ends[-1])
+            manifest["rows"] = rows + len(new_rows)
+
+        # A new mask version, published together with the rows by the manifest
+        manifest["live"] = self._manifest["live"] + 1
+        self._save_live(new_live, manifest["live"])
+        self._commit(manifest)
+        # Readers of the previous manifest may still load its mask; drop the one before
+        stale = self._live_file(manifest["live"] - 2)
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    def _write_at(self, name: str, ext: str, offset: int, data: bytes) -> None:
+        # Drop any bytes left past the committed size by an interrupted sync
+        path = self._file(name, ext)
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            if os.fstat(f.fileno()).st_size > offset:
+                f.truncate(offset)
+            f.seek(offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_new(self, path: str, data) -> None:
+        # Durable before the manifest that points at it is committed
+        with open(path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _commit(self, manifest: Dict) -> None:
+        tmp = os.path.join(self.path, "manifest.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(self.path, "manifest.json"))
+        self._manifest = manifest
+
+    def _compact(self) -> None:
+        live_rows = np.flatnonzero(self.live())
+        old_gen, gen = self._manifest["gen"], self._manifest["gen"] + 1
+        manifest = dict(self._manifest, gen=gen, rows=len(live_rows), live=0, text_bytes={})
+
+        self._write_new(self._file("emb", "f32", gen), np.ascontiguousarray(self.embeddings()[live_rows]))
+        self._write_new(self._file("rows", "bin", gen), np.ascontiguousarray(self.records()[live_rows]))
+        for name in self.columns:
+            column = self.column(name)
+            values = [column[r].encode("utf-8") for r in live_rows]
+            self._write_new(self._file(name, "txt", gen), b"".join(values))
+            ends = np.cumsum([len(v) for v in values], dtype="int64")
+            self._write_new(self._file(name, "off", gen), ends.astype("<i8"))
+            manifest["text_bytes"][name] = int(ends[-1]) if len(ends) else 0
+        self._save_live(np.ones(len(live_rows), dtype=bool), 0, gen)
+        self._commit(manifest)
+
+        old_files = [self._file(name, ext, old_gen) for name, ext in [("emb", "f32"), ("rows", "bin")] +
+                     [(c, e) for c in self.columns for e in ("txt", "off")]]
+        for old in old_files + glob.glob(self._file("live", "*.npy", old_gen)):
+            if os.path.exists(old):
+                os.remove(old)
+        logger.info("Compacted catalog %s to %d rows (generation %d)", self.path, len(live_rows), gen)
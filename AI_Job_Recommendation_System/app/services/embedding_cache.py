@@ -0,0 +1,161 @@
+"""
+embedding_cache.py
+
+Content-Addressed Embedding Cache
+
+Re-posting an unchanged job or re-saving a profile without skill changes should not
+cost a model forward pass. `EmbeddingCache` stores embeddings under a SHA-1 of the
+model name, the inference backend (PyTorch or the quantized ONNX export), a namespace
+(e.g. "job" / "user") and the text that is encoded, so any change to the text, model or
+backend produces a new key and stale vectors are never served.
+
+Two tiers are consulted in order:
+- Memory: an LRU of the most recently used `max_items` vectors.
+- Disk: an optional SQLite table (`key BLOB PRIMARY KEY, vec BLOB`) that survives
+  restarts and is shared by every worker pointing at the same file.
+
+Key Class:
+----------
+- `EmbeddingCache(model_name, path, max_items, backend)`:
+    - `get(text, namespace) -> Optional[np.ndarray]`: Look a text up in both tiers.
+    - `put(text, vec, namespace)`: Store a vector in both tiers.
+    - `get_many(texts, namespace) -> List[Optional[np.ndarray]]`: Batched lookup.
+    - `put_many(texts, vecs, namespace)`: Batched store.
+    - `stats() -> Dict[str, int]`: Memory/disk hit and miss counters.
+
+Usage:
+------
+>>> cache = EmbeddingCache("all-MiniLM-L6-v2", path="data/cache/embeddings.sqlite3", backend="onnx")
+>>> emb = cache.get(text)
+>>> if emb is None:
+...     emb = generate_job_embeddings(model, [text])[0]
+...     cache.put(text, emb)
+
+Dependencies:
+-------------
+- numpy
+- sqlite3 (standard library)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Two-tier (in-memory LRU + SQLite) cache of float32 embeddings keyed by text hash.
+    """
+
+    def __init__(
+        self, model_name: str, path: Optional[str] = None, max_items: int = 10_000, backend: str = "torch"
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.path = path
+        self.max_items = max_items
+        self.lock = threading.Lock()
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+
+    def key(self, text: str, namespace: str = "job") -> bytes:
+        """
+        Return the content address of an encoded text for this model, backend and namespace.
+        """
+        return hashlib.sha1(
+            f"{self.model_name}\0{self.backend}\0{namespace}\0{text}".encode("utf-8")
+        ).digest()
+
+    def get(self, text: str, namespace: str = "job") -> Optional[np.ndarray]:
+        return self.get_many([text], namespace)[0]
+
+    def put(self, text: str, vec: np.ndarray, namespace: str = "job") -> None:
+        self.put_many([text], [vec], namespace)
+
+    def get_many(self, texts: List[str], namespace: str = "job") -> List[Optional[np.ndarray]]:
+        """
+        Look texts up in memory, then on disk; disk hits are promoted to memory.
+        """
+        keys = [self.key(text, namespace) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        with self.lock:
+            pending = []
+            for j, key in enumerate(keys):
+                vec = self._memory.get(key)
+                if vec is None:
+                    pending.append(j)
+                else:
+                    self._memory.move_to_end(key)
+                    results[j] = vec
+                    self._stats["memory_hits"] += 1
+
+            if pending and self._db is not None:
+                wanted = list({keys[j] for j in pending})
+                found = {}
+                for start in range(0, len(wanted), 500):
+                    chunk = wanted[start:start + 500]
+                    rows = self._db.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    found.update((bytes(k), np.frombuffer(v, dtype="<f4")) for k, v in rows)
+                still_pending = []
+                for j in pending:
+                    vec = found.get(keys[j])
+                    if vec is None:
+                        still_pending.append(j)
+                    else:
+                        results[j] = vec
+                        self._remember(keys[j], vec)
+                        self._stats["disk_hits"] += 1
+                pending = still_pending
+
+            self._stats["misses"] += len(pending)
+        return results
+
+    def put_many(self, texts: List[str], vecs: List[np.ndarray], namespace: str = "job") -> None:
+        """
+        Store vectors in memory and, if configured, on disk.
+        """
+        keys = [self.key(text, namespace) for text in texts]
+        vecs = [np.asarray(vec, dtype="<f4") for vec in vecs]
+        with self.lock:
+            for key, vec in zip(keys, vecs):
+                self._remember(key, vec)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)",
+                    [(key, vec.tobytes()) for key, vec in zip(keys, vecs)],
+                )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters and the current size of the memory tier.
+        """
+        with self.lock:
+            return {**self._stats, "memory_items": len(self._memory)}
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: bytes, vec: np.ndarray) -> None:
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
@@ -8,69 +8,128 @@ into dense vector representations using SBERT (Sentence-BERT).
 
 Key Functions:
 --------------
-- `clean_text(text: str) -> str`: Clean input text by removing URLs, emails, and phone numbers.
-- `initialize_embedding_model(model_name: str, device: str) -> SentenceTransformer`: Load SBERT model.
-- `generate_job_embeddings(model, texts: List[str]) -> np.ndarray`: Embed and L2-normalize job descriptions.
-- `generate_user_embedding(model, skills: List[str]) -> np.ndarray`: Embed and L2-normalize a single user's skill list.
+- `clean_text(text: str) -> str`: Clean input text by removing URLs, emails, and phone numbers
+  (re-exported from `text_normalization`).
+- `initialize_embedding_model(model_name: str, device: str, backend: str, onnx_dir: str, num_threads: int)`: Load SBERT model,
+  either as a PyTorch `SentenceTransformer` or as a quantized ONNX Runtime `OnnxEmbeddingModel`.
+- `generate_job_embeddings(model, texts: List[str], batch_size: int, precision: str) -> np.ndarray`: Embed and L2-normalize
+  job descriptions; with precision "float16"/"int8" the result is a compact `QuantizedEmbeddings`.
+- `generate_user_embedding(model, skills: List[str], skill_table) -> np.ndarray`: Embed and L2-normalize a single user's skill list,
+  gathering precomputed skill vectors from a `SkillEmbeddingTable` when one is given.
+- `pool_user_embeddings(indptr, indices, vocab_embs) -> np.ndarray`: Vectorized user embeddings for
+  many users from a CSR skill-id layout (see `scripts.data_cleaning.load_user_skills_csr`).
 
 Dependencies:
 -------------
-- sentence-transformers
+- sentence-transformers (torch backend)
+- onnxruntime, tokenizers (onnx backend)
 - scikit-learn
 - numpy
 """
 # ===== embedding.py =====
-import re
-from sentence_transformers import SentenceTransformer
+import os
 import numpy as np
-from typing import List
+from typing import List, Optional, TYPE_CHECKING, Union
 from sklearn.preprocessing import normalize
+from app.services.quantization import QuantizedEmbeddings
+from app.services.skill_table import SkillEmbeddingTable
+from app.services.text_normalization import clean_text  # noqa: F401 (re-exported)
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
-def clean_text(text: str) -> str:
-    # Remove web links
-    text = re.sub(r"http\S+|www\.\S+", " ", text)
-    # Remove email addresses
-    text = re.sub(r"\S+@\S+", " ", text)
-    # Remove phone numbers (digits, dashes/spaces, length ≥9)
-    text = re.sub(r"\+?\d[\d\-\s]{7,}\d", " ", text)
-    # Collapse all consecutive whitespace into single spaces
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
 
 def initialize_embedding_model(
-    model_name: str = 'all-MiniLM-L6-v2', device: str = 'cpu'
-) -> SentenceTransformer:
+    model_name: str = 'all-MiniLM-L6-v2',
+    device: str = 'cpu',
+    backend: str = 'torch',
+    onnx_dir: Optional[str] = None,
+    num_threads: Optional[int] = None
+) -> "SentenceTransformer":
     """
-    Load and return a pretrained SentenceTransformer model.
+    Load and return a pretrained embedding model.
+
+    backend='torch' returns a SentenceTransformer. backend='onnx' returns an
+    int8-quantized onnxruntime model from `onnx_dir`, exporting it there first if it
+    does not exist yet; torch is then never imported on the serving path once exported.
     """
+    if backend == 'onnx':
+        from app.services.onnx_backend import OnnxEmbeddingModel, export_onnx_model
+
+        onnx_dir = onnx_dir or f'models/{model_name}-onnx'
+        if not os.path.exists(os.path.join(onnx_dir, 'config.json')):
+            export_onnx_model(model_name, onnx_dir, quantize=True)
+        return OnnxEmbeddingModel(onnx_dir, quantized=True, num_threads=num_threads)
+    if backend != 'torch':
+        raise ValueError(f"Unknown embedding backend: {backend}")
+
+    from sentence_transformers import SentenceTransformer
     return SentenceTransformer(model_name, device=device)
 
 
 def generate_job_embeddings(
-    model: SentenceTransformer,
-    texts: List[str]
-) -> np.ndarray:
+    model: "SentenceTransformer",
+    texts: List[str],
+    batch_size: int = 32,
+    precision: str = 'float32'
+) -> Union[np.ndarray, QuantizedEmbeddings]:
     """
     Generate embeddings for job descriptions and L2-normalize them.
+    With precision 'float16' or 'int8', return them quantized for storage and scanning.
     """
-    embs = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-    return normalize(embs, norm='l2', axis=1)
+    embs = model.encode(
+        texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False
+    )
+    embs = normalize(embs, norm='l2', axis=1)
+    if precision == 'float32':
+        return embs
+    return QuantizedEmbeddings.quantize(embs, precision)
 
 
 
 def generate_user_embedding(
-    model: SentenceTransformer,
-    skills: List[str]
+    model: "SentenceTransformer",
+    skills: List[str],
+    skill_table: Optional[SkillEmbeddingTable] = None
 ) -> np.ndarray:
     """
     Generate an embedding for a single user's skill list (mean pooled) and L2-normalize.
+    With a skill table, known skills are a row gather and only unseen skills are encoded.
     """
     if skills:
-        embs = model.encode(skills, convert_to_numpy=True)
+        if skill_table is not None:
+            embs = skill_table.lookup(model, skills)
+        else:
+            embs = model.encode(skills, convert_to_numpy=True)
         vec = embs.mean(axis=0)
     else:
         dim = model.get_sentence_embedding_dimension()
         vec = np.zeros(dim, dtype='float32')
     vec = vec.reshape(1, -1)
-    return normalize(vec, norm='l2', axis=1)[0]
\ No newline at end of file
+    return normalize(vec, norm='l2', axis=1)[0]
+
+def pool_user_embeddings(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    vocab_embs: np.ndarray,
+    block_size: int = 65536
+) -> np.ndarray:
+    """
+    Mean-pool and L2-normalize user embeddings for many users at once from a CSR skill
+    layout (`indices[indptr[i]:indptr[i + 1]]` are user i's rows in `vocab_embs`).
+    Matches `generate_user_embedding` per user; users without skills get zero vectors.
+    """
+    indptr = np.asarray(indptr, dtype='int64')
+    n_users = len(indptr) - 1
+    out = np.zeros((n_users, vocab_embs.shape[1]), dtype='float32')
+    for start in range(0, n_users, block_size):
+        stop = min(start + block_size, n_users)
+        lo, hi = indptr[start], indptr[stop]
+        if hi == lo:
+            continue
+        counts = np.diff(indptr[start:stop + 1])
+        nonempty = np.flatnonzero(counts)
+        gathered = vocab_embs[np.asarray(indices[lo:hi])]
+        # Sums per user; the mean's direction is the same once normalized
+        out[start + nonempty] = np.add.reduceat(gathered, indptr[start + nonempty] - lo, axis=0)
+    return normalize(out, norm='l2', axis=1).astype('float32', copy=False)
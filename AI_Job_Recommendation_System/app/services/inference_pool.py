@@ -0,0 +1,147 @@
+"""
+inference_pool.py
+
+Bounded Inference Executor with Admission Control
+
+Sync FastAPI handlers all run on anyio's shared threadpool, so under a traffic spike
+SBERT forward passes, BLAS scans and request parsing pile up with no limit and every
+request slows down together. `InferencePool` runs CPU-bound work on a dedicated,
+fixed-size thread pool and bounds how much work may be in flight:
+
+- Admission: at most `workers + max_queue` tasks may be running or queued. Beyond
+  that, `InferencePoolFull` is raised immediately (the API maps it to 429) instead of
+  queueing requests that would time out anyway.
+- Timeouts: callers stop waiting after `timeout` seconds (`InferenceTimeout`, mapped
+  to 504). A task that has not started yet is cancelled and frees its slot; a running
+  task keeps its slot until it finishes, so the backlog stays bounded.
+
+Threads (rather than processes) are used because the handlers share in-process state
+(vector index, embedding cache, batcher) and torch, onnxruntime and numpy BLAS all
+release the GIL during compute. `pin_compute_threads` caps the intra-op threads of
+those libraries so `workers x threads` does not oversubscribe the CPU.
+
+Key Functions / Classes:
+------------------------
+- `pin_compute_threads(n: int)`: Limit torch and BLAS/OpenMP threads per call.
+- `InferencePool(workers, max_queue, timeout)`:
+    - `run(fn, *args)`: Await `fn(*args)` on the pool under admission control.
+    - `wait(submit, *args)`: Admit first, then call `submit(*args)` (e.g. the
+      batcher's `submit`) and await the future it returns under the same timeout.
+    - `executor`: The worker threads, for long-lived producers such as the batcher
+      whose compute must share the `workers` limit.
+    - `stats()`: In-flight, rejected and timed-out counters.
+
+Usage:
+------
+>>> pool = InferencePool(workers=4, max_queue=64, timeout=30)
+>>> recs = await pool.run(job_index.search, user_emb, 7)
+
+Dependencies:
+-------------
+- threadpoolctl (installed with scikit-learn)
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class InferencePoolFull(Exception):
+    """Raised when the pool's admission queue is full."""
+
+
+class InferenceTimeout(Exception):
+    """Raised when a task does not finish within the pool timeout."""
+
+
+def pin_compute_threads(n: int) -> None:
+    """
+    Cap torch intra-op threads and BLAS/OpenMP threads at `n` for this process.
+    """
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(n)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=n)
+    except ImportError:
+        logger.warning("threadpoolctl not installed; BLAS thread count not pinned")
+
+
+class InferencePool:
+    """
+    Fixed-size thread pool with bounded admission and per-task timeouts.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64, timeout: float = 30.0):
+        self.workers = workers
+        self.capacity = workers + max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._stats = {"rejected": 0, "timed_out": 0}
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run `fn(*args)` on the pool and await its result.
+        """
+        self._acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        return await self._await(future)
+
+    async def wait(self, submit: Callable[..., Future], *args: Any) -> Any:
+        """
+        Await the future returned by `submit(*args)`, counting it against the pool's
+        capacity. `submit` is only called once the task is admitted, so a rejected
+        request never enqueues work.
+        """
+        self._acquire()
+        try:
+            future = submit(*args)
+        except BaseException:
+            self._release()
+            raise
+        return await self._await(future)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        return self._executor
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"inflight": self._inflight, "capacity": self.capacity, **self._stats}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._inflight >= self.capacity:
+                self._stats["rejected"] += 1
+                raise InferencePoolFull(f"{self._inflight} tasks in flight")
+            self._inflight += 1
+
+    def _release(self, _future: Any = None) -> None:
+        with self._lock:
+            self._inflight -= 1
+
+    async def _await(self, future: Future) -> Any:
+        # The slot is freed when the work actually finishes (or is cancelled),
+        # not when the caller gives up waiting.
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self._stats["timed_out"] += 1
+            raise InferenceTimeout(f"task exceeded {self.timeout}s") from None
@@ -0,0 +1,186 @@
+"""
+onnx_backend.py
+
+Quantized ONNX Runtime Backend for the SBERT Embedder
+
+Serving `all-MiniLM-L6-v2` through PyTorch pulls torch into every worker, and fp32
+inference is the dominant CPU cost of ingest. This module exports the transformer to
+ONNX, applies dynamic int8 weight quantization and serves encodes through
+onnxruntime. Tokenization uses the standalone `tokenizers` library and pooling is
+done in numpy, so the serving path never imports torch or sentence-transformers.
+
+`OnnxEmbeddingModel` exposes the subset of the `SentenceTransformer` API used by
+`embedding_utils` (`encode`, `get_sentence_embedding_dimension`), so it can be passed
+anywhere a SentenceTransformer is expected.
+
+Export directory layout:
+------------------------
+- `model.onnx`: fp32 export of the transformer (token embeddings output).
+- `model.int8.onnx`: dynamically quantized copy.
+- `tokenizer.json`: fast tokenizer.
+- `config.json`: max_seq_length, embedding dim and whether outputs are L2-normalized.
+
+Key Functions:
+--------------
+- `export_onnx_model(model_name: str, out_dir: str, quantize: bool) -> str`: Export (and quantize) a model.
+- `OnnxEmbeddingModel(model_dir: str, quantized: bool, num_threads: int)`: onnxruntime-backed encoder.
+- `check_onnx_accuracy(reference, candidate, texts, threshold) -> float`: Minimum cosine similarity
+  between reference (PyTorch) and candidate (ONNX) vectors; raises if below `threshold`.
+
+Usage:
+------
+>>> export_onnx_model("all-MiniLM-L6-v2", "models/minilm-onnx")
+>>> model = OnnxEmbeddingModel("models/minilm-onnx", quantized=True, num_threads=4)
+>>> embs = generate_job_embeddings(model, texts)
+
+Dependencies:
+-------------
+- onnxruntime
+- tokenizers
+- numpy
+- sentence-transformers, torch, onnx (export only)
+"""
+
+import json
+import logging
+import os
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def export_onnx_model(model_name: str, out_dir: str, quantize: bool = True) -> str:
+    """
+    Export a SentenceTransformer's transformer to ONNX (plus tokenizer and config),
+    optionally write a dynamically int8-quantized copy, and return `out_dir`.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(out_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    tokenizer.save_pretrained(out_dir)
+
+    dummy = tokenizer(["export"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic["token_embeddings"] = {0: "batch", 1: "sequence"}
+    fp32_path = os.path.join(out_dir, "model.onnx")
+
+    class TokenEmbeddings(torch.nn.Module):
+        # Export only last_hidden_state; pooling happens in numpy at serving time
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs))).last_hidden_state
+
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(),
+            tuple(dummy[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic,
+            opset_version=14,
+            dynamo=False,  # TorchScript exporter: supports dynamic_axes for batch/sequence
+        )
+
+    config = {
+        "max_seq_length": st_model.max_seq_length,
+        "dim": st_model.get_sentence_embedding_dimension(),
+        "normalize": any(type(module).__name__ == "Normalize" for module in st_model),
+        "input_names": input_names,
+    }
+    with open(os.path.join(out_dir, "config.json"), "w") as f:
+        json.dump(config, f)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            fp32_path, os.path.join(out_dir, "model.int8.onnx"), weight_type=QuantType.QInt8
+        )
+    logger.info("Exported %s to %s (quantized=%s)", model_name, out_dir, quantize)
+    return out_dir
+
+
+class OnnxEmbeddingModel:
+    """
+    Mean-pooled sentence embeddings from an exported transformer via onnxruntime.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = True, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, "config.json")) as f:
+            self.config = json.load(f)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads or os.cpu_count() or 1
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        model_file = "model.int8.onnx" if quantized else "model.onnx"
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=["CPUExecutionProvider"]
+        )
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(self.config["max_seq_length"])
+        self.tokenizer.enable_padding()
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dim"]
+
+    def encode(self, sentences, batch_size: int = 32, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        """
+        Encode a string or list of strings into a float32 (n, dim) matrix.
+        Extra SentenceTransformer keyword arguments (e.g. show_progress_bar) are ignored.
+        """
+        single = isinstance(sentences, str)
+        texts: List[str] = [sentences] if single else list(sentences)
+        out = np.empty((len(texts), self.config["dim"]), dtype="float32")
+        # Length-sorted batches keep padding to a minimum
+        order = np.argsort([len(text) for text in texts])
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            out[idx] = self._encode_batch([texts[i] for i in idx])
+        return out[0] if single else out
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype="int64"),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype="int64"),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype="int64"),
+        }
+        feeds = {name: feeds[name] for name in self.config["input_names"]}
+        token_embs = self.session.run(["token_embeddings"], feeds)[0]
+
+        mask = feeds["attention_mask"][:, :, None].astype("float32")
+        pooled = (token_embs * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self.config["normalize"]:
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled
+
+
+def check_onnx_accuracy(reference, candidate, texts: List[str], threshold: float = 0.99) -> float:
+    """
+    Encode `texts` with both models and return the minimum per-text cosine similarity.
+    Raises ValueError if it falls below `threshold`.
+    """
+    ref = reference.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+    cand = candidate.encode(texts, convert_to_numpy=True)
+    ref = ref / np.linalg.norm(ref, axis=1, keepdims=True)
+    cand = cand / np.linalg.norm(cand, axis=1, keepdims=True)
+    min_cos = float((ref * cand).sum(axis=1).min())
+    if min_cos < threshold:
+        raise ValueError(f"ONNX embeddings diverge from reference: min cosine {min_cos:.4f} < {threshold}")
+    return min_cos
@@ -0,0 +1,189 @@
+"""
+quantization.py
+
+Reduced-Precision Storage for the Job Embedding Matrix
+
+The catalog scan is bound by how many bytes of job embeddings it streams through
+memory. `QuantizedEmbeddings` stores the matrix with fewer bytes per value and scores
+it block by block, widening one cache-sized block at a time into a reusable float32
+buffer for the BLAS product, so the whole matrix is never expanded back to float32:
+
+- `float16`: half-precision copy, 2x smaller, scores within ~1e-3 of float32. numpy
+  widens half floats in software, so this trades scan speed for memory.
+- `int8`: symmetric scalar quantization with one scale per dimension
+  (`scale[d] = max |x[:, d]| / 127`), 4x smaller and faster to scan than float32
+  (a quarter of the memory traffic). The scales are folded into the query, so a
+  score is `(query * scales) @ codes`.
+
+Re-ranking:
+-----------
+With an `exact` float32 matrix attached (typically a read-only memmap of the `.npy`
+the codes were built from, so it is not resident), `recommend_jobs` and
+`top_k_similar` take the `rerank_factor * top_k` best approximate candidates and
+re-score only those rows exactly. Returned scores are then exact cosine similarities
+and recall@k is close to float32; see `scripts/benchmark_precision.py`.
+
+Key Class / Functions:
+----------------------
+- `QuantizedEmbeddings(codes, scales, exact, rerank_factor)`:
+    - `quantize(embs, precision, exact, rerank_factor)`: Build from float32 embeddings.
+    - `scores(queries) -> np.ndarray`: Approximate (n_queries x n_jobs) dot products.
+    - `rescore(queries, idx) -> np.ndarray`: Exact scores of candidate rows per query.
+    - `save(path)` / `load(path, exact, mmap_mode)`: `.npy` codes (+ scales) persistence.
+- `quantized_path(path, precision) -> str`: Codes file stored next to a float32 `.npy`.
+
+Usage:
+------
+>>> q = QuantizedEmbeddings.quantize(job_embs, "int8", exact=np.load("jobs.npy", mmap_mode="r"))
+>>> recs = recommend_jobs(user_emb, job_ids, q, top_k=7)
+
+Dependencies:
+-------------
+- numpy
+"""
+
+import os
+from typing import Optional
+
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "int8")
+
+
+def quantized_path(path: str, precision: str) -> str:
+    """
+    Codes file for a float32 embeddings `.npy`: "jobs.npy" -> "jobs.int8.npy".
+    """
+    root, _ = os.path.splitext(path)
+    return f"{root}.{precision}.npy"
+
+
+class QuantizedEmbeddings:
+    """
+    float16 or int8 (per-dimension scale) job embedding matrix with optional exact
+    float32 re-ranking. Supports `len()` and row indexing (slices or index arrays).
+    """
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        scales: Optional[np.ndarray] = None,
+        exact: Optional[np.ndarray] = None,
+        rerank_factor: int = 4,
+    ):
+        if codes.dtype == np.int8 and scales is None:
+            raise ValueError("int8 codes need per-dimension scales")
+        self.codes = codes
+        self.scales = scales
+        self.exact = exact
+        self.rerank_factor = rerank_factor
+
+    @classmethod
+    def quantize(
+        cls,
+        embs: np.ndarray,
+        precision: str = "int8",
+        exact: Optional[np.ndarray] = None,
+        rerank_factor: int = 4,
+        block_size: int = 65536,
+    ) -> "QuantizedEmbeddings":
+        """
+        Quantize float32 embeddings (an in-memory array or a memmap, read in blocks).
+        """
+        if precision not in ("float16", "int8"):
+            raise ValueError(f"Unsupported precision: {precision}")
+        n, dim = embs.shape
+        if precision == "float16":
+            codes = np.empty((n, dim), dtype="float16")
+            for i in range(0, n, block_size):
+                codes[i:i + block_size] = embs[i:i + block_size]
+            return cls(codes, None, exact, rerank_factor)
+
+        max_abs = np.zeros(dim, dtype="float32")
+        for i in range(0, n, block_size):
+            np.maximum(max_abs, np.abs(np.asarray(embs[i:i + block_size], dtype="float32")).max(axis=0, initial=0),
+                       out=max_abs)
+        scales = np.where(max_abs > 0, max_abs / 127, 1).astype("float32")
+        codes = np.empty((n, dim), dtype="int8")
+        for i in range(0, n, block_size):
+            block = np.asarray(embs[i:i + block_size], dtype="float32") / scales
+            codes[i:i + block_size] = np.clip(np.rint(block), -127, 127)
+        return cls(codes, scales, exact, rerank_factor)
+
+    @property
+    def precision(self) -> str:
+        return str(self.codes.dtype)
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def nbytes(self) -> int:
+        # Resident scan memory; the exact matrix is expected to be memory-mapped
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, rows) -> "QuantizedEmbeddings":
+        exact = self.exact[rows] if self.exact is not None else None
+        return QuantizedEmbeddings(self.codes[rows], self.scales, exact, self.rerank_factor)
+
+    def scores(self, queries: np.ndarray, block_size: int = 1024) -> np.ndarray:
+        """
+        Approximate dot products of each query row with every stored row.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype="float32"))
+        if self.scales is not None:
+            queries = queries * self.scales
+        n, dim = self.codes.shape
+        out = np.empty((len(queries), n), dtype="float32")
+        buf = np.empty((min(block_size, n), dim), dtype="float32")
+        for j0 in range(0, n, block_size):
+            codes = self.codes[j0:j0 + block_size]
+            block = buf[:len(codes)]
+            block[...] = codes  # widen one block into the reused float32 buffer
+            out[:, j0:j0 + len(codes)] = queries @ block.T
+        return out
+
+    def rescore(self, queries: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        """
+        Exact float32 scores of the candidate rows `idx` (n_queries x n_candidates).
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype="float32"))
+        out = np.empty(idx.shape, dtype="float32")
+        for i, (query, rows) in enumerate(zip(queries, idx)):
+            # Gather in row order so reads from a memmap are sequential
+            order = np.argsort(rows)
+            out[i, order] = np.asarray(self.exact[rows[order]], dtype="float32") @ query
+        return out
+
+    def save(self, path: str) -> None:
+        """
+        Write the codes to `path` and, for int8, the scales next to it
+        ("jobs.int8.npy" -> "jobs.int8.scales.npy").
+        """
+        np.save(path, self.codes)
+        if self.scales is not None:
+            np.save(self._scales_path(path), self.scales)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        exact: Optional[np.ndarray] = None,
+        rerank_factor: int = 4,
+        mmap_mode: Optional[str] = None,
+    ) -> "QuantizedEmbeddings":
+        """
+        Read codes written by `save`; `mmap_mode="r"` maps them instead of loading.
+        """
+        codes = np.load(path, mmap_mode=mmap_mode)
+        scales = np.load(cls._scales_path(path)) if codes.dtype == np.int8 else None
+        return cls(codes, scales, exact, rerank_factor)
+
+    @staticmethod
+    def _scales_path(path: str) -> str:
+        root, _ = os.path.splitext(path)
+        return f"{root}.scales.npy"
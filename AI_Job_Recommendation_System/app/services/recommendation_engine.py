@@ -4,27 +4,161 @@ recommendation_engine.py
 Core Job Recommendation Engine for AI-Powered Matching System
 
 This module contains the core logic for ranking job listings based on cosine similarity
-between a user embedding and a set of job embeddings.
+between user embeddings and a set of job embeddings.
 
-Key Function:
+Embeddings produced by `embedding_utils` are already L2-normalized, so cosine similarity
+is a plain float32 dot product: one matrix-vector product for a single user, or one
+matrix-matrix product (a single BLAS call) for a batch of users. The top_k winners are
+selected with `np.argpartition` in O(n) and only those k are sorted.
+
+`job_embs` may also be a `QuantizedEmbeddings` (float16 / int8 storage, see
+`quantization`): the scan then runs on the compact codes and, when the exact float32
+matrix is attached, the best `rerank_factor * top_k` candidates are re-scored exactly.
+
+Key Functions:
 --------------
+- `similarities(user_embs: np.ndarray, job_embs) -> np.ndarray`:
+    (n_users x n_jobs) dot-product scores for float32 or quantized job embeddings.
+- `top_k_rerank(user_embs, sims, job_embs, k) -> Tuple[np.ndarray, np.ndarray]`:
+    Top-k selection from precomputed scores, with exact re-ranking for quantized embeddings.
+- `top_k_similar(user_embs: np.ndarray, job_embs: np.ndarray, top_k: int, exclude) -> Tuple[np.ndarray, np.ndarray]`:
+    Return the row indices and scores of the top_k jobs for one user or a batch of users,
+    optionally leaving out the job rows flagged in an `exclude` mask.
+- `top_k_similar_blocked(user_embs: np.ndarray, job_embs: np.ndarray, top_k: int, user_block: int, job_block: int, exclude)`:
+    Same as `top_k_similar` for a batch of users, tiled so the similarity buffer never
+    exceeds `user_block x job_block` floats.
 - `recommend_jobs(user_emb: np.ndarray, job_ids: List[int], job_embs: np.ndarray, top_k: int) -> List[Dict[str, Any]]`:
     Compute cosine similarities and return the top_k job IDs with their scores.
+- `recommend_jobs_batch(user_embs: np.ndarray, job_ids: List[int], job_embs: np.ndarray, top_k: int) -> List[List[Dict[str, Any]]]`:
+    Same as `recommend_jobs` for a matrix of user embeddings, using blocked scoring.
 
 Usage:
 ------
 >>> recs = recommend_jobs(user_emb, job_ids, job_embs, top_k=7)
+>>> recs_per_user = recommend_jobs_batch(user_embs, job_ids, job_embs, top_k=7)
 
 Dependencies:
 -------------
 - numpy
-- scikit-learn (cosine_similarity)
 """
 
 
 import numpy as np
-from typing import List, Dict, Any
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Any, Optional, Tuple
+
+from app.services.quantization import QuantizedEmbeddings
+
+
+def _top_k_columns(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the column positions and values of the k largest scores per row, best first.
+    """
+    n = scores.shape[1]
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0), dtype='int64')
+        return empty, empty.astype(scores.dtype)
+    if k < n:
+        part = np.argpartition(scores, n - k, axis=1)[:, n - k:]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape)
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(part_scores, axis=1)[:, ::-1]
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def similarities(user_embs: np.ndarray, job_embs) -> np.ndarray:
+    """
+    Dot products of every user row with every job row, as float32. Quantized job
+    embeddings are scored on their codes (approximate; see `top_k_rerank`).
+    """
+    user_embs = np.atleast_2d(np.asarray(user_embs, dtype='float32'))
+    if isinstance(job_embs, QuantizedEmbeddings):
+        return job_embs.scores(user_embs)
+    return user_embs @ np.asarray(job_embs, dtype='float32').T
+
+
+def top_k_rerank(
+    user_embs: np.ndarray,
+    sims: np.ndarray,
+    job_embs,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    `_top_k_columns` of `sims`, except that for quantized job embeddings with an exact
+    matrix the best `rerank_factor * k` candidates are re-scored in float32 first.
+    Entries already set to -inf in `sims` (masked rows) stay excluded.
+    """
+    if not isinstance(job_embs, QuantizedEmbeddings) or job_embs.exact is None:
+        return _top_k_columns(sims, k)
+    cand, cand_sims = _top_k_columns(sims, min(k * job_embs.rerank_factor, sims.shape[1]))
+    exact = job_embs.rescore(np.atleast_2d(user_embs), cand)
+    exact[np.isneginf(cand_sims)] = -np.inf
+    keep, scores = _top_k_columns(exact, k)
+    return np.take_along_axis(cand, keep, axis=1), scores
+
+
+def top_k_similar(
+    user_embs: np.ndarray,
+    job_embs: np.ndarray,
+    top_k: int = 100,
+    exclude: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score L2-normalized user embedding(s) against L2-normalized job embeddings and
+    return (indices, scores) of the top_k jobs, best first.
+
+    A 1-D `user_embs` yields 1-D results; a 2-D batch yields one row per user. Job
+    rows flagged in the bool mask `exclude` score -inf, so they only appear (last)
+    when fewer than top_k rows are left.
+    """
+    user_embs = np.asarray(user_embs, dtype='float32')
+    single = user_embs.ndim == 1
+    sims = similarities(user_embs, job_embs)
+    if exclude is not None:
+        sims[:, exclude] = -np.inf
+
+    idx, scores = top_k_rerank(user_embs, sims, job_embs, min(top_k, sims.shape[1]))
+    if single:
+        return idx[0], scores[0]
+    return idx, scores
+
+
+def top_k_similar_blocked(
+    user_embs: np.ndarray,
+    job_embs: np.ndarray,
+    top_k: int = 100,
+    user_block: int = 256,
+    job_block: int = 65536,
+    exclude: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Blocked version of `top_k_similar` for a 2-D batch of users.
+
+    Users are processed `user_block` rows at a time and the catalog `job_block` rows at
+    a time; each tile's top_k candidates are merged into a running top_k per user, so
+    peak memory stays bounded however large the catalog or batch is.
+    """
+    user_embs = np.atleast_2d(np.asarray(user_embs, dtype='float32'))
+    n_users, n_jobs = len(user_embs), len(job_embs)
+    k = max(0, min(top_k, n_jobs))
+    all_idx = np.empty((n_users, k), dtype='int64')
+    all_scores = np.empty((n_users, k), dtype='float32')
+
+    for u0 in range(0, n_users, user_block):
+        users = user_embs[u0:u0 + user_block]
+        best_idx = np.empty((len(users), 0), dtype='int64')
+        best_scores = np.empty((len(users), 0), dtype='float32')
+        for j0 in range(0, n_jobs, job_block):
+            tile_exclude = None if exclude is None else exclude[j0:j0 + job_block]
+            idx, scores = top_k_similar(users, job_embs[j0:j0 + job_block], k, tile_exclude)
+            cand_idx = np.concatenate([best_idx, idx + j0], axis=1)
+            cand_scores = np.concatenate([best_scores, scores], axis=1)
+            # Keep the k best of the running winners plus this tile's winners
+            keep, best_scores = _top_k_columns(cand_scores, k)
+            best_idx = np.take_along_axis(cand_idx, keep, axis=1)
+        all_idx[u0:u0 + len(users)] = best_idx
+        all_scores[u0:u0 + len(users)] = best_scores
+    return all_idx, all_scores
 
 
 def recommend_jobs(
@@ -37,9 +171,25 @@ def recommend_jobs(
     Compute cosine similarity between a single user embedding and a set of job embeddings,
     and return the top_k job IDs with similarity scores.
     """
-    sims = cosine_similarity(user_emb.reshape(1, -1), job_embs)[0]
-    top_idx = np.argsort(sims)[-top_k:][::-1]
+    top_idx, scores = top_k_similar(np.asarray(user_emb).reshape(-1), job_embs, top_k)
+    return [
+        {"job_id": int(job_ids[i]), "score": float(s)}
+        for i, s in zip(top_idx, scores)
+    ]
+
+
+def recommend_jobs_batch(
+    user_embs: np.ndarray,
+    job_ids: List[int],
+    job_embs: np.ndarray,
+    top_k: int = 100
+) -> List[List[Dict[str, Any]]]:
+    """
+    Compute the top_k job recommendations for every row of `user_embs` with blocked
+    matrix-matrix products.
+    """
+    top_idx, scores = top_k_similar_blocked(user_embs, job_embs, top_k)
     return [
-        {"job_id": int(job_ids[i]), "score": float(sims[i])}
-        for i in top_idx
+        [{"job_id": int(job_ids[i]), "score": float(s)} for i, s in zip(row_idx, row_scores)]
+        for row_idx, row_scores in zip(top_idx, scores)
     ]
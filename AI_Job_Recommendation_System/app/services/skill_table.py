@@ -0,0 +1,245 @@
+"""
+skill_table.py
+
+Precomputed Skill Embedding Table
+
+The same few thousand skill strings recur across almost every user profile, so
+encoding each user's skills from scratch repeats the same forward passes over and
+over. `SkillEmbeddingTable` keeps one raw (un-normalized) SBERT vector per skill in a
+float32 matrix plus a skill -> row dictionary. A user embedding then becomes a
+gather of rows and a mean; only skills never seen before go through the model, and
+they are appended to the table.
+
+Storage (under `path`):
+-----------------------
+- `skills.<gen>.npy`: float32 matrix, one row per skill, loaded with `mmap_mode='r'`
+  so worker processes share the same pages.
+- `skills.<gen>.json`: skill strings in row order.
+- `meta.json`: the current generation, its size, and the model and backend that
+  produced the vectors. Replacing it publishes a matrix and its skill list together,
+  so a crash mid-save leaves the previous pair in place.
+
+Several processes may share one table: saves take an exclusive `flock` on `lock` and
+merge the skills other processes saved in the meantime before writing a new
+generation, so no process drops another's skills (POSIX only). A table built with a
+different model or backend is rejected at load instead of serving its vectors.
+
+Key Class:
+----------
+- `SkillEmbeddingTable(dim, path, model_name=..., backend=...)`:
+    - `build(model, skills)`: Encode a skill vocabulary (e.g. skills.json) in one pass.
+    - `lookup(model, skills) -> np.ndarray`: Return one row per skill, encoding unseen ones.
+    - `save()`: Persist the table, including newly appended skills.
+
+Usage:
+------
+>>> table = SkillEmbeddingTable(dim=384, path="data/skills", model_name="all-MiniLM-L6-v2")
+>>> vecs = table.lookup(model, ["python", "sql"])
+
+Dependencies:
+-------------
+- sentence-transformers
+- numpy
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not coordinated across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Canonical table key for a skill string. The MiniLM tokenizer is uncased, so
+    case and surrounding whitespace do not change the embedding.
+    """
+    return " ".join(skill.split()).lower()
+
+
+class SkillEmbeddingTable:
+    """
+    Skill -> raw embedding lookup backed by a memory-mapped float32 matrix.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        path: Optional[str] = None,
+        autosave_every: int = 100,
+        model_name: Optional[str] = None,
+        backend: str = "torch",
+    ):
+        self.dim = dim
+        self.path = path
+        self.autosave_every = autosave_every
+        self.model_name = model_name
+        self.backend = backend
+        self.lock = threading.Lock()
+
+        self._base = np.zeros((0, dim), dtype="float32")   # persisted rows (mmap)
+        self._extra: List[np.ndarray] = []                 # rows appended since load
+        self._rows: Dict[str, int] = {}
+        self._skills: List[str] = []
+        self._gen = 0
+        if path and os.path.exists(self._meta_path):
+            with self._flock(fcntl.LOCK_SH if fcntl else None):
+                self._load()
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def __contains__(self, skill: str) -> bool:
+        return normalize_skill(skill) in self._rows
+
+    def build(self, model: "SentenceTransformer", skills: Iterable[str], batch_size: int = 256) -> None:
+        """
+        Encode every skill not already in the table and save it.
+        """
+        self.lookup(model, list(skills), batch_size=batch_size)
+        self.save()
+
+    def lookup(self, model: "SentenceTransformer", skills: List[str], batch_size: int = 64) -> np.ndarray:
+        """
+        Return a (len(skills), dim) float32 matrix of raw skill embeddings, encoding
+        and appending any skills that are not in the table yet.
+        """
+        keys = [normalize_skill(skill) for skill in skills]
+        with self.lock:
+            unseen = list(dict.fromkeys(k for k in keys if k not in self._rows))
+            if unseen:
+                embs = model.encode(
+                    unseen, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False
+                ).astype("float32")
+                for key, emb in zip(unseen, embs):
+                    self._rows[key] = len(self._skills)
+                    self._skills.append(key)
+                    self._extra.append(emb)
+                if self.path and len(self._extra) >= self.autosave_every:
+                    self._save_locked()
+            rows = np.fromiter((self._rows[k] for k in keys), dtype="int64", count=len(keys))
+            n_base = len(self._base)
+            in_base = rows < n_base
+            if in_base.all():
+                return self._base[rows]
+            out = np.empty((len(rows), self.dim), dtype="float32")
+            out[in_base] = self._base[rows[in_base]]
+            for j in np.flatnonzero(~in_base):
+                out[j] = self._extra[rows[j] - n_base]
+            return out
+
+    def save(self) -> None:
+        """
+        Write the full table to disk and re-open it memory-mapped.
+        """
+        with self.lock:
+            self._save_locked()
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    def _file(self, gen: int, ext: str) -> str:
+        return os.path.join(self.path, f"skills.{gen}.{ext}")
+
+    @contextmanager
+    def _flock(self, op: Optional[int]):
+        # Cross-process lock on the table directory; a no-op without fcntl
+        if op is None:
+            yield
+            return
+        with open(os.path.join(self.path, "lock"), "ab") as f:
+            fcntl.flock(f, op)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_meta(self) -> Optional[dict]:
+        if not os.path.exists(self._meta_path):
+            return None
+        with open(self._meta_path) as f:
+            meta = json.load(f)
+        if meta["dim"] != self.dim:
+            raise ValueError(f"Skill table at {self.path} has dim {meta['dim']}, expected {self.dim}")
+        if (self.model_name and meta["model"] != self.model_name) or meta["backend"] != self.backend:
+            raise ValueError(
+                f"Skill table at {self.path} was built with {meta['model']} ({meta['backend']}), "
+                f"expected {self.model_name or meta['model']} ({self.backend})"
+            )
+        return meta
+
+    def _read_generation(self, meta: dict) -> Tuple[List[str], np.ndarray]:
+        gen = meta["gen"]
+        with open(self._file(gen, "json")) as f:
+            skills = json.load(f)
+        matrix = np.load(self._file(gen, "npy"), mmap_mode="r")
+        if matrix.shape != (meta["n"], self.dim) or len(skills) != meta["n"]:
+            raise ValueError(f"Skill table at {self.path} does not match its skill list")
+        return skills, matrix
+
+    def _load(self) -> None:
+        meta = self._read_meta()
+        if meta is None:
+            return
+        self.model_name = self.model_name or meta["model"]
+        self._skills, self._base = self._read_generation(meta)
+        self._rows = {skill: row for row, skill in enumerate(self._skills)}
+        self._extra = []
+        self._gen = meta["gen"]
+        logger.info("Loaded skill table from %s: %d skills", self.path, len(self._skills))
+
+    def _save_locked(self) -> None:
+        if not self.path or not self._extra:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        with self._flock(fcntl.LOCK_EX if fcntl else None):
+            meta = self._read_meta()
+            if meta is not None and meta["gen"] != self._gen:
+                # Another process saved since we loaded: keep its skills, append ours
+                skills, base = self._read_generation(meta)
+            else:
+                skills, base = self._skills[: len(self._base)], self._base
+            known = set(skills)
+            new = [(skill, emb) for skill, emb in zip(self._skills[len(self._base):], self._extra)
+                   if skill not in known]
+            old_gen = meta["gen"] if meta is not None else 0
+            if new:
+                gen = old_gen + 1
+                skills = skills + [skill for skill, _ in new]
+                matrix = np.concatenate([base, np.stack([emb for _, emb in new])])
+                self._write_file(self._file(gen, "npy"), lambda f: np.save(f, matrix))
+                self._write_file(self._file(gen, "json"), lambda f: f.write(json.dumps(skills).encode()))
+                meta = {"gen": gen, "n": len(skills), "dim": self.dim,
+                        "model": self.model_name, "backend": self.backend}
+                self._write_file(self._meta_path, lambda f: f.write(json.dumps(meta).encode()))
+                # Processes still mapping the old matrix keep it alive until they reload
+                for ext in ("npy", "json"):
+                    if os.path.exists(self._file(old_gen, ext)):
+                        os.remove(self._file(old_gen, ext))
+            self._load()
+
+    def _write_file(self, path: str, write) -> None:
+        # Unique temporary name in the same directory, then an atomic rename
+        fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
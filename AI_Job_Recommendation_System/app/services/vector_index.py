@@ -0,0 +1,721 @@
+"""
+vector_index.py
+
+Persistent IVF-Flat Vector Index for Job Embeddings
+
+This module keeps the job embedding catalog inside the recommendation service, so
+callers no longer need to ship every job embedding with each `/recommend` request.
+Vectors are stored as a contiguous float32 matrix keyed by an integer id and can be
+added, updated or removed one at a time.
+
+Once the index grows past `train_threshold` vectors, a coarse quantizer (spherical
+k-means centroids) is trained and every vector is assigned to an inverted list.
+Each list keeps the rows of its vectors, so a search gathers the rows of the
+`nprobe` closest lists directly and only scores those vectors (IVF-Flat);
+smaller indexes are scanned exhaustively. Filtered searches score only the given id
+subset; subsets larger than `filter_scan_ratio` of the index go through the IVF probe
+first and fall back to the exact subset scan if fewer than top_k candidates match.
+
+Searches score outside the index lock, so they do not serialize behind each other
+or block ingestion. A small candidate set (IVF probe, narrow filter) is copied under
+the lock. Full and broad scans (untrained index, IVF fallback, `search_batch`) read
+the matrix in place instead, with rows outside the candidate set masked out: while
+such a scan runs, no row it may read is overwritten. Removed rows are only marked
+dead and replaced vectors are appended as new rows; dead rows are reclaimed once
+no scan is running (or, if scans never pause, by repacking the live rows into new
+arrays once dead rows exceed 1/64 of the index).
+
+Persistence:
+------------
+- Snapshot: `vectors.<gen>.npy`, `ids.<gen>.npy`, `assign.<gen>.npy`,
+  `centroids.<gen>.npy` plus `meta.json`, which is atomically replaced to point at
+  the current generation.
+- Write-ahead log (`wal.bin`): every add/remove is appended as a fixed-size record,
+  so a mutation costs O(dim) bytes of I/O. The log is replayed on load and folded
+  into a new snapshot by `save()` once it holds `compact_every` records.
+
+Shared (multi-process) mode:
+----------------------------
+With `shared=True`, several worker processes open the same `path`. Snapshot arrays
+are memory-mapped copy-on-write instead of read into private memory, so every worker
+serves from the same page-cache pages and resident memory does not grow with the
+number of workers. Snapshots are written with `compact_every` spare rows, so adds and
+removes until the next compaction only privatize the pages they touch. Mutations are
+appended to the shared write-ahead log and applied by replaying it, so all workers
+apply changes in the same order; reads pick up other workers' changes at most
+`refresh_interval` seconds late. Compaction takes an exclusive `flock` on `lock`,
+and every worker re-maps the new snapshot on its next refresh (POSIX only).
+
+Key Class:
+----------
+- `VectorIndex(dim, path, ...)`:
+    - `add(ids, vectors)`: Insert or replace vectors by id.
+    - `remove(ids)`: Delete vectors by id.
+    - `get(id)`: Return the stored vector for an id (or None).
+    - `search(query, top_k, ids)`: Return the top_k ids with cosine similarity scores,
+      optionally restricted to a pre-filtered id subset.
+    - `search_batch(queries, top_k)`: Exact blocked top_k search for many queries.
+    - `get_many(ids)`: Return stored vectors for the ids that are present.
+    - `save()`: Write a snapshot and truncate the write-ahead log.
+    - `refresh()`: (shared mode) Apply changes made by other processes.
+
+Usage:
+------
+>>> index = VectorIndex(dim=384, path="data/index/jobs")
+>>> index.add([42], job_embs)
+>>> recs = index.search(user_emb, top_k=7)
+
+Dependencies:
+-------------
+- numpy
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.recommendation_engine import recommend_jobs, top_k_similar_blocked
+
+try:
+    import fcntl
+except ImportError:  # Windows: no shared mode
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_OP_ADD = 1
+_OP_REMOVE = 2
+
+
+class VectorIndex:
+    """
+    Thread-safe, disk-backed IVF-Flat index over L2-normalized float32 vectors.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        path: Optional[str] = None,
+        nprobe: int = 8,
+        train_threshold: int = 20_000,
+        compact_every: int = 10_000,
+        filter_scan_ratio: float = 0.25,
+        shared: bool = False,
+        refresh_interval: float = 1.0,
+    ):
+        if shared and (not path or fcntl is None):
+            raise ValueError("shared mode needs a path and POSIX file locking")
+        self.dim = dim
+        self.path = path
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.compact_every = compact_every
+        self.filter_scan_ratio = filter_scan_ratio
+        self.shared = shared
+        self.refresh_interval = refresh_interval
+        self.lock = threading.RLock()
+
+        self._vecs = np.zeros((0, dim), dtype="float32")
+        self._ids = np.zeros(0, dtype="int64")
+        self._assign = np.zeros(0, dtype="int32")
+        # Rows in use: live ones plus, while scans run, removed rows marked in _dead
+        self._n = 0
+        self._dead = np.zeros(0, dtype=bool)
+        self._n_dead = 0
+        # Scans currently reading _ids/_vecs in place, outside the lock
+        self._scans = 0
+        self._pos: Dict[int, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_n = 0
+        # Inverted lists: rows of list l are _lists[l][:_list_len[l]], and _slot[row]
+        # is the position of a row within its list
+        self._lists: List[np.ndarray] = []
+        self._list_len = np.zeros(0, dtype="int64")
+        self._slot = np.zeros(0, dtype="int64")
+        self._gen = 0
+
+        self._wal_dtype = np.dtype([("op", "u1"), ("id", "<i8"), ("vec", "<f4", (dim,))])
+        self._wal_file = None
+        self._wal_count = 0
+        self._wal_offset = 0
+        self._lock_file = None
+        self._refreshed = 0.0
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            if shared:
+                self._lock_file = open(os.path.join(path, "lock"), "ab")
+            # Exclusive while loading: a torn WAL tail may be truncated
+            with self._flock(fcntl.LOCK_EX if shared else None):
+                self._load()
+            # Unbuffered in shared mode: one append is one write() under O_APPEND
+            self._wal_file = open(self._wal_path, "ab", buffering=0 if shared else -1)
+
+    # ----------------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __contains__(self, item_id: int) -> bool:
+        return int(item_id) in self._pos
+
+    def add(self, ids: Iterable[int], vectors: np.ndarray) -> None:
+        """
+        Insert or replace vectors by id and log the change.
+        """
+        ids = np.asarray(list(ids), dtype="int64")
+        vectors = np.asarray(vectors, dtype="float32").reshape(len(ids), self.dim)
+        with self.lock:
+            self._mutate(_OP_ADD, ids, vectors)
+            self._maybe_train()
+            self._maybe_compact()
+
+    def remove(self, ids: Iterable[int]) -> int:
+        """
+        Delete vectors by id. Returns how many ids were present.
+        """
+        ids = np.asarray(list(ids), dtype="int64")
+        with self.lock:
+            removed = self._mutate(_OP_REMOVE, ids, None)
+            self._maybe_compact()
+        return removed
+
+    def get(self, item_id: int) -> Optional[np.ndarray]:
+        """
+        Return a copy of the stored vector for an id, or None if absent.
+        """
+        with self.lock:
+            self._maybe_refresh()
+            row = self._pos.get(int(item_id))
+            return None if row is None else self._vecs[row].copy()
+
+    def get_many(self, ids: Iterable[int]) -> Tuple[List[int], np.ndarray]:
+        """
+        Return (found_ids, vectors) for the ids present in the index, in input order.
+        """
+        with self.lock:
+            self._maybe_refresh()
+            found = [int(i) for i in ids if int(i) in self._pos]
+            rows = [self._pos[i] for i in found]
+            return found, self._vecs[rows].copy()
+
+    def search(
+        self, query: np.ndarray, top_k: int = 100, ids: Optional[Iterable[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the top_k ids most similar to `query` with their cosine scores.
+        With `ids` (e.g. from an attribute filter), only those vectors are ranked.
+        """
+        query = np.asarray(query, dtype="float32").reshape(-1)
+        with self.lock:
+            self._maybe_refresh()
+            if not self._pos:
+                return []
+            if ids is not None:
+                rows = self._subset_rows(query, top_k, ids)
+            else:
+                rows = self._probe(query, top_k)
+            if rows is None or len(rows) > self.filter_scan_ratio * len(self._pos):
+                # Too many candidates to copy: score the matrix in place
+                scan = self._pin(rows)
+            else:
+                # Copy the few candidates under the lock and score them outside it
+                scan = None
+                cand_ids, cand_vecs = self._ids[rows], self._vecs[rows]
+        if scan is not None:
+            return self._scan(scan, query[None, :], top_k)[0]
+        if len(cand_ids) == 0:
+            return []
+        return recommend_jobs(query, cand_ids, cand_vecs, top_k=top_k)
+
+    def search_batch(self, queries: np.ndarray, top_k: int = 100) -> List[List[Dict[str, Any]]]:
+        """
+        Exhaustively rank the whole index for every query row with blocked
+        matrix-matrix products; used for bulk (e.g. nightly digest) recommendations.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype="float32"))
+        with self.lock:
+            self._maybe_refresh()
+            if not self._pos:
+                return [[] for _ in queries]
+            scan = self._pin(None)
+        return self._scan(scan, queries, top_k)
+
+    def train(self, nlist: Optional[int] = None, n_iter: int = 10, seed: int = 0) -> None:
+        """
+        (Re)train the coarse quantizer with spherical k-means and reassign all vectors.
+        """
+        with self.lock:
+            live = self._live_rows()
+            n = len(live)
+            if n == 0:
+                return
+            nlist = nlist or max(1, int(4 * np.sqrt(n)))
+            nlist = min(nlist, n)
+            rng = np.random.default_rng(seed)
+            sample = self._vecs[rng.choice(live, size=min(n, nlist * 64), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+            for _ in range(n_iter):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                nonempty = norms[:, 0] > 0
+                centroids[nonempty] = sums[nonempty] / norms[nonempty]
+            self._centroids = centroids.astype("float32")
+            # Only _assign changes in place, which scans do not read
+            self._assign[: self._n] = self._nearest_list(self._vecs[: self._n])
+            self._trained_n = n
+            self._build_lists()
+            logger.info("Trained IVF index: %d vectors, %d lists", n, nlist)
+
+    def save(self) -> None:
+        """
+        Write a new snapshot generation and truncate the write-ahead log.
+        """
+        if not self.path:
+            return
+        with self.lock, self._flock(fcntl.LOCK_EX if self.shared else None):
+            if self.shared:
+                self._catch_up()
+            self._write_snapshot()
+
+    def refresh(self) -> None:
+        """
+        Shared mode: apply changes other processes made to the snapshot and log.
+        """
+        if not self.shared:
+            return
+        with self.lock, self._flock(fcntl.LOCK_SH):
+            self._catch_up()
+
+    def close(self) -> None:
+        """
+        Flush pending changes to a snapshot and close the write-ahead log.
+        """
+        with self.lock:
+            if self._wal_file is not None:
+                if self._wal_count:
+                    self.save()
+                self._wal_file.close()
+                self._wal_file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+    # ----------------------------------------------------------------
+    # Internals
+    # ----------------------------------------------------------------
+
+    @property
+    def _wal_path(self) -> str:
+        return os.path.join(self.path, "wal.bin")
+
+    def _file(self, name: str, gen: int) -> str:
+        return os.path.join(self.path, f"{name}.{gen}.npy")
+
+    @contextmanager
+    def _flock(self, op: Optional[int]):
+        # Cross-process lock on the shared index; a no-op outside shared mode
+        if op is None or self._lock_file is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, op)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> None:
+        self._load_snapshot()
+        self._replay_wal(truncate_torn=True)
+        logger.info("Loaded vector index from %s: %d vectors", self.path, len(self._pos))
+
+    def _read_meta(self) -> Optional[dict]:
+        meta_path = os.path.join(self.path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            return json.load(f)
+
+    def _load_snapshot(self) -> None:
+        meta = self._read_meta()
+        if meta is None:
+            return
+        if meta["dim"] != self.dim:
+            raise ValueError(f"Index at {self.path} has dim {meta['dim']}, expected {self.dim}")
+        # Shared mode maps the snapshot copy-on-write: pages stay shared across
+        # processes until this process writes to them
+        mmap_mode = "c" if self.shared else None
+        self._gen = meta["gen"]
+        self._trained_n = meta["trained_n"]
+        self._vecs = np.asarray(np.load(self._file("vectors", self._gen), mmap_mode=mmap_mode))
+        self._ids = np.asarray(np.load(self._file("ids", self._gen), mmap_mode=mmap_mode))
+        self._assign = np.asarray(np.load(self._file("assign", self._gen), mmap_mode=mmap_mode))
+        self._centroids = np.load(self._file("centroids", self._gen)) if meta["has_centroids"] else None
+        # Shared snapshots carry spare rows past "n"
+        self._n = meta.get("n", len(self._ids))
+        self._dead = np.zeros(len(self._ids), dtype=bool)
+        self._n_dead = 0
+        self._pos = {int(i): row for row, i in enumerate(self._ids[: self._n].tolist())}
+        self._build_lists()
+        self._wal_offset = 0
+        self._wal_count = 0
+
+    def _replay_wal(self, truncate_torn: bool = False) -> None:
+        """
+        Apply the complete log records past `_wal_offset`.
+        """
+        if not os.path.exists(self._wal_path):
+            return
+        itemsize = self._wal_dtype.itemsize
+        size = os.path.getsize(self._wal_path)
+        count = (size - self._wal_offset) // itemsize
+        if count > 0:
+            records = np.fromfile(self._wal_path, dtype=self._wal_dtype, count=count, offset=self._wal_offset)
+            for rec in records:
+                ids = np.array([rec["id"]], dtype="int64")
+                if rec["op"] == _OP_ADD:
+                    self._apply_add(ids, rec["vec"].reshape(1, -1))
+                else:
+                    self._apply_remove(ids)
+            self._wal_offset += count * itemsize
+            self._wal_count += count
+        if truncate_torn and size != self._wal_offset:
+            # Drop a torn trailing record left by a crash mid-write
+            with open(self._wal_path, "r+b") as f:
+                f.truncate(self._wal_offset)
+
+    def _catch_up(self) -> None:
+        """
+        Shared mode, under the file lock: re-map a newer snapshot if another process
+        compacted, then apply log records appended since the last catch-up.
+        """
+        meta = self._read_meta()
+        if meta is not None and meta["gen"] != self._gen:
+            self._load_snapshot()
+        self._replay_wal()
+        self._refreshed = time.monotonic()
+
+    def _maybe_refresh(self) -> None:
+        if self.shared and time.monotonic() - self._refreshed >= self.refresh_interval:
+            with self._flock(fcntl.LOCK_SH):
+                self._catch_up()
+
+    def _mutate(self, op: int, ids: np.ndarray, vectors: Optional[np.ndarray]) -> Optional[int]:
+        """
+        Apply and log one add/remove. Returns the number of ids removed for removes.
+        """
+        if not self.shared:
+            result = self._apply_add(ids, vectors) if op == _OP_ADD else self._apply_remove(ids)
+            self._log(op, ids, vectors)
+            return result
+        # Shared mode: append to the common log, then apply it in log order, so
+        # every process sees the same sequence of changes
+        with self._flock(fcntl.LOCK_SH):
+            self._catch_up()
+            removed = len(self._pos.keys() & set(ids.tolist())) if op == _OP_REMOVE else None
+            self._log(op, ids, vectors)
+            self._catch_up()
+        return removed
+
+    def _maybe_compact(self) -> None:
+        if self._wal_file is None or self._wal_count < self.compact_every:
+            return
+        with self._flock(fcntl.LOCK_EX if self.shared else None):
+            if self.shared:
+                # Another process may have compacted while we waited for the lock
+                self._catch_up()
+                if self._wal_count < self.compact_every:
+                    return
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        if self._centroids is not None and len(self._pos) > 4 * self._trained_n:
+            self.train()
+        gen = self._gen + 1
+        # Dead rows (left by removes during a scan) are not written
+        live = self._live_rows() if self._n_dead else slice(0, self._n)
+        n = len(self._pos)
+        # Shared snapshots get spare rows so adds until the next compaction stay in
+        # the mapping instead of forcing a private copy of the whole matrix
+        capacity = n + self.compact_every if self.shared else n
+        self._save_array(self._file("vectors", gen), self._vecs[live], capacity)
+        self._save_array(self._file("ids", gen), self._ids[live], capacity)
+        self._save_array(self._file("assign", gen), self._assign[live], capacity)
+        if self._centroids is not None:
+            np.save(self._file("centroids", gen), self._centroids)
+        meta = {"dim": self.dim, "gen": gen, "n": n, "trained_n": self._trained_n,
+                "has_centroids": self._centroids is not None}
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+        # Processes still mapping the old files keep them alive until they re-map
+        old_gen, self._gen = self._gen, gen
+        for name in ("vectors", "ids", "assign", "centroids"):
+            old = self._file(name, old_gen)
+            if os.path.exists(old):
+                os.remove(old)
+        self._wal_file.truncate(0)
+        self._wal_offset = 0
+        self._wal_count = 0
+        if self.shared:
+            # Drop this process's private pages in favour of the new shared snapshot
+            self._load_snapshot()
+
+    @staticmethod
+    def _save_array(path: str, data: np.ndarray, capacity: int) -> None:
+        if capacity == len(data):
+            np.save(path, data)
+            return
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=data.dtype, shape=(capacity,) + data.shape[1:])
+        out[: len(data)] = data
+        out.flush()
+        del out
+
+    def _log(self, op: int, ids: np.ndarray, vectors: Optional[np.ndarray]) -> None:
+        if self._wal_file is None:
+            return
+        records = np.zeros(len(ids), dtype=self._wal_dtype)
+        records["op"] = op
+        records["id"] = ids
+        if vectors is not None:
+            records["vec"] = vectors
+        self._wal_file.write(records.tobytes())
+        self._wal_file.flush()
+        if not self.shared:
+            # Shared mode counts records as they are replayed
+            self._wal_count += len(ids)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._n + extra
+        if needed <= len(self._vecs):
+            return
+        cap = max(needed, 2 * len(self._vecs), 1024)
+        for name, shape in (("_vecs", (cap, self.dim)), ("_ids", (cap,)), ("_assign", (cap,)),
+                            ("_slot", (cap,)), ("_dead", (cap,))):
+            old = getattr(self, name)
+            new = np.zeros(shape, dtype=old.dtype)
+            new[: self._n] = old[: self._n]
+            setattr(self, name, new)
+
+    def _apply_add(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        self._reserve(len(ids))
+        lists = self._nearest_list(vectors) if self._centroids is not None else None
+        for j, item_id in enumerate(ids.tolist()):
+            row = self._pos.get(item_id)
+            if row is not None and self._scans:
+                # Scans may be reading the old vector: append the new one instead
+                self._drop_row(row)
+                row = None
+            if row is None:
+                row = self._n
+                self._n += 1
+                self._pos[item_id] = row
+                self._ids[row] = item_id
+            elif lists is not None:
+                self._list_remove(row)
+            self._vecs[row] = vectors[j]
+            self._assign[row] = lists[j] if lists is not None else 0
+            if lists is not None:
+                self._list_append(row)
+
+    def _apply_remove(self, ids: np.ndarray) -> int:
+        removed = 0
+        for item_id in ids.tolist():
+            row = self._pos.pop(item_id, None)
+            if row is None:
+                continue
+            self._drop_row(row)
+            removed += 1
+        return removed
+
+    def _drop_row(self, row: int) -> None:
+        """
+        Free the row of an id that was just removed from (or re-pointed in) `_pos`.
+        """
+        if self._centroids is not None:
+            self._list_remove(row)
+        if self._scans:
+            # Scans read rows in place: mark the row dead and reclaim it later
+            self._dead[row] = True
+            self._n_dead += 1
+            if self._n_dead > max(1024, self._n // 64):
+                self._repack()
+            return
+        # Swap-remove: move the last row into the freed slot
+        last = self._n - 1
+        if row != last:
+            self._move_row(last, row)
+        self._n -= 1
+
+    def _move_row(self, src: int, dst: int) -> None:
+        moved = int(self._ids[src])
+        self._vecs[dst] = self._vecs[src]
+        self._ids[dst] = moved
+        self._assign[dst] = self._assign[src]
+        self._pos[moved] = dst
+        if self._centroids is not None:
+            self._list_move(src, dst)
+
+    def _live_rows(self) -> np.ndarray:
+        if not self._n_dead:
+            return np.arange(self._n)
+        return np.flatnonzero(~self._dead[: self._n])
+
+    def _purge_dead(self) -> None:
+        """
+        Reclaim dead rows in place by moving live rows from the end into them.
+        Only called while no scan is running.
+        """
+        for row in np.flatnonzero(self._dead[: self._n]).tolist():
+            while self._n > row and self._dead[self._n - 1]:
+                self._n -= 1
+                self._dead[self._n] = False
+            if row >= self._n:
+                break
+            self._move_row(self._n - 1, row)
+            self._dead[row] = False
+            self._n -= 1
+        self._n_dead = 0
+
+    def _repack(self) -> None:
+        """
+        Copy the live rows into new arrays; running scans keep reading the old ones.
+        """
+        live = self._live_rows()
+        cap = len(self._vecs)
+        for name in ("_vecs", "_ids", "_assign"):
+            old = getattr(self, name)
+            new = np.zeros((cap,) + old.shape[1:], dtype=old.dtype)
+            new[: len(live)] = old[live]
+            setattr(self, name, new)
+        self._dead = np.zeros(cap, dtype=bool)
+        self._n, self._n_dead = len(live), 0
+        self._pos = {int(i): row for row, i in enumerate(self._ids[: self._n].tolist())}
+        self._build_lists()
+
+    def _pin(self, rows: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, int, Optional[np.ndarray]]:
+        """
+        Start an in-place scan of `rows` (all live rows if None). Until `_unpin`, rows
+        below the returned count are neither moved nor overwritten.
+        """
+        n = self._n
+        if rows is not None:
+            exclude = np.ones(n, dtype=bool)
+            exclude[rows] = False
+        else:
+            exclude = self._dead[:n].copy() if self._n_dead else None
+        self._scans += 1
+        return self._ids, self._vecs, n, exclude
+
+    def _unpin(self) -> None:
+        with self.lock:
+            self._scans -= 1
+            if not self._scans and self._n_dead:
+                self._purge_dead()
+
+    def _scan(self, scan, queries: np.ndarray, top_k: int) -> List[List[Dict[str, Any]]]:
+        """
+        Rank pinned rows in place for every query (outside the lock), then unpin them.
+        """
+        ids, vecs, n, exclude = scan
+        try:
+            top_idx, scores = top_k_similar_blocked(queries, vecs[:n], top_k, exclude=exclude)
+            return [
+                [{"job_id": int(ids[i]), "score": float(s)}
+                 for i, s in zip(row_idx, row_scores) if s > -np.inf]
+                for row_idx, row_scores in zip(top_idx, scores)
+            ]
+        finally:
+            self._unpin()
+
+    def _maybe_train(self) -> None:
+        if self._centroids is None and len(self._pos) >= self.train_threshold:
+            self.train()
+
+    def _nearest_list(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype("int32")
+
+    def _build_lists(self) -> None:
+        """
+        Group the rows by assigned list, after training or loading a snapshot.
+        """
+        self._slot = np.zeros(len(self._vecs), dtype="int64")
+        if self._centroids is None:
+            self._lists, self._list_len = [], np.zeros(0, dtype="int64")
+            return
+        live = self._live_rows()
+        assign = self._assign[live]
+        counts = np.bincount(assign, minlength=len(self._centroids)).astype("int64")
+        order = live[np.argsort(assign, kind="stable")]
+        starts = np.cumsum(counts) - counts
+        self._slot[order] = np.arange(len(live)) - np.repeat(starts, counts)
+        self._lists = [rows.copy() for rows in np.split(order, np.cumsum(counts)[:-1])]
+        self._list_len = counts
+
+    def _list_append(self, row: int) -> None:
+        lst = int(self._assign[row])
+        k = int(self._list_len[lst])
+        if k == len(self._lists[lst]):
+            grown = np.empty(max(16, 2 * k), dtype="int64")
+            grown[:k] = self._lists[lst]
+            self._lists[lst] = grown
+        self._lists[lst][k] = row
+        self._slot[row] = k
+        self._list_len[lst] = k + 1
+
+    def _list_remove(self, row: int) -> None:
+        # Swap-remove within the list: its last row takes the freed slot
+        lst = int(self._assign[row])
+        rows = self._lists[lst]
+        k, last = int(self._slot[row]), int(self._list_len[lst]) - 1
+        rows[k] = rows[last]
+        self._slot[rows[k]] = k
+        self._list_len[lst] = last
+
+    def _list_move(self, old_row: int, new_row: int) -> None:
+        # Row `old_row` of the matrix now lives at `new_row` (same list)
+        k = int(self._slot[old_row])
+        self._lists[int(self._assign[new_row])][k] = new_row
+        self._slot[new_row] = k
+
+    def _subset_rows(self, query: np.ndarray, top_k: int, ids: Iterable[int]) -> np.ndarray:
+        pos = self._pos
+        rows = np.fromiter((pos[i] for i in map(int, ids) if i in pos), dtype="int64")
+        if len(rows) == 0:
+            return rows
+        if self._centroids is not None and len(rows) > self.filter_scan_ratio * len(pos):
+            # Broad filter: probe the IVF lists and keep matching candidates, unless
+            # that leaves fewer than top_k, in which case rank the subset exactly
+            candidates = self._probe(query, top_k)
+            if candidates is not None:
+                candidates = np.intersect1d(candidates, rows, assume_unique=True)
+                if len(candidates) >= top_k:
+                    rows = candidates
+        return rows
+
+    def _probe(self, query: np.ndarray, top_k: int) -> Optional[np.ndarray]:
+        """
+        Return candidate rows from the nprobe closest lists, or None for a full scan.
+        """
+        if self._centroids is None:
+            return None
+        order = np.argsort(self._centroids @ query)[::-1]
+        nprobe = self.nprobe
+        while nprobe < len(order):
+            probed = order[:nprobe]
+            if self._list_len[probed].sum() >= top_k:
+                return np.concatenate([self._lists[lst][: self._list_len[lst]] for lst in probed.tolist()])
+            nprobe *= 2
+        return None
@@ -0,0 +1,123 @@
+"""
+wire_format.py
+
+Compact Wire Formats for Embeddings
+
+Returning a 384-d embedding as a JSON list of floats costs ~8 KB of text per vector
+and a float parse per element on both sides. This module encodes embeddings as
+base64 of their little-endian bytes instead, and offers binary bodies for batch
+endpoints.
+
+Embedding formats (`embedding_format`):
+---------------------------------------
+- `json`: list of floats (default, backwards compatible).
+- `b64f32`: base64 of little-endian float32 bytes (~4x smaller than JSON text).
+- `b64f16`: base64 of little-endian float16 bytes (~8x smaller; ~3 significant digits).
+
+Batch body media types (via the `Accept` header):
+-------------------------------------------------
+- `application/octet-stream`: `<u4 n><u4 dim>`, then n `<i8` ids, then n*dim `<f4`.
+- `application/msgpack`: `{"ids": [...], "dim": d, "embeddings": <f4 bytes>}` (needs `msgpack`).
+
+Key Functions:
+--------------
+- `encode_embedding(vec, fmt)`: Encode one vector for a JSON response.
+- `decode_embedding(value, fmt)`: Decode a JSON list or base64 string into a float32 vector.
+- `decode_matrix(value, rows, fmt)`: Decode a list of lists or a base64 string into a (rows, dim) matrix.
+- `wants_binary(accept)`: Binary media type requested by an Accept header, or None for JSON.
+- `encode_batch(ids, embs, media_type) -> bytes`: Binary body of ids + float32 embeddings.
+
+Dependencies:
+-------------
+- numpy
+- msgpack (optional)
+"""
+
+import base64
+import binascii
+import struct
+from typing import List, Optional, Union
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+EMBEDDING_FORMATS = {"json": None, "b64f32": "<f4", "b64f16": "<f2"}
+
+OCTET_STREAM = "application/octet-stream"
+MSGPACK = "application/msgpack"
+
+
+def _dtype(fmt: str) -> str:
+    if fmt not in EMBEDDING_FORMATS:
+        raise ValueError(f"Unknown embedding format: {fmt} (expected one of {list(EMBEDDING_FORMATS)})")
+    return EMBEDDING_FORMATS[fmt]
+
+
+def encode_embedding(vec: np.ndarray, fmt: str = "json") -> Union[List[float], str]:
+    """
+    Encode a vector as a JSON list (fmt='json') or a base64 string of its bytes.
+    """
+    dtype = _dtype(fmt)
+    if dtype is None:
+        return vec.tolist()
+    return base64.b64encode(np.asarray(vec, dtype=dtype).tobytes()).decode("ascii")
+
+
+def decode_embedding(value: Union[List[float], str], fmt: str = "b64f32") -> np.ndarray:
+    """
+    Decode a JSON list or a base64 string (interpreted per `fmt`) into float32.
+    Raises ValueError for malformed base64 or a byte length that is not a whole
+    number of values.
+    """
+    if isinstance(value, str):
+        dtype = np.dtype(_dtype(fmt) or "<f4")
+        try:
+            data = base64.b64decode(value, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 embedding: {e}") from e
+        if len(data) % dtype.itemsize:
+            raise ValueError(f"{len(data)} bytes is not a whole number of {fmt} values")
+        return np.frombuffer(data, dtype=dtype).astype("float32")
+    return np.array(value, dtype="float32")
+
+
+def decode_matrix(value: Union[List[List[float]], str], rows: int, fmt: str = "b64f32") -> np.ndarray:
+    """
+    Decode a list of lists, or a base64 string of `rows` row-major vectors, into a
+    (rows, dim) float32 matrix.
+    """
+    if isinstance(value, str):
+        flat = decode_embedding(value, fmt)
+        if rows == 0 or flat.size % rows:
+            raise ValueError(f"Cannot reshape {flat.size} values into {rows} rows")
+        return flat.reshape(rows, -1)
+    if len(value) != rows:
+        raise ValueError(f"Expected {rows} rows, got {len(value)}")
+    return np.array(value, dtype="float32").reshape(rows, -1)
+
+
+def wants_binary(accept: Optional[str]) -> Optional[str]:
+    """
+    Return the binary media type requested by an Accept header, if any.
+    """
+    accept = accept or ""
+    if MSGPACK in accept and msgpack is not None:
+        return MSGPACK
+    if OCTET_STREAM in accept:
+        return OCTET_STREAM
+    return None
+
+
+def encode_batch(ids: List[int], embs: np.ndarray, media_type: str) -> bytes:
+    """
+    Encode ids + float32 embeddings as an octet-stream or msgpack body.
+    """
+    embs = np.ascontiguousarray(embs, dtype="<f4")
+    n, dim = embs.shape if embs.size else (len(ids), 0)
+    if media_type == MSGPACK:
+        return msgpack.packb({"ids": list(ids), "dim": dim, "embeddings": embs.tobytes()})
+    return struct.pack("<II", n, dim) + np.asarray(ids, dtype="<i8").tobytes() + embs.tobytes()
@@ -1,18 +1,25 @@
 """
-Entry script to launch the AI Job Recommendation System (development mode).
+Entry script to launch the AI Job Recommendation System.
 
-This script runs the FastAPI app defined in `app/main.py` using Uvicorn with live reloading
-enabled — perfect for rapid development and testing.
+This script runs the FastAPI app defined in `app/main.py` using Uvicorn. By default it
+starts a single process with live reloading enabled — perfect for rapid development
+and testing. With `--workers N` it starts N worker processes that share one copy of
+the job and user embedding matrices.
 
 Features:
 ---------
 - Launches FastAPI from `app.main:app`
-- Enables `--reload` mode for automatic hot reloading
+- Enables `--reload` mode for automatic hot reloading (single process)
+- `--workers N`: folds pending index changes into fresh snapshots in the parent process,
+  then starts N workers with SHARED_INDEX=1. Each worker memory-maps the same snapshot
+  files copy-on-write, so the embedding matrices are held once in the page cache
+  however many workers run; only the model is loaded per worker.
 - Runs on localhost:8000 by default
 
 Usage:
 ------
     python run.py
+    python run.py --workers 4 --host 0.0.0.0
 
 Dependencies:
 -------------
@@ -20,12 +27,48 @@ Dependencies:
 - Uvicorn (run `pip install uvicorn`)
 """
 
+import argparse
+import json
+import os
+
 import uvicorn
 
+
+def prepare_shared_indexes(index_dir: str) -> None:
+    """
+    Compact every persisted vector index under `index_dir` into a shared-mode snapshot
+    (with spare rows for later adds) before the workers map it.
+    """
+    from app.services.vector_index import VectorIndex
+
+    for name in ("jobs", "users"):
+        path = os.path.join(index_dir, name)
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            continue  # Nothing snapshotted yet; workers replay the log
+        with open(meta_path) as f:
+            dim = json.load(f)["dim"]
+        index = VectorIndex(dim, path, shared=True)
+        index.save()
+        print(f"Shared index {path}: {len(index)} vectors")
+        index.close()
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",        
-        host="127.0.0.1",       
-        port=8000,          
-        reload=True,                 
-    )
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        os.environ["SHARED_INDEX"] = "1"
+        prepare_shared_indexes(os.getenv("INDEX_DIR", "data/index"))
+        uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,
+        )
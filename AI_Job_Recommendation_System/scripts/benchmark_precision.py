@@ -0,0 +1,81 @@
+"""
+Measure recall@k, latency and memory of float16 / int8 job embedding storage against float32.
+
+For each precision (with and without exact float32 re-ranking of the top
+`rerank_factor * k` candidates) the script reports the resident size of the scanned
+matrix (the re-rank source is assumed memory-mapped), milliseconds per single-user query, and recall@k: the fraction of the exact
+float32 top-k that the quantized scan returns.
+
+Real embeddings give the meaningful recall numbers: pass a job matrix (`--jobs`, e.g.
+the JobCache `.npy`) and optionally user embeddings (`--users`). Without `--users`,
+queries are perturbed job rows; without `--jobs`, random unit vectors are used.
+
+Usage:
+------
+    python -m scripts.benchmark_precision --jobs data/processed/job_embeddings.npy --users data/processed/user_embeddings.npy
+    python -m scripts.benchmark_precision --rows 200000 --top-k 10 --queries 200
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.quantization import QuantizedEmbeddings
+from app.services.recommendation_engine import top_k_similar
+
+
+def random_unit(rows: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    x = rng.standard_normal((rows, dim), dtype=np.float32)
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    return x
+
+
+def recall_at_k(expected: np.ndarray, got: np.ndarray) -> float:
+    hits = sum(len(np.intersect1d(e, g)) for e, g in zip(expected, got))
+    return hits / expected.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", default=None, help="(n_jobs x dim) float32 job embeddings .npy")
+    parser.add_argument("--users", default=None, help="(n_users x dim) user embeddings .npy used as queries")
+    parser.add_argument("--rows", type=int, default=100_000, help="Random jobs when --jobs is not given")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    jobs = np.load(args.jobs) if args.jobs else random_unit(args.rows, args.dim, rng)
+    jobs = np.ascontiguousarray(jobs, dtype="float32")
+    if args.users:
+        users = np.load(args.users, mmap_mode="r")
+        users = np.asarray(users[rng.choice(len(users), size=min(args.queries, len(users)), replace=False)])
+    else:
+        # Queries near existing jobs, so the top-k has real near neighbours to find
+        users = jobs[rng.choice(len(jobs), size=args.queries)] + 0.5 * random_unit(args.queries, jobs.shape[1], rng)
+    users = (users / np.linalg.norm(users, axis=1, keepdims=True)).astype("float32")
+    k = args.top_k
+    print(f"{len(jobs)} jobs x {jobs.shape[1]} dims, {len(users)} queries, k={k}")
+
+    expected = np.stack([top_k_similar(u, jobs, k)[0] for u in users])
+    variants = [("float32", jobs)]
+    for precision in ("float16", "int8"):
+        quantized = QuantizedEmbeddings.quantize(jobs, precision, rerank_factor=args.rerank_factor)
+        variants.append((precision, quantized))
+        variants.append((f"{precision}+rerank", QuantizedEmbeddings(
+            quantized.codes, quantized.scales, jobs, args.rerank_factor)))
+
+    print(f"{'variant':>16} {'MB':>8} {'ms/query':>9} {f'recall@{k}':>10}")
+    for name, embs in variants:
+        top_k_similar(users[0], embs, k)  # warm-up
+        start = time.perf_counter()
+        got = np.stack([top_k_similar(u, embs, k)[0] for u in users])
+        ms = (time.perf_counter() - start) * 1e3 / len(users)
+        print(f"{name:>16} {embs.nbytes / 2**20:>8.1f} {ms:>9.2f} {recall_at_k(expected, got):>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark the top-k recommendation engine against the previous
+sklearn `cosine_similarity` + full `np.argsort` implementation.
+
+Random L2-normalized float32 vectors stand in for job/user embeddings, so no
+model or dataset is needed.
+
+Usage:
+------
+    python -m scripts.benchmark_recommendation
+    python -m scripts.benchmark_recommendation --sizes 10000 100000 --users 256
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.services.recommendation_engine import top_k_similar
+
+
+def baseline_top_k(user_emb: np.ndarray, job_embs: np.ndarray, top_k: int) -> np.ndarray:
+    # Previous implementation of recommend_jobs
+    sims = cosine_similarity(user_emb.reshape(1, -1), job_embs)[0]
+    return np.argsort(sims)[-top_k:][::-1]
+
+
+def random_unit(rows: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    x = rng.standard_normal((rows, dim), dtype=np.float32)
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    return x
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=100)
+    parser.add_argument("--users", type=int, default=64, help="Batch size for the matrix-matrix run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    users = random_unit(args.users, args.dim, rng)
+    user = users[0]
+
+    print(f"{'jobs':>10} {'baseline ms':>12} {'top_k ms':>10} {'speedup':>8} "
+          f"{'batch ms/user':>14}")
+    for n in args.sizes:
+        jobs = random_unit(n, args.dim, rng)
+
+        # Sanity check: both implementations agree on the winners
+        expected = baseline_top_k(user, jobs, args.top_k)
+        got, _ = top_k_similar(user, jobs, args.top_k)
+        assert np.array_equal(np.sort(expected), np.sort(got)), "top-k mismatch"
+
+        t_base = best_of(lambda: baseline_top_k(user, jobs, args.top_k), args.repeat)
+        t_new = best_of(lambda: top_k_similar(user, jobs, args.top_k), args.repeat)
+        t_batch = best_of(lambda: top_k_similar(users, jobs, args.top_k), args.repeat)
+        print(f"{n:>10} {t_base * 1e3:>12.2f} {t_new * 1e3:>10.2f} {t_base / t_new:>7.1f}x "
+              f"{t_batch * 1e3 / args.users:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
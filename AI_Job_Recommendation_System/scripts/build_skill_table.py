@@ -0,0 +1,48 @@
+"""
+Precompute the skill embedding table used by `/ingest/user`.
+
+Encodes every skill in a skills JSON file (a list of {"skill": ...} records, as in
+`resume_analyzer/ai/data/skills.json`) and writes the matrix and skill list
+as a new table generation. Skills already in the table are not re-encoded. Build the
+table with the same --model and --backend the service runs with (MODEL_NAME,
+EMBED_BACKEND); the service rejects a table built with another model or backend.
+
+Usage:
+------
+    python -m scripts.build_skill_table ../resume_analyzer/ai/data/skills.json
+    python -m scripts.build_skill_table skills.json --out data/skills --model all-MiniLM-L6-v2
+    python -m scripts.build_skill_table skills.json --backend onnx
+"""
+
+import argparse
+import json
+import time
+
+from app.services.embedding_utils import initialize_embedding_model
+from app.services.skill_table import SkillEmbeddingTable
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("skills_json")
+    parser.add_argument("--out", default="data/skills")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--backend", default="torch", choices=["torch", "onnx"])
+    args = parser.parse_args()
+
+    with open(args.skills_json) as f:
+        skills = [record["skill"] for record in json.load(f)]
+
+    model = initialize_embedding_model(args.model, device="cpu", backend=args.backend)
+    table = SkillEmbeddingTable(
+        model.get_sentence_embedding_dimension(), args.out, model_name=args.model, backend=args.backend
+    )
+    before = len(table)
+    start = time.perf_counter()
+    table.build(model, skills)
+    print(f"{len(table) - before} new skills encoded in {time.perf_counter() - start:.1f}s; "
+          f"table holds {len(table)} skills at {args.out}")
+
+
+if __name__ == "__main__":
+    main()
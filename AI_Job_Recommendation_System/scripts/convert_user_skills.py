@@ -0,0 +1,61 @@
+"""
+Convert a normalized user skills CSV into the columnar CSR skill-id layout and,
+optionally, embed every user from it.
+
+The CSV (one Python list repr of skills per row) is parsed once; afterwards
+`load_user_skills_csr` memory-maps the result instead of re-parsing millions of
+cells. With `--embed-out`, the distinct skills are looked up in (and, if new, added to)
+the skill embedding table and all users are mean-pooled in blocks with
+`pool_user_embeddings`, writing an (n_users x dim) float32 `.npy` in CSV row order.
+
+Usage:
+------
+    python -m scripts.convert_user_skills data/processed/normalized_user_skills.csv --out data/processed/user_skills
+    python -m scripts.convert_user_skills skills.csv --out user_skills --embed-out user_embeddings.npy
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.embedding_utils import initialize_embedding_model, pool_user_embeddings
+from app.services.skill_table import SkillEmbeddingTable
+from scripts.data_cleaning import convert_user_skills_to_csr, load_user_skills_csr
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("skills_csv")
+    parser.add_argument("--out", default="data/processed/user_skills")
+    parser.add_argument("--embed-out", default=None, help="Also write user embeddings to this .npy")
+    parser.add_argument("--skill-table", default="data/skills")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--backend", default="torch", choices=["torch", "onnx"])
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_users = convert_user_skills_to_csr(args.skills_csv, args.out)
+    print(f"{n_users} users converted to {args.out} in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    vocab, indptr, indices = load_user_skills_csr(args.out)
+    print(f"Loaded {n_users} users / {len(indices)} skills ({len(vocab)} distinct) "
+          f"in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    if args.embed_out:
+        model = initialize_embedding_model(args.model, device="cpu", backend=args.backend)
+        table = SkillEmbeddingTable(
+            model.get_sentence_embedding_dimension(), args.skill_table, model_name=args.model, backend=args.backend
+        )
+        start = time.perf_counter()
+        vocab_embs = table.lookup(model, vocab)
+        table.save()
+        user_embs = pool_user_embeddings(indptr, indices, vocab_embs)
+        np.save(args.embed_out, user_embs)
+        print(f"{n_users} user embeddings written to {args.embed_out} "
+              f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
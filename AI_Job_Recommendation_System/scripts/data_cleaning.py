@@ -1,59 +1,80 @@
+import json
+import os
 import pandas as pd
 import numpy as np
 import re
 import ast
+from typing import Dict, List, Tuple
 
-# -----------------------
-# Utility: clean URLs, emails, phone numbers
-# -----------------------
-
-def clean_text(text: str) -> str:
-    # Remove web links
-    text = re.sub(r"http\S+|www\.\S+", " ", text)
-    # Remove email addresses
-    text = re.sub(r"\S+@\S+", " ", text)
-    # Remove phone numbers (digits, dashes/spaces, length ≥9)
-    text = re.sub(r"\+?\d[\d\-\s]{7,}\d", " ", text)
-    # Collapse all consecutive whitespace into single spaces
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
-
+# clean_text is shared with the API so offline and online cleaning never diverge
+from app.services.text_normalization import clean_text, clean_texts, clean_text_series  # noqa: F401
 
 # -----------------------
 # Utility: load & prepare raw job data
 # -----------------------
 
-def load_and_prepare_jobs(data_path: str) -> pd.DataFrame: 
-    # Read CSV into DataFrame
-    df = pd.read_csv(data_path)
-    # Reset index to ensure continuous integer IDs
-    df = df.reset_index(drop=True)
+def _prepare_jobs(df: pd.DataFrame) -> pd.DataFrame:
     # Rename Job-Title column to Job_title
     df = df.rename(columns={'Job-Title': 'Job_title'})
     # Drop any rows missing essential fields
     df = df.dropna(subset=["Job_title", "Description", "Location"]).copy()
-    # Create a unique job_id based on the DataFrame index
+    # Create a unique job_id based on the DataFrame (file row) index
     df["job_id"] = df.index.astype(int)
 
-    df["title_clean"] = df["Job_title"].apply(clean_text)
-    df["desc_clean"] = df["Description"].apply(clean_text)
+    df["title_clean"] = clean_text_series(df["Job_title"])
+    df["desc_clean"] = clean_text_series(df["Description"])
     df["text"] = df["title_clean"] + " " + df["desc_clean"]
     return df
 
 
+def iter_job_chunks(data_path: str, chunksize: int = 10_000, skip_chunks: int = 0):
+    """
+    Stream the jobs CSV in chunks of `chunksize` rows, yielding prepared DataFrames.
+    The row index keeps counting across chunks, so job_ids match `load_and_prepare_jobs`.
+    The first `skip_chunks` chunks (e.g. already embedded by a resumed run) are read
+    but not cleaned, and not yielded.
+    """
+    for i, chunk in enumerate(pd.read_csv(data_path, chunksize=chunksize)):
+        if i >= skip_chunks:
+            yield _prepare_jobs(chunk)
 
 
-def load_normalized_user_skills(file_path):
-    """
-    Load normalized user skills from a CSV file and convert them to a list of lists.
+def load_and_prepare_jobs(data_path: str) -> pd.DataFrame: 
+    # Read CSV into DataFrame
+    df = pd.read_csv(data_path)
+    # Reset index to ensure continuous integer IDs
+    df = df.reset_index(drop=True)
+    return _prepare_jobs(df)
 
-    Parameters:
-    - file_path (str): The path to the CSV file containing the normalized user skills.
 
-    Returns:
-    - List[List[str]]: A list of lists containing the normalized user skills.
+
+
+# -----------------------
+# Utility: load user skills
+# -----------------------
+
+# A plain list of plainly quoted strings, e.g. ['sql', "c++", 'node.js']. Items hold no
+# backslash, newline or NUL, and the whole cell must match, so anything this accepts
+# parses exactly as `ast.literal_eval` would parse it.
+_SKILL_ITEM = r"'[^'\\\r\n\0]*'" + r'|"[^"\\\r\n\0]*"'
+_SKILL_LIST_RE = re.compile(
+    rf"[ \t]*\[[ \t\r\n]*(?:(?:{_SKILL_ITEM})(?:[ \t\r\n]*,[ \t\r\n]*(?:{_SKILL_ITEM}))*[ \t\r\n]*,?[ \t\r\n]*)?\][ \t]*"
+)
+_SKILL_ITEM_RE = re.compile(_SKILL_ITEM)
+
+
+def parse_skill_list(cell) -> List[str]:
     """
+    Parse one CSV cell holding a Python list of strings. Cells that are a plain list of
+    quoted strings (nearly all of them) are split with one regex scan; everything else,
+    including escapes, adjacent literals and malformed cells, goes to `ast.literal_eval`.
+    """
+    if isinstance(cell, str) and _SKILL_LIST_RE.fullmatch(cell):
+        return [item[1:-1] for item in _SKILL_ITEM_RE.findall(cell)]
+    return ast.literal_eval(cell)
+
+
+def _read_user_skill_cells(file_path: str) -> pd.Series:
     # Load the normalized user skills DataFrame
     normalized_user_skills = pd.read_csv(file_path)
 
@@ -62,6 +83,61 @@ def load_normalized_user_skills(file_path):
         normalized_user_skills.drop(['Unnamed: 0'], axis=1, inplace=True)
 
     # Assuming the first column contains the string representations of the lists
-    normalized_user_skills_list = normalized_user_skills.iloc[:, 0].apply(ast.literal_eval).tolist()
+    return normalized_user_skills.iloc[:, 0]
+
+
+def convert_user_skills_to_csr(file_path: str, out_dir: str) -> int:
+    """
+    Convert a normalized user skills CSV into a dictionary-encoded CSR directory:
+
+    - `vocab.json`: distinct skill strings; a skill id is its position.
+    - `indptr.npy`: int64, user i's skill ids are `indices[indptr[i]:indptr[i + 1]]`.
+    - `indices.npy`: int32 skill ids of all users, concatenated.
+
+    Returns the number of users written.
+    """
+    vocab: Dict[str, int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    for cell in _read_user_skill_cells(file_path).tolist():
+        indices.extend(vocab.setdefault(skill, len(vocab)) for skill in parse_skill_list(cell))
+        indptr.append(len(indices))
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "indptr.npy"), np.asarray(indptr, dtype="int64"))
+    np.save(os.path.join(out_dir, "indices.npy"), np.asarray(indices, dtype="int32"))
+    with open(os.path.join(out_dir, "vocab.json"), "w") as f:
+        json.dump(list(vocab), f)
+    return len(indptr) - 1
+
+
+def load_user_skills_csr(path: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Load a CSR directory written by `convert_user_skills_to_csr` as
+    (vocab, indptr, indices); the arrays are memory-mapped, so this takes
+    milliseconds regardless of the number of users.
+    """
+    with open(os.path.join(path, "vocab.json")) as f:
+        vocab = json.load(f)
+    indptr = np.load(os.path.join(path, "indptr.npy"), mmap_mode="r")
+    indices = np.load(os.path.join(path, "indices.npy"), mmap_mode="r")
+    return vocab, indptr, indices
+
+
+def load_normalized_user_skills(file_path):
+    """
+    Load normalized user skills from a CSV file and convert them to a list of lists.
+
+    Parameters:
+    - file_path (str): The path to the CSV file containing the normalized user skills,
+      or a CSR directory written by `convert_user_skills_to_csr`.
+
+    Returns:
+    - List[List[str]]: A list of lists containing the normalized user skills.
+    """
+    if os.path.isdir(file_path):
+        vocab, indptr, indices = load_user_skills_csr(file_path)
+        names = np.asarray(vocab, dtype=object)[np.asarray(indices)]
+        return [names[start:end].tolist() for start, end in zip(indptr[:-1].tolist(), indptr[1:].tolist())]
 
-    return normalized_user_skills_list
\ No newline at end of file
+    return [parse_skill_list(cell) for cell in _read_user_skill_cells(file_path).tolist()]
@@ -0,0 +1,170 @@
+"""
+Stream a jobs CSV through cleaning and embedding into on-disk float32 files.
+
+The CSV is read in chunks (`iter_job_chunks`), each chunk's titles and descriptions
+are cleaned row by row (`clean_text_series`), and its texts are encoded on a background
+thread while the next chunk is read and cleaned. At most `--max-pending` chunks are in flight, so memory
+stays bounded regardless of the dump size. Embeddings are appended to the output
+directory after every chunk, so an interrupted run resumes where it stopped; chunks
+embedded by the interrupted run are skipped before they are cleaned.
+
+Output directory:
+-----------------
+- `embeddings.f32`: float32 embeddings, row-major (rows x dim), in CSV order.
+- `job_ids.i8`: int64 job_id per embedding row.
+- `manifest.json`: model, dim, rows written and chunks completed.
+
+`load_streamed_embeddings(out_dir)` maps the result read-only as `(job_ids, embeddings)`.
+
+Usage:
+------
+    python -m scripts.embed_jobs data/raw/jobs.csv --out data/embeddings/jobs
+    python -m scripts.embed_jobs jobs.csv --out out/ --chunksize 20000 --batch-size 64
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+import numpy as np
+
+from app.services.embedding_utils import generate_job_embeddings, initialize_embedding_model
+from scripts.data_cleaning import iter_job_chunks
+
+logger = logging.getLogger(__name__)
+
+
+def _read_manifest(out_dir: str) -> dict:
+    path = os.path.join(out_dir, "manifest.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(out_dir: str, manifest: dict) -> None:
+    tmp = os.path.join(out_dir, "manifest.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, os.path.join(out_dir, "manifest.json"))
+
+
+def _append(path: str, offset: int, data: bytes) -> None:
+    # Truncate to the committed size first, dropping rows of an interrupted chunk
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(data)
+        # Durable before the manifest that counts these rows is written
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def embed_jobs_streaming(
+    data_path: str,
+    out_dir: str,
+    model,
+    model_name: str,
+    chunksize: int = 10_000,
+    batch_size: int = 64,
+    max_pending: int = 2,
+) -> dict:
+    """
+    Embed every job in `data_path` chunk by chunk into `out_dir`, resuming from the
+    last completed chunk. Returns the final manifest.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = _read_manifest(out_dir)
+    if manifest.get("model") != model_name:
+        manifest = {"model": model_name, "dim": None, "rows": 0, "chunks": 0, "chunksize": chunksize}
+    elif manifest["chunksize"] != chunksize:
+        raise ValueError(f"{out_dir} was written with chunksize {manifest['chunksize']}; pass the same to resume")
+    skip = manifest["chunks"]
+
+    start = time.perf_counter()
+    rows_done, bytes_done = 0, 0
+    pending = deque()
+
+    def flush(wait_all: bool) -> None:
+        nonlocal rows_done, bytes_done
+        while pending and (wait_all or len(pending) >= max_pending or
+                           pending[0][1] is None or pending[0][1].done()):
+            job_ids, future = pending.popleft()
+            if future is None:
+                # Every row of the chunk was dropped; count it so a resume skips it
+                manifest["chunks"] += 1
+                _write_manifest(out_dir, manifest)
+                continue
+            embs = np.ascontiguousarray(future.result(), dtype="float32")
+            if manifest["dim"] is None:
+                manifest["dim"] = int(embs.shape[1])
+            rows = manifest["rows"]
+            _append(os.path.join(out_dir, "embeddings.f32"), rows * manifest["dim"] * 4, embs.tobytes())
+            _append(os.path.join(out_dir, "job_ids.i8"), rows * 8, job_ids.astype("<i8").tobytes())
+            manifest["rows"] = rows + len(job_ids)
+            manifest["chunks"] += 1
+            _write_manifest(out_dir, manifest)
+
+            rows_done += len(job_ids)
+            bytes_done += embs.nbytes
+            elapsed = time.perf_counter() - start
+            logger.info("chunk %d: %d rows total, %.0f rows/s, %.1f MB embeddings written",
+                        manifest["chunks"], manifest["rows"], rows_done / elapsed, bytes_done / 2**20)
+
+    # One encode thread: the model already parallelizes a batch; the win is overlapping
+    # CSV parsing / cleaning of the next chunk with encoding of the current one.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed") as pool:
+        for chunk in iter_job_chunks(data_path, chunksize, skip_chunks=skip):
+            texts = chunk["text"].tolist()
+            future = pool.submit(generate_job_embeddings, model, texts, batch_size) if texts else None
+            pending.append((chunk["job_id"].to_numpy(), future))
+            del chunk, texts
+            flush(wait_all=False)
+        flush(wait_all=True)
+
+    manifest["completed"] = True
+    _write_manifest(out_dir, manifest)
+    elapsed = time.perf_counter() - start
+    logger.info("Embedded %d rows in %.1fs (%.0f rows/s) into %s",
+                rows_done, elapsed, rows_done / max(elapsed, 1e-9), out_dir)
+    return manifest
+
+
+def load_streamed_embeddings(out_dir: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read-only memmaps of the job ids and (rows x dim) embeddings written by
+    `embed_jobs_streaming`.
+    """
+    manifest = _read_manifest(out_dir)
+    rows, dim = manifest["rows"], manifest["dim"]
+    job_ids = np.memmap(os.path.join(out_dir, "job_ids.i8"), dtype="<i8", mode="r", shape=(rows,))
+    embs = np.memmap(os.path.join(out_dir, "embeddings.f32"), dtype="float32", mode="r", shape=(rows, dim))
+    return job_ids, embs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("jobs_csv")
+    parser.add_argument("--out", default="data/embeddings/jobs")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--chunksize", type=int, default=10_000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-pending", type=int, default=2)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    model = initialize_embedding_model(args.model, device="cpu")
+    manifest = embed_jobs_streaming(
+        args.jobs_csv, args.out, model, args.model,
+        chunksize=args.chunksize, batch_size=args.batch_size, max_pending=args.max_pending,
+    )
+    print(f"{manifest['rows']} job embeddings (dim {manifest['dim']}) in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Export the embedding model to a quantized ONNX Runtime backend and check it.
+
+Exports `--model` to `--out` (fp32 + dynamic int8), then encodes a reference set
+with both PyTorch and ONNX Runtime and fails if any pair of vectors falls below the
+cosine `--threshold`. Also prints encode latency for both backends.
+
+The reference set is the `--column` of a jobs CSV when `--reference-csv` is given,
+otherwise a handful of built-in job/skill texts.
+
+Usage:
+------
+    python -m scripts.export_onnx_model --out models/all-MiniLM-L6-v2-onnx
+    python -m scripts.export_onnx_model --reference-csv data/jobs.csv --limit 500
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from app.services.embedding_utils import clean_text, initialize_embedding_model
+from app.services.onnx_backend import OnnxEmbeddingModel, check_onnx_accuracy, export_onnx_model
+
+REFERENCE_TEXTS = [
+    "Senior Python developer to build ETL pipelines and manage data lakes on AWS.",
+    "Customer service representative for a BPO call center, night shift, Cairo.",
+    "Machine learning engineer with PyTorch, NLP and MLOps experience.",
+    "Front-end developer: React, TypeScript, CSS, REST APIs.",
+    "Accountant responsible for payroll, tax filings and financial reporting.",
+    "python", "sql", "project management", "communication skills", "docker",
+]
+
+
+def timed_encode(model, texts, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model.encode(texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--threshold", type=float, default=0.99)
+    parser.add_argument("--reference-csv", default=None)
+    parser.add_argument("--column", default="Description")
+    parser.add_argument("--limit", type=int, default=500)
+    args = parser.parse_args()
+    out = args.out or f"models/{args.model}-onnx"
+
+    if args.reference_csv:
+        texts = pd.read_csv(args.reference_csv, usecols=[args.column], nrows=args.limit)[args.column]
+        texts = [clean_text(t) for t in texts.dropna().astype(str)]
+    else:
+        texts = REFERENCE_TEXTS
+
+    export_onnx_model(args.model, out, quantize=True)
+    reference = initialize_embedding_model(args.model, device="cpu")
+    for quantized in (False, True):
+        candidate = OnnxEmbeddingModel(out, quantized=quantized, num_threads=args.threads)
+        min_cos = check_onnx_accuracy(reference, candidate, texts, threshold=args.threshold)
+        label = "onnx int8" if quantized else "onnx fp32"
+        print(f"{label}: min cosine vs torch = {min_cos:.4f} over {len(texts)} texts")
+
+    t_torch = timed_encode(reference, texts)
+    t_onnx = timed_encode(candidate, texts)
+    print(f"encode {len(texts)} texts: torch {t_torch * 1e3:.1f} ms, "
+          f"onnx int8 {t_onnx * 1e3:.1f} ms ({t_torch / t_onnx:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Precompute the top-k jobs for every user (e.g. for the nightly email digest).
+
+User embeddings are read block by block from a memory-mapped `.npy` and ranked
+against the whole job catalog with `top_k_similar_blocked`, which also walks the job
+matrix in tiles. User blocks run on a thread pool (one BLAS thread per worker, so all
+cores are busy without oversubscription) and are written in order to a compact
+fixed-size record file. A manifest is updated after every block, so an interrupted
+run resumes from the last completed block; it records a hash of the job and user ids,
+so a resume against a different catalog or user list starts over instead.
+
+Output directory:
+-----------------
+- `topk.bin`: one record per user, dtype `record_dtype(top_k)`:
+  `user_id <i8`, `job_ids <i4[top_k]`, `scores <f2[top_k]`. Users with fewer than
+  top_k candidate jobs are padded with job_id -1 and score -inf.
+- `manifest.json`: top_k, job count, ids hash, users total/done (the checkpoint) and
+  throughput.
+
+`load_top_k(out_dir)` maps the records read-only.
+
+Job catalog sources (`--jobs`):
+-------------------------------
+- a `scripts.embed_jobs` output directory (`embeddings.f32` + `job_ids.i8`),
+- a `CatalogStore` directory (live rows of a `JobCache` store; dead rows stay in the
+  memory-mapped matrix and are masked out while it is scanned in job blocks), or
+- a `.npy` matrix, with job ids taken from `--job-ids` (`.npy`) or the row number.
+
+Usage:
+------
+    python -m scripts.precompute_recommendations --users data/processed/user_embeddings.npy \\
+        --jobs data/embeddings/jobs --out data/digest --top-k 50
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.services.inference_pool import pin_compute_threads
+from app.services.recommendation_engine import top_k_similar_blocked
+
+logger = logging.getLogger(__name__)
+
+
+def record_dtype(top_k: int) -> np.dtype:
+    return np.dtype([("user_id", "<i8"), ("job_ids", "<i4", (top_k,)), ("scores", "<f2", (top_k,))])
+
+
+def load_job_catalog(
+    path: str, ids_path: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+    """
+    Return (job_ids, job_embeddings, exclude) from any of the supported catalog sources.
+    The embeddings stay memory-mapped; `exclude` flags rows that are not live jobs
+    (CatalogStore rows awaiting compaction), or is None.
+    """
+    if os.path.isdir(path):
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if "columns" in manifest:
+            from app.services.catalog_store import CatalogStore
+
+            store = CatalogStore(path, manifest["model"], columns=manifest["columns"])
+            return store.records()["job_id"], store.embeddings(), ~store.live()
+        from scripts.embed_jobs import load_streamed_embeddings
+
+        return (*load_streamed_embeddings(path), None)
+    embs = np.load(path, mmap_mode="r")
+    job_ids = np.load(ids_path) if ids_path else np.arange(len(embs))
+    return job_ids, embs, None
+
+
+def ids_hash(job_ids: np.ndarray, user_ids: np.ndarray, exclude: Optional[np.ndarray] = None) -> str:
+    """
+    Hash of the ranked job ids (in row order) and user ids, to detect a resume
+    against a different catalog or user list.
+    """
+    digest = hashlib.sha1()
+    live = job_ids if exclude is None else job_ids[~exclude]
+    digest.update(np.ascontiguousarray(live, dtype="<i8"))
+    digest.update(b"|")
+    digest.update(np.ascontiguousarray(user_ids, dtype="<i8"))
+    return digest.hexdigest()
+
+
+def _rank_block(user_embs: np.ndarray, job_ids: np.ndarray, job_embs: np.ndarray, top_k: int,
+                user_ids: np.ndarray, exclude: Optional[np.ndarray] = None) -> np.ndarray:
+    idx, scores = top_k_similar_blocked(np.asarray(user_embs, dtype="float32"), job_embs, top_k,
+                                        exclude=exclude)
+    records = np.zeros(len(user_ids), dtype=record_dtype(top_k))
+    records["user_id"] = user_ids
+    records["job_ids"] = -1
+    records["scores"] = -np.inf
+    k = idx.shape[1]
+    # Excluded rows only fill in (at -inf) when fewer than top_k jobs are live
+    records["job_ids"][:, :k] = np.where(np.isneginf(scores), -1, job_ids[idx])
+    records["scores"][:, :k] = scores
+    return records
+
+
+def _write_manifest(out_dir: str, manifest: dict) -> None:
+    tmp = os.path.join(out_dir, "manifest.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, os.path.join(out_dir, "manifest.json"))
+
+
+def precompute_top_k(
+    user_embs: np.ndarray,
+    job_ids: np.ndarray,
+    job_embs: np.ndarray,
+    out_dir: str,
+    top_k: int = 50,
+    user_ids: Optional[np.ndarray] = None,
+    block_size: int = 4096,
+    workers: Optional[int] = None,
+    exclude: Optional[np.ndarray] = None,
+) -> dict:
+    """
+    Write the top_k jobs of every user to `out_dir`, resuming from its manifest.
+    Job rows flagged in the bool mask `exclude` are never recommended.
+    Returns the final manifest.
+    """
+    n_users = len(user_embs)
+    user_ids = np.arange(n_users) if user_ids is None else np.asarray(user_ids)
+    job_ids = np.asarray(job_ids)
+    if exclude is not None:
+        exclude = np.asarray(exclude, dtype=bool)
+    live_ids = job_ids if exclude is None else job_ids[~exclude]
+    if len(live_ids) and (live_ids.max() > np.iinfo("int32").max or live_ids.min() < 0):
+        raise ValueError("job ids must fit in a non-negative int32 for the compact record format")
+    run_hash = ids_hash(job_ids, user_ids, exclude)
+    job_ids = job_ids.astype("int32")
+    workers = workers or os.cpu_count() or 1
+    dtype = record_dtype(top_k)
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    manifest = {"top_k": top_k, "n_users": n_users, "users_done": 0, "n_jobs": len(live_ids),
+                "ids_hash": run_hash}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+        if all(previous.get(key) == manifest[key] for key in ("top_k", "n_users", "n_jobs", "ids_hash")):
+            manifest = previous
+        else:
+            logger.warning("Existing output in %s does not match this run; starting over", out_dir)
+
+    done = manifest["users_done"]
+    records_path = os.path.join(out_dir, "topk.bin")
+    out = open(records_path, "r+b" if os.path.exists(records_path) else "wb")
+    # Drop records written after the last checkpoint
+    out.truncate(done * dtype.itemsize)
+    out.seek(done * dtype.itemsize)
+
+    pin_compute_threads(1)
+    start, ranked = time.perf_counter(), 0
+    pending = deque()
+
+    def flush(wait_all: bool) -> None:
+        nonlocal ranked
+        while pending and (wait_all or len(pending) >= 2 * workers):
+            stop, future = pending.popleft()
+            records = future.result()
+            out.write(records.tobytes())
+            out.flush()
+            manifest["users_done"] = stop
+            _write_manifest(out_dir, manifest)
+            ranked += len(records)
+            elapsed = time.perf_counter() - start
+            logger.info("%d/%d users, %.0f users/s", stop, n_users, ranked / elapsed)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="topk") as pool:
+            for u0 in range(done, n_users, block_size):
+                u1 = min(u0 + block_size, n_users)
+                future = pool.submit(_rank_block, user_embs[u0:u1], job_ids, job_embs, top_k,
+                                     user_ids[u0:u1], exclude)
+                pending.append((u1, future))
+                flush(wait_all=False)
+            flush(wait_all=True)
+    finally:
+        out.close()
+
+    elapsed = time.perf_counter() - start
+    manifest["users_per_second"] = ranked / elapsed if elapsed else None
+    _write_manifest(out_dir, manifest)
+    logger.info("Ranked %d users against %d jobs in %.1fs (%.0f users/s)",
+                ranked, len(live_ids), elapsed, ranked / max(elapsed, 1e-9))
+    return manifest
+
+
+def load_top_k(out_dir: str) -> np.ndarray:
+    """
+    Read-only memmap of the completed per-user top-k records.
+    """
+    with open(os.path.join(out_dir, "manifest.json")) as f:
+        manifest = json.load(f)
+    return np.memmap(os.path.join(out_dir, "topk.bin"), dtype=record_dtype(manifest["top_k"]),
+                     mode="r", shape=(manifest["users_done"],))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", required=True, help="(n_users x dim) user embeddings .npy")
+    parser.add_argument("--user-ids", default=None, help="Optional .npy of user ids (default: row number)")
+    parser.add_argument("--jobs", required=True, help="embed_jobs dir, CatalogStore dir or .npy")
+    parser.add_argument("--job-ids", default=None, help="Job ids .npy when --jobs is a .npy")
+    parser.add_argument("--out", default="data/digest")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--block-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    user_embs = np.load(args.users, mmap_mode="r")
+    user_ids = np.load(args.user_ids) if args.user_ids else None
+    job_ids, job_embs, exclude = load_job_catalog(args.jobs, args.job_ids)
+    manifest = precompute_top_k(
+        user_embs, job_ids, job_embs, args.out, top_k=args.top_k, user_ids=user_ids,
+        block_size=args.block_size, workers=args.workers, exclude=exclude,
+    )
+    print(f"{manifest['users_done']} users ranked into {args.out} "
+          f"({manifest['users_per_second'] or 0:.0f} users/s)")
+
+
+if __name__ == "__main__":
+    main()
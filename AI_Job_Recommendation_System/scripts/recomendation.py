@@ -7,13 +7,18 @@ if project_root not in sys.path:
 
 from scripts.data_cleaning import load_and_prepare_jobs, load_normalized_user_skills, clean_text
 from app.services.embedding_utils import generate_job_embeddings
+from app.services.catalog_store import CatalogStore
+from app.services.attribute_index import AttributeIndex
+from app.services.quantization import QuantizedEmbeddings, quantized_path
+from app.services.recommendation_engine import similarities, top_k_rerank
 import pandas as pd
 import numpy as np
 from pydantic import BaseModel
 import re
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
 import torch
 import ast
 from sklearn.preprocessing import normalize
@@ -25,55 +30,201 @@ class Job(BaseModel):
     Location: str
     score: float = 0.0
 
+JOB_FIELDS = ("job_id", "Job_title", "Description", "Location")
+
+
+class JobRecord:
+    # Slotted result row: no per-instance dict and no pydantic validation
+    __slots__ = ("job_id", "score", "Job_title", "Description", "Location")
+
+    def __init__(self, job_id: int, score: float, Job_title: str = None,
+                 Description: str = None, Location: str = None):
+        self.job_id = job_id
+        self.score = score
+        self.Job_title = Job_title
+        self.Description = Description
+        self.Location = Location
+
+    def __repr__(self):
+        return f"JobRecord(job_id={self.job_id}, score={self.score:.4f}, Job_title={self.Job_title!r})"
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    # Immutable view of the catalog; reloads publish a new one instead of mutating
+    version: int
+    job_df: pd.DataFrame
+    embeddings: np.ndarray
+    id_index: Dict[int, int]
+    columns: Dict[str, np.ndarray]  # numpy-backed copies of JOB_FIELDS for take()
+    attrs: AttributeIndex           # location / title-token postings keyed by row
+    live: Optional[np.ndarray] = None
+
+
 class JobCache:
-    def __init__(self, job_path: str, model_name: str, top_k: int = 7, embeddings_path: str = None):
+    def __init__(self, job_path: str, model_name: str, top_k: int = 7, embeddings_path: str = None,
+                 store_dir: str = None, sync_on_start: bool = True, precision: str = "float32",
+                 rerank: bool = True):
         self.job_path = job_path
         self.model = SentenceTransformer(model_name)
+        # Serializes reloads only; queries read the published snapshot without locking
         self.lock = threading.Lock()
         self.embeddings_path = embeddings_path
         self.top_k = top_k
-        self.reload_jobs()
+        # Append-only memory-mapped catalog; replaces embeddings_path when set
+        self.store = CatalogStore(store_dir, model_name) if store_dir else None
+        # "float16" / "int8": scan compact codes; rerank re-scores the top candidates in float32
+        self.precision = precision
+        self.rerank = rerank
+        self.snapshot = None
+        self.reload_jobs(sync=sync_on_start)
+
+    # Current-snapshot accessors kept for existing callers
+    @property
+    def job_df(self) -> pd.DataFrame:
+        return self.snapshot.job_df
 
-    def reload_jobs(self):
+    @property
+    def embeddings(self) -> np.ndarray:
+        return self.snapshot.embeddings
+
+    @property
+    def live(self) -> Optional[np.ndarray]:
+        return self.snapshot.live
+
+    def reload_jobs(self, sync: bool = True) -> CatalogSnapshot:
         with self.lock:
-            # Load and generate job_id
-            df = load_and_prepare_jobs(self.job_path)
-            # Clean and combine text fields
-            df["title_clean"] = df["Job_title"].apply(clean_text)
-            df["desc_clean"] = df["Description"].apply(clean_text)
-            df["text"] = df["title_clean"] + " " + df["desc_clean"]
-            self.job_df = df.reset_index(drop=True)
-            
+            snapshot = self._build_snapshot(sync)
+            # Single reference assignment: readers see either the old or the new snapshot.
+            # The old one is freed once the last in-flight query drops its reference.
+            self.snapshot = snapshot
+            return snapshot
+
+    def reload_in_background(self, sync: bool = True) -> threading.Thread:
+        thread = threading.Thread(target=self.reload_jobs, args=(sync,), name="jobcache-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def _build_snapshot(self, sync: bool) -> CatalogSnapshot:
+        version = self.snapshot.version + 1 if self.snapshot is not None else 1
+        live = None
+        if self.store is not None:
+            if sync or len(self.store) == 0:
+                # Only new or changed jobs are embedded; the rest is reused from disk
+                df = load_and_prepare_jobs(self.job_path)
+                self.store.sync(df, lambda texts: generate_job_embeddings(self.model, texts))
+            else:
+                self.store.refresh()
+            job_df = self.store.frame()
+            embeddings = self.store.embeddings()
+            live = self.store.live()
+        else:
+            # Load, generate job_id and clean/combine text fields
+            job_df = load_and_prepare_jobs(self.job_path).reset_index(drop=True)
+
             # Try to load embeddings from file if path is provided
             if self.embeddings_path and os.path.exists(self.embeddings_path):
-                self.embeddings = np.load(self.embeddings_path)
+                embeddings = np.load(self.embeddings_path, mmap_mode='r')
                 print("embeddings loaded")
             else:
                 # Generate embeddings if file doesn't exist
-                self.embeddings = generate_job_embeddings(self.model, self.job_df["text"].tolist())
+                embeddings = generate_job_embeddings(self.model, job_df["text"].tolist())
                 # Save embeddings if path is provided
                 if self.embeddings_path:
-                    np.save(self.embeddings_path, self.embeddings)
-
-
-    def query(self, user_emb: np.ndarray):
-
-        df_f = self.job_df.reset_index(drop=True)
-        emb_f = self.embeddings
-
-        # Compute cosine similarities
-        sims = cosine_similarity([user_emb], emb_f)[0]
-        # Select top-K indices
-        top_idx = np.argsort(sims)[-self.top_k:][::-1]
-
-        results = []
-        for i in top_idx:
-            row = df_f.iloc[i]
-            results.append(Job(
-                job_id=int(row.job_id),
-                Job_title=row.Job_title,
-                Description=row.Description,
-                Location=row.Location,
-                score=float(sims[i]),
-            ))
-        return results
\ No newline at end of file
+                    np.save(self.embeddings_path, embeddings)
+                    if self.precision != "float32":
+                        # Keep only the compact codes resident; re-ranking reads the map
+                        embeddings = np.load(self.embeddings_path, mmap_mode='r')
+        embeddings = self._to_precision(embeddings)
+
+        rows = np.flatnonzero(live) if live is not None else np.arange(len(job_df))
+        id_index = dict(zip(job_df["job_id"].to_numpy()[rows].tolist(), rows.tolist()))
+        columns = {name: job_df[name].to_numpy() for name in JOB_FIELDS}
+        attrs = AttributeIndex()
+        attrs.add_many(rows.tolist(), columns["Location"][rows].tolist(), columns["Job_title"][rows].tolist())
+        return CatalogSnapshot(version, job_df, embeddings, id_index, columns, attrs, live)
+
+    def _to_precision(self, embeddings: np.ndarray):
+        """
+        Quantize the catalog matrix to `precision`. The codes are cached next to
+        `embeddings_path`; the float32 rows stay attached for exact re-ranking.
+        """
+        if self.precision == "float32":
+            return embeddings
+        exact = embeddings if self.rerank else None
+        path = None
+        if self.store is None and self.embeddings_path and os.path.exists(self.embeddings_path):
+            path = quantized_path(self.embeddings_path, self.precision)
+            if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(self.embeddings_path):
+                quantized = QuantizedEmbeddings.load(path, exact)
+                if len(quantized) == len(embeddings):
+                    return quantized
+        quantized = QuantizedEmbeddings.quantize(embeddings, self.precision, exact)
+        if path:
+            quantized.save(path)
+        return quantized
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        snap = self.snapshot
+        row = snap.id_index.get(job_id)
+        if row is None:
+            return None
+        return Job(**{name: snap.columns[name][row] for name in JOB_FIELDS})
+
+    def query_columns(self, user_emb: np.ndarray, fields: Optional[Sequence[str]] = None,
+                      locations: Optional[Sequence[str]] = None,
+                      title_keywords: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Top-k jobs as columns: `job_id`, `score` and the requested metadata `fields`
+        (all of them when None), each gathered with one `take` over the top-k rows.
+        `locations` (any) and `title_keywords` (all) restrict the scan to matching rows.
+        """
+        # Read the snapshot once so a concurrent reload cannot mix old and new state
+        snap = self.snapshot
+        fields = [f for f in (JOB_FIELDS if fields is None else fields) if f not in ("job_id", "score")]
+
+        # Catalog rows are L2-normalized, so cosine similarity is a dot product
+        user_emb = np.asarray(user_emb, dtype="float32").reshape(-1)
+        norm = np.linalg.norm(user_emb)
+        if norm > 0:
+            user_emb = user_emb / norm
+
+        # Filter rows come from live rows only, so they need no live mask
+        rows = snap.attrs.match(locations, title_keywords)
+        embs = snap.embeddings if rows is None else snap.embeddings[rows]
+        sims = similarities(user_emb, embs)
+        if rows is None and snap.live is not None:
+            # Replaced or deleted jobs stay in the catalog store until compaction
+            sims[0, ~snap.live] = -np.inf
+        # Select top-K indices (re-scored exactly when the catalog is quantized)
+        top_idx, top_scores = top_k_rerank(user_emb, sims, embs, self.top_k)
+        keep = np.isfinite(top_scores[0])
+        top_idx, top_scores = top_idx[0][keep], top_scores[0][keep]
+        if rows is not None:
+            top_idx = rows[top_idx]
+
+        out = {"job_id": snap.columns["job_id"].take(top_idx), "score": top_scores}
+        for name in fields:
+            out[name] = snap.columns[name].take(top_idx)
+        return out
+
+    def query_records(self, user_emb: np.ndarray, fields: Optional[Sequence[str]] = None,
+                      **filters) -> List["JobRecord"]:
+        """
+        Top-k jobs as lightweight `JobRecord`s; unrequested fields are left as None.
+        """
+        cols = self.query_columns(user_emb, fields, **filters)
+        names = list(cols)
+        return [JobRecord(**dict(zip(names, values)))
+                for values in zip(*(cols[name].tolist() for name in names))]
+
+    def query(self, user_emb: np.ndarray, locations: Optional[Sequence[str]] = None,
+              title_keywords: Optional[Sequence[str]] = None):
+        cols = self.query_columns(user_emb, locations=locations, title_keywords=title_keywords)
+        return [
+            Job(job_id=job_id, Job_title=title, Description=desc, Location=loc, score=score)
+            for job_id, title, desc, loc, score in zip(
+                cols["job_id"].tolist(), cols["Job_title"].tolist(), cols["Description"].tolist(),
+                cols["Location"].tolist(), cols["score"].tolist(),
+            )
+        ]
@@ -0,0 +1,22 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services.inference_pool import InferencePool
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch, encoder):
+    """
+    The API with its services initialized by `init_services` around a stand-in encoder,
+    with every index and cache under a temporary directory.
+    """
+    monkeypatch.setattr(main, "embed_model", encoder)
+    monkeypatch.setattr(main, "INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(main, "inference_pool", InferencePool(workers=2, max_queue=8, timeout=10))
+    monkeypatch.setenv("SKILL_TABLE_DIR", str(tmp_path / "skills"))
+    monkeypatch.setenv("EMBED_CACHE_PATH", str(tmp_path / "cache" / "embeddings.sqlite3"))
+    main.init_services()
+    # Without a `with` block TestClient does not run the lifespan hook
+    yield TestClient(main.app)
+    main.close_services()
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+from app import main
+from app.services.inference_pool import InferencePool
+
+
+def test_rejected_ingest_is_not_encoded(service, monkeypatch, encoder):
+    pool = InferencePool(workers=1, max_queue=0, timeout=10)
+    monkeypatch.setattr(main, "inference_pool", pool)
+    release = threading.Event()
+    blocker = threading.Thread(target=asyncio.run, args=(pool.run(release.wait),))
+    blocker.start()
+    try:
+        while pool.stats()["inflight"] == 0:
+            release.wait(0.001)
+        calls = len(encoder.calls)
+        resp = service.post("/ingest/job", json={"job_id": 1, "description": "Backend engineer"})
+        assert resp.status_code == 429
+        assert resp.headers["Retry-After"] == "1"
+        # Give the batcher time to pick up anything that was (wrongly) queued
+        release.wait(0.05)
+        assert len(encoder.calls) == calls
+    finally:
+        release.set()
+        blocker.join()
+        pool.shutdown()
+
+    resp = service.post("/ingest/job", json={"job_id": 1, "description": "Backend engineer"})
+    assert resp.status_code == 200
+
+
+def test_slow_request_times_out(service, monkeypatch):
+    pool = InferencePool(workers=1, max_queue=1, timeout=0.05)
+    monkeypatch.setattr(main, "inference_pool", pool)
+    release = threading.Event()
+    monkeypatch.setattr(main, "_ingest_user", lambda *args: release.wait())
+    try:
+        resp = service.post("/ingest/user", json={"user_id": 1, "skills": ["python"]})
+        assert resp.status_code == 504
+        assert pool.stats()["timed_out"] == 1
+    finally:
+        release.set()
+        pool.shutdown()
@@ -0,0 +1,40 @@
+import numpy as np
+
+from app.services.wire_format import decode_embedding
+
+
+def test_reingesting_an_unchanged_job_hits_the_cache(service, encoder):
+    job = {"job_id": 1, "description": "Python developer, contact jobs@example.com"}
+    first = service.post("/ingest/job", json=job)
+    assert first.status_code == 200
+    calls = len(encoder.calls)
+
+    again = service.post("/ingest/job", json={**job, "job_id": 2})
+    assert again.status_code == 200
+    assert len(encoder.calls) == calls
+    assert np.allclose(again.json()["embedding"], first.json()["embedding"])
+    assert service.get("/cache/stats").json()["memory_hits"] >= 1
+
+
+def test_bulk_ingest_only_encodes_new_texts(service, encoder):
+    service.post("/ingest/job", json={"job_id": 1, "description": "Data engineer"})
+    encoder.calls.clear()
+    jobs = [{"job_id": 1, "description": "Data engineer"},
+            {"job_id": 2, "description": "Frontend developer"}]
+    resp = service.post("/ingest/jobs", json={"jobs": jobs}, params={"embedding_format": "b64f32"})
+    assert resp.status_code == 200
+    assert encoder.calls == [["Frontend developer"]]
+    assert [job["job_id"] for job in resp.json()["jobs"]] == [1, 2]
+    assert decode_embedding(resp.json()["jobs"][1]["embedding"]).shape == (encoder.dim,)
+
+
+def test_user_cache_key_ignores_skill_order_and_case(service, encoder):
+    first = service.post("/ingest/user", json={"user_id": 1, "skills": ["Python", "SQL"]})
+    calls = len(encoder.calls)
+    second = service.post("/ingest/user", json={"user_id": 2, "skills": ["sql", " python"]})
+    assert second.status_code == 200
+    assert len(encoder.calls) == calls
+    assert np.allclose(first.json()["embedding"], second.json()["embedding"])
+
+    service.post("/ingest/user", json={"user_id": 3, "skills": ["Python", "Go"]})
+    assert len(encoder.calls) == calls + 1
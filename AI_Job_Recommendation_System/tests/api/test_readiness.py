@@ -0,0 +1,29 @@
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+def test_ready_once_services_are_initialized(service):
+    assert service.get("/ready").json() == {"status": "ready"}
+    assert service.get("/").status_code == 200
+
+
+def test_failed_initialization_is_reported(tmp_path, monkeypatch, encoder):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setattr(main, "embed_model", encoder)
+    monkeypatch.setattr(main, "INDEX_DIR", str(blocker / "index"))
+    monkeypatch.setattr(main, "ready", main.threading.Event())
+    main.init_services()
+    try:
+        client = TestClient(main.app)
+        resp = client.get("/ready")
+        assert resp.status_code == 500
+        assert resp.json()["status"] == "failed"
+        assert "NotADirectoryError" in resp.json()["error"]
+
+        resp = client.post("/ingest/job", json={"job_id": 1, "title": "t", "description": "d"})
+        assert resp.status_code == 503
+        assert "failed to initialize" in resp.json()["detail"]
+    finally:
+        monkeypatch.setattr(main, "init_error", None)
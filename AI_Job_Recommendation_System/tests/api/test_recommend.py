@@ -0,0 +1,31 @@
+JOBS = [
+    {"job_id": 1, "title": "Python Developer", "location": "Cairo, Egypt", "description": "Python APIs"},
+    {"job_id": 2, "title": "Python Engineer", "location": "Berlin, Germany", "description": "Python services"},
+    {"job_id": 3, "title": "Data Analyst", "location": "Cairo, Egypt", "description": "SQL dashboards"},
+    {"job_id": 4, "title": "Java Developer", "location": "Alexandria, Egypt", "description": "Java backends"},
+]
+
+
+def recommend(service, **body):
+    resp = service.post("/recommend", json={"user_id": 7, **body})
+    assert resp.status_code == 200, resp.text
+    return [rec["job_id"] for rec in resp.json()["recommendations"]]
+
+
+def test_recommend_filters_by_location_and_title(service):
+    for job in JOBS:
+        assert service.post("/ingest/job", json=job).status_code == 200
+    assert service.post("/ingest/user", json={"user_id": 7, "skills": ["python"]}).status_code == 200
+
+    assert sorted(recommend(service)) == [1, 2, 3, 4]
+    assert sorted(recommend(service, locations=["cairo"])) == [1, 3]
+    assert sorted(recommend(service, locations=["Egypt"], top_k=3)) == [1, 3, 4]
+    assert recommend(service, locations=["Berlin", "Alexandria"], title_keywords=["developer"]) == [4]
+    assert recommend(service, locations=["Paris"]) == []
+
+    # Re-ingesting a job moves it to its new location
+    moved = dict(JOBS[1], location="Cairo, Egypt")
+    assert service.post("/ingest/job", json=moved).status_code == 200
+    assert sorted(recommend(service, locations=["cairo"])) == [1, 2, 3]
+    assert service.delete("/jobs/1").status_code == 200
+    assert sorted(recommend(service, locations=["cairo"])) == [2, 3]
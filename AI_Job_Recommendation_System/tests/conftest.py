@@ -0,0 +1,32 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+
+class FakeEncoder:
+    """
+    Deterministic stand-in for a SentenceTransformer: every text maps to a fixed
+    pseudo-random vector, and every encode call is recorded.
+    """
+
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.calls = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, show_progress_bar=False, **kwargs):
+        texts = list(texts)
+        self.calls.append(texts)
+        return np.array([self.vector(text) for text in texts], dtype="float32").reshape(len(texts), self.dim)
+
+    def vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).normal(size=self.dim).astype("float32")
+
+
+@pytest.fixture
+def encoder():
+    return FakeEncoder()
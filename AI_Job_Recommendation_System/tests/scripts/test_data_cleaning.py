@@ -0,0 +1,72 @@
+import ast
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.embedding_utils import generate_user_embedding, pool_user_embeddings
+from scripts.data_cleaning import (
+    convert_user_skills_to_csr,
+    load_normalized_user_skills,
+    load_user_skills_csr,
+    parse_skill_list,
+)
+
+
+@pytest.mark.parametrize("cell", [
+    "['python', 'sql']",
+    "[\"c++\", 'node.js', \"it's\"]",
+    "[ 'a' ,\n 'b', ]",
+    "[]",
+    "['it''s']",          # adjacent literals concatenate
+    "['a' 'b', 'c']",
+    "['tab\\there']",      # escapes
+    "[u'python', r'\\d']",  # string prefixes
+    "['python', 1]",
+    " ['padded'] ",
+])
+def test_parse_skill_list_matches_literal_eval(cell):
+    assert parse_skill_list(cell) == ast.literal_eval(cell)
+
+
+@pytest.mark.parametrize("cell", ["['python'", "python, sql", "[,]", "['a']]", float("nan")])
+def test_parse_skill_list_rejects_malformed_cells_like_literal_eval(cell):
+    with pytest.raises((ValueError, SyntaxError)):
+        ast.literal_eval(cell)
+    with pytest.raises((ValueError, SyntaxError)):
+        parse_skill_list(cell)
+
+
+@pytest.fixture
+def skills_csv(tmp_path):
+    path = tmp_path / "user_skills.csv"
+    pd.DataFrame({"skills": [
+        "['python', 'sql']",
+        "[]",
+        "['sql', \"c++\", 'python']",
+        "['it''s']",
+    ]}).to_csv(path)  # keeps the "Unnamed: 0" index column the loader drops
+    return str(path)
+
+
+def test_csr_round_trip_matches_csv(tmp_path, skills_csv):
+    out = str(tmp_path / "csr")
+    assert convert_user_skills_to_csr(skills_csv, out) == 4
+
+    vocab, indptr, indices = load_user_skills_csr(out)
+    assert vocab == ["python", "sql", "c++", "its"]
+    assert isinstance(indices, np.memmap) and indptr.tolist() == [0, 2, 2, 5, 6]
+    expected = [["python", "sql"], [], ["sql", "c++", "python"], ["its"]]
+    assert load_normalized_user_skills(skills_csv) == expected
+    assert load_normalized_user_skills(out) == expected
+
+
+def test_pooled_user_embeddings_match_per_user(tmp_path, skills_csv, encoder):
+    out = str(tmp_path / "csr")
+    convert_user_skills_to_csr(skills_csv, out)
+    vocab, indptr, indices = load_user_skills_csr(out)
+    vocab_embs = encoder.encode(vocab)
+
+    pooled = pool_user_embeddings(indptr, indices, vocab_embs, block_size=3)
+    for row, skills in zip(pooled, load_normalized_user_skills(out)):
+        assert np.allclose(row, generate_user_embedding(encoder, skills), atol=1e-6)
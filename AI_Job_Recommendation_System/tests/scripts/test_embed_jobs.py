@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.embedding_utils import generate_job_embeddings
+from scripts import embed_jobs
+from scripts.data_cleaning import load_and_prepare_jobs
+from scripts.embed_jobs import embed_jobs_streaming, load_streamed_embeddings
+
+
+@pytest.fixture
+def jobs_csv(tmp_path):
+    n = 10
+    descriptions = [f"Description of job {i}" for i in range(n)]
+    # Rows 4 and 5 fill the third chunk (chunksize 2) and are both dropped by cleaning
+    descriptions[4] = descriptions[5] = None
+    path = tmp_path / "jobs.csv"
+    pd.DataFrame({
+        "Job-Title": [f"Title {i}" for i in range(n)],
+        "Description": descriptions,
+        "Location": ["Cairo"] * n,
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def test_streamed_embeddings_match_batch_embedding(tmp_path, jobs_csv, encoder):
+    out = str(tmp_path / "out")
+    manifest = embed_jobs_streaming(jobs_csv, out, encoder, "fake", chunksize=2, max_pending=2)
+    assert manifest["chunks"] == 5 and manifest["rows"] == 8 and manifest["completed"]
+    assert all(texts for texts in encoder.calls)
+
+    df = load_and_prepare_jobs(jobs_csv)
+    job_ids, embs = load_streamed_embeddings(out)
+    assert job_ids.tolist() == df["job_id"].tolist()
+    assert np.allclose(embs, generate_job_embeddings(encoder, df["text"].tolist()), atol=1e-6)
+
+
+def test_interrupted_run_resumes_after_last_chunk(tmp_path, jobs_csv, encoder, monkeypatch):
+    out = str(tmp_path / "out")
+    write_manifest = embed_jobs._write_manifest
+    writes = []
+
+    def crash_after_four_chunks(out_dir, manifest):
+        write_manifest(out_dir, manifest)
+        writes.append(manifest["chunks"])
+        if manifest["chunks"] == 4:
+            raise KeyboardInterrupt
+
+    monkeypatch.setattr(embed_jobs, "_write_manifest", crash_after_four_chunks)
+    with pytest.raises(KeyboardInterrupt):
+        embed_jobs_streaming(jobs_csv, out, encoder, "fake", chunksize=2, max_pending=1)
+    monkeypatch.undo()
+    # The empty third chunk was counted, so the resume starts at the fifth
+    assert writes == [1, 2, 3, 4]
+
+    encoder.calls.clear()
+    manifest = embed_jobs_streaming(jobs_csv, out, encoder, "fake", chunksize=2)
+    assert encoder.calls == [["Title 8 Description of job 8", "Title 9 Description of job 9"]]
+    assert manifest["rows"] == 8
+    job_ids, _ = load_streamed_embeddings(out)
+    assert job_ids.tolist() == [0, 1, 2, 3, 6, 7, 8, 9]
+
+    with pytest.raises(ValueError):
+        embed_jobs_streaming(jobs_csv, out, encoder, "fake", chunksize=3)
+
+
+def test_data_files_are_synced_before_manifest(tmp_path, jobs_csv, encoder, monkeypatch):
+    out = str(tmp_path / "out")
+    synced, committed, write_manifest = [], [0], embed_jobs._write_manifest
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        synced.append(os.path.basename(os.readlink(f"/proc/self/fd/{fd}")))
+        fsync(fd)
+
+    def checking_write_manifest(out_dir, manifest):
+        if manifest["rows"] > committed[-1]:
+            assert {"embeddings.f32", "job_ids.i8"} <= set(synced)
+        committed.append(manifest["rows"])
+        synced.clear()
+        write_manifest(out_dir, manifest)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    monkeypatch.setattr(embed_jobs, "_write_manifest", checking_write_manifest)
+    embed_jobs_streaming(jobs_csv, out, encoder, "fake", chunksize=4)
+    assert committed == [0, 4, 6, 8, 8]
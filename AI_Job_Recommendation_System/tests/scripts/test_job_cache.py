@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts import recomendation
+from scripts.recomendation import JobCache, JobRecord
+
+TITLES = ["Python Developer", "Senior Python Engineer", "Data Analyst", "Java Developer",
+          "Frontend Developer", "Python Data Engineer"]
+LOCATIONS = ["Cairo, Egypt", "Berlin, Germany", "Cairo, Egypt", "Alexandria, Egypt",
+             "Berlin, Germany", "Cairo, Egypt"]
+
+
+@pytest.fixture
+def jobs_csv(tmp_path):
+    path = tmp_path / "jobs.csv"
+    pd.DataFrame({
+        "Job-Title": TITLES,
+        "Description": [f"Work on {t.lower()} projects" for t in TITLES],
+        "Location": LOCATIONS,
+    }).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def make_cache(monkeypatch, encoder, jobs_csv):
+    monkeypatch.setattr(recomendation, "SentenceTransformer", lambda name: encoder)
+
+    def make(**kwargs):
+        return JobCache(str(jobs_csv), "fake-model", top_k=kwargs.pop("top_k", 3), **kwargs)
+    return make
+
+
+def brute_force(cache, user_emb, rows=None):
+    embs = np.asarray(cache.embeddings, dtype="float32")
+    rows = np.arange(len(embs)) if rows is None else np.asarray(rows)
+    user_emb = user_emb / np.linalg.norm(user_emb)
+    scores = embs[rows] @ user_emb
+    order = np.argsort(-scores)[:cache.top_k]
+    return rows[order].tolist(), scores[order]
+
+
+def test_query_matches_brute_force(make_cache, encoder):
+    cache = make_cache()
+    user_emb = encoder.vector("python")
+    expected_ids, expected_scores = brute_force(cache, user_emb)
+
+    jobs = cache.query(user_emb)
+    assert [job.job_id for job in jobs] == expected_ids
+    assert np.allclose([job.score for job in jobs], expected_scores, atol=1e-5)
+    assert [job.Job_title for job in jobs] == [TITLES[i] for i in expected_ids]
+    assert cache.get_job(expected_ids[0]).Location == LOCATIONS[expected_ids[0]]
+    assert cache.get_job(99) is None
+
+
+def test_query_columns_gathers_only_requested_fields(make_cache, encoder):
+    cache = make_cache()
+    user_emb = encoder.vector("python")
+    cols = cache.query_columns(user_emb, fields=["Job_title"])
+    assert sorted(cols) == ["Job_title", "job_id", "score"]
+    assert cols["Job_title"].tolist() == [TITLES[i] for i in cols["job_id"]]
+
+    records = cache.query_records(user_emb, fields=["Location"])
+    assert all(isinstance(r, JobRecord) for r in records)
+    assert [r.job_id for r in records] == cols["job_id"].tolist()
+    assert [r.Location for r in records] == [LOCATIONS[i] for i in cols["job_id"]]
+    assert all(r.Job_title is None for r in records)
+
+
+def test_filters_return_exactly_top_k_matches(make_cache, encoder):
+    cache = make_cache(top_k=2)
+    user_emb = encoder.vector("anything")
+    cairo = [i for i, loc in enumerate(LOCATIONS) if loc.startswith("Cairo")]
+
+    jobs = cache.query(user_emb, locations=["cairo"])
+    assert [job.job_id for job in jobs] == brute_force(cache, user_emb, cairo)[0]
+
+    jobs = cache.query(user_emb, title_keywords=["python", "engineer"])
+    assert sorted(job.job_id for job in jobs) == [1, 5]
+    assert cache.query(user_emb, locations=["egypt"], title_keywords=["java"])[0].job_id == 3
+    assert cache.query(user_emb, locations=["Paris"]) == []
+
+
+def test_reload_publishes_a_new_snapshot(make_cache, encoder, jobs_csv):
+    cache = make_cache()
+    old = cache.snapshot
+    df = pd.read_csv(jobs_csv)
+    df.loc[0, "Location"] = "Paris, France"
+    df.to_csv(jobs_csv, index=False)
+
+    new = cache.reload_jobs()
+    assert cache.snapshot is new and new.version == old.version + 1
+    # In-flight readers of the old snapshot keep a consistent view
+    assert old.columns["Location"][0] == "Cairo, Egypt"
+    assert old.attrs.match(locations=["paris"]).tolist() == []
+    assert new.attrs.match(locations=["paris"]).tolist() == [0]
+
+
+def test_store_backed_cache_hides_replaced_rows(make_cache, encoder, jobs_csv, tmp_path):
+    cache = make_cache(store_dir=str(tmp_path / "store"))
+    df = pd.read_csv(jobs_csv)
+    df.loc[2, "Description"] = "Work on python analytics projects"
+    df.to_csv(jobs_csv, index=False)
+    cache.reload_jobs()
+
+    assert len(cache.embeddings) == len(TITLES) + 1
+    user_emb = encoder.vector("python")
+    live_rows = np.flatnonzero(cache.live)
+    ids = cache.snapshot.columns["job_id"]
+    jobs = cache.query(user_emb)
+    expected_rows = brute_force(cache, user_emb, live_rows)[0]
+    assert [job.job_id for job in jobs] == ids[expected_rows].tolist()
+    assert cache.get_job(2).Description == "Work on python analytics projects"
+    assert sorted(job.job_id for job in cache.query(user_emb, locations=["cairo"])) == [0, 2, 5]
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.catalog_store import CatalogStore
+from scripts import precompute_recommendations
+from scripts.precompute_recommendations import load_job_catalog, load_top_k, precompute_top_k
+
+
+def unit_rows(n, dim=8, seed=0):
+    x = np.random.default_rng(seed).normal(size=(n, dim)).astype("float32")
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def exact_top(user_embs, job_ids, job_embs, top_k):
+    scores = user_embs @ job_embs.T
+    return [job_ids[np.argsort(-row, kind="stable")[:top_k]].tolist() for row in scores]
+
+
+def test_records_match_exact_ranking(tmp_path):
+    users, jobs = unit_rows(50, seed=1), unit_rows(30, seed=2)
+    job_ids = np.arange(100, 130)
+    manifest = precompute_top_k(users, job_ids, jobs, str(tmp_path), top_k=5, block_size=7, workers=2)
+    assert manifest["users_done"] == 50
+
+    records = load_top_k(str(tmp_path))
+    assert records["user_id"].tolist() == list(range(50))
+    assert records["job_ids"].tolist() == exact_top(users, job_ids, jobs, 5)
+
+
+def test_short_catalog_is_padded(tmp_path):
+    users, jobs = unit_rows(3, seed=1), unit_rows(2, seed=2)
+    precompute_top_k(users, np.array([7, 8]), jobs, str(tmp_path), top_k=4)
+    records = load_top_k(str(tmp_path))
+    assert (records["job_ids"][:, 2:] == -1).all()
+    assert np.isneginf(records["scores"][:, 2:]).all()
+
+
+def test_catalog_store_is_scanned_in_place_without_dead_rows(tmp_path):
+    store = CatalogStore(str(tmp_path / "store"), "fake", columns=["Job_title"], compact_ratio=100)
+    vectors = dict(zip([f"job {i}" for i in range(6)], unit_rows(6, seed=3)))
+    encode = lambda texts: np.stack([vectors[t] for t in texts])  # noqa: E731
+
+    def frame(ids):
+        return pd.DataFrame({"job_id": ids, "text": [f"job {i}" for i in ids],
+                             "Job_title": [f"title {i}" for i in ids]})
+
+    store.sync(frame([0, 1, 2, 3, 4, 5]), encode)
+    store.sync(frame([0, 2, 4]), encode)
+
+    job_ids, job_embs, exclude = load_job_catalog(str(tmp_path / "store"))
+    assert isinstance(job_embs, np.memmap) and len(job_embs) == 6
+    assert exclude.tolist() == [False, True, False, True, False, True]
+
+    users = unit_rows(4, seed=4)
+    precompute_top_k(users, job_ids, job_embs, str(tmp_path / "out"), top_k=5, exclude=exclude)
+    records = load_top_k(str(tmp_path / "out"))
+    live = np.array([0, 2, 4])
+    expected = exact_top(users, live, np.stack([vectors[f"job {i}"] for i in live]), 3)
+    assert records["job_ids"][:, :3].tolist() == expected
+    assert (records["job_ids"][:, 3:] == -1).all()
+
+
+def test_resume_continues_only_for_the_same_ids(tmp_path, monkeypatch):
+    users, jobs = unit_rows(20, seed=1), unit_rows(10, seed=2)
+    job_ids = np.arange(10)
+    write_manifest = precompute_recommendations._write_manifest
+
+    def crash_after_first_block(out_dir, manifest):
+        write_manifest(out_dir, manifest)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(precompute_recommendations, "_write_manifest", crash_after_first_block)
+    with pytest.raises(KeyboardInterrupt):
+        precompute_top_k(users, job_ids, jobs, str(tmp_path), top_k=3, block_size=5, workers=1)
+    monkeypatch.undo()
+    assert len(load_top_k(str(tmp_path))) == 5
+
+    ranked = []
+    rank_block = precompute_recommendations._rank_block
+    monkeypatch.setattr(precompute_recommendations, "_rank_block",
+                        lambda users, *args: ranked.append(len(users)) or rank_block(users, *args))
+    precompute_top_k(users, job_ids, jobs, str(tmp_path), top_k=3, block_size=5, workers=1)
+    assert ranked == [5, 5, 5]
+
+    # Same shapes, different catalog: the checkpoint is not reused
+    ranked.clear()
+    other_ids = job_ids[::-1].copy()
+    precompute_top_k(users, other_ids, jobs, str(tmp_path), top_k=3, block_size=5, workers=1)
+    assert ranked == [5, 5, 5, 5]
+    assert load_top_k(str(tmp_path))["job_ids"].tolist() == exact_top(users, other_ids, jobs, 3)
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.services.attribute_index import AttributeIndex, location_terms, title_tokens
+
+
+def populated(index):
+    index.add_many(
+        [1, 2, 3, 4],
+        ["Cairo, Egypt", "Berlin,  Germany", "cairo", None],
+        ["Senior Python Developer", "C++ Engineer", "مهندس بيانات", "Python Data Engineer"],
+    )
+    return index
+
+
+def test_terms():
+    assert location_terms("Cairo,  Egypt") == {"cairo, egypt", "cairo", "egypt"}
+    assert location_terms(None) == set()
+    assert title_tokens("Senior C++ / C# Developer") == {"senior", "c++", "c#", "developer"}
+
+
+def test_match_rules():
+    index = populated(AttributeIndex())
+    assert index.match() is None
+    assert index.match(locations=["CAIRO"]).tolist() == [1, 3]
+    assert index.match(locations=["berlin, germany", "egypt"]).tolist() == [1, 2]
+    assert index.match(title_keywords=["python", "engineer"]).tolist() == [4]
+    assert index.match(title_keywords=["c++"]).tolist() == [2]
+    assert index.match(title_keywords=["بيانات"]).tolist() == [3]
+    assert index.match(locations=["cairo"], title_keywords=["python"]).tolist() == [1]
+    # A keyword with no indexable token matches nothing rather than being ignored
+    assert index.match(title_keywords=["python", "--"]).tolist() == []
+    assert index.match(locations=["Paris"]).dtype == np.int64
+
+
+def test_readd_and_remove_update_postings():
+    index = populated(AttributeIndex())
+    index.add(1, location="Berlin", title="Java Developer")
+    assert index.match(locations=["cairo"]).tolist() == [3]
+    assert index.match(title_keywords=["developer"]).tolist() == [1]
+    assert index.remove(1) and not index.remove(1)
+    assert index.match(locations=["berlin"]).tolist() == [2]
+    assert len(index) == 3
+
+
+def test_log_is_replayed_and_torn_tail_dropped(tmp_path):
+    index = populated(AttributeIndex(str(tmp_path)))
+    index.remove(2)
+    index.close()
+    with open(tmp_path / "attrs.jsonl", "ab") as f:
+        f.write(b'{"id": 9, "loca')
+
+    reopened = AttributeIndex(str(tmp_path))
+    assert len(reopened) == 3
+    assert reopened.match(locations=["cairo"]).tolist() == [1, 3]
+    assert not (tmp_path / "attrs.jsonl").read_bytes().endswith(b"loca")
+    reopened.close()
+
+
+def test_log_is_rewritten_when_mostly_stale(tmp_path):
+    index = AttributeIndex(str(tmp_path))
+    for _ in range(5):
+        index.add_many(range(500), ["Cairo"] * 500, ["Developer"] * 500)
+    index.close()
+    with open(tmp_path / "attrs.jsonl") as f:
+        assert sum(1 for _ in f) == 500
+    assert len(AttributeIndex(str(tmp_path)).match(locations=["cairo"])) == 500
+
+
+@pytest.mark.skipif(os.name != "posix", reason="shared mode needs POSIX file locks")
+def test_shared_workers_see_each_others_changes(tmp_path):
+    first = AttributeIndex(str(tmp_path), shared=True, refresh_interval=0)
+    second = AttributeIndex(str(tmp_path), shared=True, refresh_interval=0)
+    try:
+        first.add(1, "Cairo", "Python Developer")
+        second.add(2, "Cairo", "Java Developer")
+        second.remove(1)
+        for index in (first, second):
+            assert index.match(locations=["cairo"]).tolist() == [2]
+
+        # Lagging workers only catch up once refresh_interval has passed
+        lagging = AttributeIndex(str(tmp_path), shared=True, refresh_interval=3600)
+        lagging.refresh()
+        first.add(3, "Cairo", "Data Analyst")
+        assert lagging.match(locations=["cairo"]).tolist() == [2]
+        lagging.refresh()
+        assert lagging.match(locations=["cairo"]).tolist() == [2, 3]
+        lagging.close()
+    finally:
+        first.close()
+        second.close()
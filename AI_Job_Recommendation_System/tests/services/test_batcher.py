@@ -0,0 +1,72 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.batcher import EmbeddingBatcher
+from app.services.embedding_utils import generate_job_embeddings
+
+
+def test_concurrent_submits_share_one_length_sorted_batch(encoder):
+    batcher = EmbeddingBatcher(encoder, max_batch_size=8, max_wait=0.5)
+    texts = ["a much longer job description", "short", "medium length"]
+    futures = [batcher.submit(text) for text in texts]
+    embs = [future.result(timeout=5) for future in futures]
+    batcher.close()
+
+    assert encoder.calls == [sorted(texts, key=len)]
+    expected = generate_job_embeddings(encoder, texts)
+    for emb, exp in zip(embs, expected):
+        assert np.allclose(emb, exp, atol=1e-6)
+
+
+def test_batches_are_capped_at_max_batch_size(encoder):
+    batcher = EmbeddingBatcher(encoder, max_batch_size=3, max_wait=0.5)
+    futures = [batcher.submit(f"job {i}") for i in range(7)]
+    for future in futures:
+        future.result(timeout=5)
+    batcher.close()
+    assert [len(call) for call in encoder.calls] == [3, 3, 1]
+
+
+def test_encode_from_many_threads(encoder):
+    batcher = EmbeddingBatcher(encoder, max_batch_size=64, max_wait=0.01)
+    results = {}
+
+    def worker(i):
+        results[i] = batcher.encode(f"job {i}")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(32)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.close()
+
+    assert sum(len(call) for call in encoder.calls) == 32
+    assert len(encoder.calls) < 32
+    for i, emb in results.items():
+        assert np.allclose(emb, generate_job_embeddings(encoder, [f"job {i}"])[0], atol=1e-6)
+
+
+def test_cancelled_texts_are_not_encoded(encoder):
+    batcher = EmbeddingBatcher(encoder, max_batch_size=8, max_wait=0.5)
+    cancelled = batcher.submit("gave up")
+    kept = batcher.submit("still waiting")
+    assert cancelled.cancel()
+    kept.result(timeout=5)
+    batcher.close()
+    assert encoder.calls == [["still waiting"]]
+
+
+def test_encode_errors_reach_every_caller(encoder):
+    def fail(*args, **kwargs):
+        raise RuntimeError("model crashed")
+
+    encoder.encode = fail
+    batcher = EmbeddingBatcher(encoder, max_batch_size=8, max_wait=0.2)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+    batcher.close()
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.catalog_store import CatalogStore
+
+COLUMNS = ["Job_title", "Location"]
+
+
+def jobs(ids, suffix=""):
+    return pd.DataFrame({
+        "job_id": ids,
+        "text": [f"job {i}{suffix}" for i in ids],
+        "Job_title": [f"title {i}" for i in ids],
+        "Location": ["Berlin"] * len(ids),
+    })
+
+
+class Encoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype="float32")
+
+
+def open_store(path):
+    return CatalogStore(str(path), "test-model", columns=COLUMNS)
+
+
+def live_ids(store):
+    return sorted(store.records()["job_id"][store.live()].tolist())
+
+
+def test_sync_keeps_appends_and_removes(tmp_path):
+    store, encode = open_store(tmp_path), Encoder()
+    assert store.sync(jobs([1, 2, 3]), encode) == {"kept": 0, "appended": 3, "encoded": 3, "removed": 0}
+    assert store.sync(jobs([1, 2, 3]), encode) == {"kept": 3, "appended": 0, "encoded": 0, "removed": 0}
+
+    changed = jobs([1, 2, 4])
+    changed.loc[0, "Location"] = "Paris"  # metadata change: new row, embedding reused
+    assert store.sync(changed, encode) == {"kept": 1, "appended": 2, "encoded": 1, "removed": 1}
+    assert encode.calls[-1] == ["job 4"]
+    assert live_ids(store) == [1, 2, 4]
+
+    frame = store.frame()[store.live()]
+    assert frame.set_index("job_id").loc[1, "Location"] == "Paris"
+    reopened = open_store(tmp_path)
+    assert len(reopened) == len(store)
+    assert np.array_equal(reopened.live(), store.live())
+    assert np.array_equal(np.asarray(reopened.embeddings()), np.asarray(store.embeddings()))
+
+
+def test_crash_before_manifest_commit_keeps_previous_state(tmp_path, monkeypatch):
+    store, encode = open_store(tmp_path), Encoder()
+    store.sync(jobs([1, 2, 3]), encode)
+
+    def crash(self, manifest):
+        raise OSError("crash before commit")
+
+    monkeypatch.setattr(CatalogStore, "_commit", crash)
+    with pytest.raises(OSError):
+        store.sync(jobs([1, 2, 3, 4, 5]), encode)
+    monkeypatch.undo()
+
+    # The uncommitted rows and their mask are invisible; the old mask still fits
+    reopened = open_store(tmp_path)
+    assert len(reopened) == 3
+    assert len(reopened.live()) == 3 and live_ids(reopened) == [1, 2, 3]
+
+    # The torn tail is overwritten by the next sync
+    assert reopened.sync(jobs([1, 2, 3, 4, 5]), encode)["appended"] == 2
+    assert live_ids(open_store(tmp_path)) == [1, 2, 3, 4, 5]
+    assert len(open_store(tmp_path).embeddings()) == 5
+
+
+def test_old_live_masks_are_removed(tmp_path):
+    store, encode = open_store(tmp_path), Encoder()
+    for n in range(2, 7):
+        store.sync(jobs(range(1, n)), encode)
+    masks = [name for name in os.listdir(tmp_path) if name.startswith("live.")]
+    assert len(masks) <= 2
+
+
+def test_compaction_rewrites_live_rows(tmp_path):
+    store, encode = open_store(tmp_path), Encoder()
+    store.sync(jobs([1, 2, 3, 4]), encode)
+    before = {int(j): np.array(store.embeddings()[r])
+              for r, j in enumerate(store.records()["job_id"]) if j in (1, 2)}
+    store.sync(jobs([1, 2]), encode)
+    store.sync(jobs([1, 2], ""), encode)
+    store.sync(jobs([1]), encode)  # 3 dead rows vs 1 live: compacts
+
+    assert len(store) == 1 and live_ids(store) == [1]
+    assert store._manifest["gen"] == 1
+    assert not any(name.endswith(".0.f32") or name.startswith("live.0.") for name in os.listdir(tmp_path))
+    assert np.array_equal(store.embeddings()[0], before[1])
+
+    reopened = open_store(tmp_path)
+    assert live_ids(reopened) == [1]
+    assert reopened.column("Job_title") == ["title 1"]
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    open_store(tmp_path).sync(jobs([1]), Encoder())
+    with pytest.raises(ValueError):
+        CatalogStore(str(tmp_path), "test-model", dim=4, columns=COLUMNS)
+
+
+def test_compacted_files_are_synced_before_commit(tmp_path, monkeypatch):
+    store, encode = open_store(tmp_path), Encoder()
+    store.sync(jobs([1, 2, 3, 4]), encode)
+
+    synced, unsynced_at_commit = set(), []
+    fsync, commit = os.fsync, CatalogStore._commit
+
+    def recording_fsync(fd):
+        synced.add(os.path.basename(os.readlink(f"/proc/self/fd/{fd}")))
+        fsync(fd)
+
+    def checking_commit(self, manifest):
+        gen = manifest["gen"]
+        if gen != self._manifest["gen"]:
+            files = [f"emb.{gen}.f32", f"rows.{gen}.bin"] + \
+                [f"{c}.{gen}.{e}" for c in COLUMNS for e in ("txt", "off")]
+            unsynced_at_commit.extend(f for f in files if f not in synced)
+        commit(self, manifest)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    monkeypatch.setattr(CatalogStore, "_commit", checking_commit)
+    store.sync(jobs([1]), encode)  # 3 dead rows vs 1 live: compacts
+
+    assert store._manifest["gen"] == 1
+    assert unsynced_at_commit == []
+    # Live masks are synced under a temp name, then renamed into place
+    assert any(name.startswith(".live-") for name in synced)
@@ -0,0 +1,54 @@
+import numpy as np
+
+from app.services.embedding_cache import EmbeddingCache
+
+VEC = np.arange(4, dtype="float32")
+
+
+def test_memory_tier_hits_and_lru_eviction():
+    cache = EmbeddingCache("model", max_items=2)
+    assert cache.get("a") is None
+    cache.put("a", VEC)
+    cache.put("b", VEC + 1)
+    assert np.array_equal(cache.get("a"), VEC)  # "a" is now most recent
+    cache.put("c", VEC + 2)
+    assert cache.get("b") is None
+    assert np.array_equal(cache.get("c"), VEC + 2)
+    assert cache.stats() == {"memory_hits": 2, "disk_hits": 0, "misses": 2, "memory_items": 2}
+
+
+def test_disk_tier_survives_restart_and_is_promoted(tmp_path):
+    path = str(tmp_path / "cache" / "embeddings.sqlite3")
+    cache = EmbeddingCache("model", path=path)
+    cache.put_many(["a", "b"], [VEC, VEC + 1])
+    cache.close()
+
+    reopened = EmbeddingCache("model", path=path, max_items=10)
+    results = reopened.get_many(["b", "missing", "a", "b"])
+    assert np.array_equal(results[0], VEC + 1) and np.array_equal(results[3], VEC + 1)
+    assert results[1] is None and np.array_equal(results[2], VEC)
+    assert reopened.stats()["disk_hits"] == 3 and reopened.stats()["misses"] == 1
+    reopened.get("a")
+    assert reopened.stats()["memory_hits"] == 1
+    reopened.close()
+
+
+def test_keys_separate_model_backend_and_namespace(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite3")
+    torch_cache = EmbeddingCache("model", path=path, backend="torch")
+    torch_cache.put("python", VEC)
+    torch_cache.put("python", VEC + 1, namespace="user")
+
+    assert np.array_equal(torch_cache.get("python", namespace="user"), VEC + 1)
+    assert EmbeddingCache("model", path=path, backend="onnx").get("python") is None
+    assert EmbeddingCache("other-model", path=path).get("python") is None
+    assert np.array_equal(EmbeddingCache("model", path=path).get("python"), VEC)
+    assert torch_cache.key("python") != torch_cache.key("python ")
+
+
+def test_get_many_handles_more_keys_than_sqlite_parameters(tmp_path):
+    cache = EmbeddingCache("model", path=str(tmp_path / "embeddings.sqlite3"), max_items=1)
+    texts = [f"job {i}" for i in range(1200)]
+    cache.put_many(texts, [VEC + i for i in range(1200)])
+    results = cache.get_many(texts)
+    assert all(np.array_equal(vec, VEC + i) for i, vec in enumerate(results))
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from app.services.batcher import EmbeddingBatcher
+from app.services.inference_pool import InferencePool, InferencePoolFull, InferenceTimeout
+
+
+def test_run_returns_result_and_frees_slot():
+    pool = InferencePool(workers=1, max_queue=0)
+    try:
+        assert asyncio.run(pool.run(sum, [1, 2, 3])) == 6
+        assert pool.stats()["inflight"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_full_pool_rejects_without_submitting():
+    pool = InferencePool(workers=1, max_queue=1, timeout=5)
+    release = threading.Event()
+    submitted = []
+
+    def submit(value):
+        submitted.append(value)
+        return Future()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+        await asyncio.sleep(0)
+        with pytest.raises(InferencePoolFull):
+            await pool.run(lambda: "rejected")
+        with pytest.raises(InferencePoolFull):
+            await pool.wait(submit, "rejected")
+        release.set()
+        return await running, await queued
+
+    try:
+        assert asyncio.run(scenario()) == (True, "queued")
+        assert submitted == []
+        assert pool.stats() == {"inflight": 0, "capacity": 2, "rejected": 2, "timed_out": 0}
+    finally:
+        pool.shutdown()
+
+
+def test_timeout_cancels_queued_task_and_keeps_running_slot():
+    pool = InferencePool(workers=1, max_queue=1, timeout=0.05)
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(ran.append, "queued"))
+        for task in (running, queued):
+            with pytest.raises(InferenceTimeout):
+                await task
+        # The cancelled queued task freed its slot; the running one still holds its own
+        assert pool.stats()["inflight"] == 1
+        release.set()
+
+    try:
+        asyncio.run(scenario())
+        pool.shutdown()
+        assert ran == []
+        assert pool.stats() == {"inflight": 0, "capacity": 2, "rejected": 0, "timed_out": 2}
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_wait_releases_slot_when_submit_raises():
+    pool = InferencePool(workers=1, max_queue=0)
+
+    def submit():
+        raise RuntimeError("batcher closed")
+
+    try:
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.wait(submit))
+        assert pool.stats()["inflight"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_batcher_encodes_on_pool_workers(encoder):
+    pool = InferencePool(workers=1, max_queue=4)
+    threads = []
+    encode = encoder.encode
+
+    def recording_encode(texts, **kwargs):
+        threads.append(threading.current_thread().name)
+        return encode(texts, **kwargs)
+
+    encoder.encode = recording_encode
+    batcher = EmbeddingBatcher(encoder, executor=pool.executor)
+    try:
+        emb = asyncio.run(pool.wait(batcher.submit, "python developer"))
+        expected = encoder.vector("python developer")
+        assert np.allclose(emb, expected / np.linalg.norm(expected), atol=1e-6)
+        assert threads and all(name.startswith("inference") for name in threads)
+    finally:
+        batcher.close()
+        pool.shutdown()
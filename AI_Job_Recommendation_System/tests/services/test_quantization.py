@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from app.services.quantization import QuantizedEmbeddings, quantized_path
+from app.services.recommendation_engine import recommend_jobs, top_k_similar, top_k_similar_blocked
+
+
+def unit_rows(n, dim=32, seed=0):
+    x = np.random.default_rng(seed).normal(size=(n, dim)).astype("float32")
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def jobs():
+    return unit_rows(500, seed=1)
+
+
+@pytest.fixture
+def users():
+    return unit_rows(6, seed=2)
+
+
+@pytest.mark.parametrize("precision, tol", [("float16", 2e-3), ("int8", 3e-2)])
+def test_scores_approximate_float32(jobs, users, precision, tol):
+    q = QuantizedEmbeddings.quantize(jobs, precision, block_size=64)
+    assert q.precision == precision and len(q) == len(jobs)
+    assert q.nbytes < jobs.nbytes
+    assert np.abs(q.scores(users, block_size=100) - users @ jobs.T).max() < tol
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_rerank_returns_exact_scores_and_float32_ranking(jobs, users, precision):
+    q = QuantizedEmbeddings.quantize(jobs, precision, exact=jobs)
+    idx, scores = top_k_similar(users, q, top_k=10)
+    exact_idx, exact_scores = top_k_similar(users, jobs, top_k=10)
+
+    # Re-ranked scores are the exact float32 dot products of the returned rows
+    assert np.allclose(scores, np.take_along_axis(users @ jobs.T, idx, axis=1), atol=1e-6)
+    recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(idx, exact_idx)])
+    assert recall >= 0.9
+    assert np.allclose(scores[:, 0], exact_scores[:, 0], atol=1e-6)
+
+
+def test_without_exact_matrix_scores_stay_approximate(jobs, users):
+    q = QuantizedEmbeddings.quantize(jobs, "int8")
+    idx, scores = top_k_similar(users[0], q, top_k=5)
+    assert np.allclose(scores, q.scores(users[0])[0, idx])
+
+
+def test_rerank_respects_exclude_and_blocks(jobs, users):
+    q = QuantizedEmbeddings.quantize(jobs, "int8", exact=jobs)
+    exclude = np.zeros(len(jobs), dtype=bool)
+    best, _ = top_k_similar(users, q, top_k=3)
+    exclude[best.ravel()] = True
+
+    idx, scores = top_k_similar_blocked(users, q, top_k=3, user_block=4, job_block=128, exclude=exclude)
+    assert not exclude[idx].any()
+    assert np.isfinite(scores).all()
+
+    recs = recommend_jobs(users[0], np.arange(1000, 1500), q, top_k=3)
+    assert [r["job_id"] - 1000 for r in recs] == best[0].tolist()
+
+
+def test_row_indexing_keeps_exact_rows(jobs, users):
+    q = QuantizedEmbeddings.quantize(jobs, "int8", exact=jobs)[100:200]
+    assert len(q) == 100 and q.exact.shape == (100, jobs.shape[1])
+    idx, scores = top_k_similar(users[0], q, top_k=5)
+    assert np.allclose(scores, jobs[100:200][idx] @ users[0], atol=1e-6)
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8"])
+def test_save_and_load(tmp_path, jobs, precision):
+    path = quantized_path(str(tmp_path / "jobs.npy"), precision)
+    assert path.endswith(f"jobs.{precision}.npy")
+    q = QuantizedEmbeddings.quantize(jobs, precision)
+    q.save(path)
+
+    loaded = QuantizedEmbeddings.load(path, exact=jobs, mmap_mode="r")
+    assert isinstance(loaded.codes, np.memmap)
+    assert np.array_equal(loaded.codes, q.codes)
+    assert loaded.exact is jobs
+    if precision == "int8":
+        assert np.array_equal(loaded.scales, q.scales)
+
+
+def test_int8_codes_need_scales(jobs):
+    with pytest.raises(ValueError):
+        QuantizedEmbeddings(np.zeros((2, 4), dtype="int8"))
+    with pytest.raises(ValueError):
+        QuantizedEmbeddings.quantize(jobs, "int4")
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from app.services.recommendation_engine import (
+    recommend_jobs,
+    recommend_jobs_batch,
+    top_k_similar,
+    top_k_similar_blocked,
+)
+
+
+def unit(rng, n, dim=32):
+    vecs = rng.normal(size=(n, dim)).astype("float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def reference_top_k(user_emb, job_embs, k):
+    """The cosine_similarity + full argsort ranking recommend_jobs used to run."""
+    sims = cosine_similarity(user_emb.reshape(1, -1), job_embs)[0]
+    top = np.argsort(sims)[-k:][::-1]
+    return top, sims[top]
+
+
+@pytest.mark.parametrize("n, k", [(1000, 10), (50, 50), (20, 100), (1, 1)])
+def test_top_k_matches_full_sort(n, k):
+    rng = np.random.default_rng(n)
+    jobs, user = unit(rng, n), unit(rng, 1)[0]
+    idx, scores = top_k_similar(user, jobs, k)
+    ref_idx, ref_scores = reference_top_k(user, jobs, k)
+    assert idx.tolist() == ref_idx.tolist()
+    assert np.allclose(scores, ref_scores, atol=1e-5)
+    assert (np.diff(scores) <= 0).all()
+
+
+def test_top_k_zero_and_empty_catalog():
+    rng = np.random.default_rng(0)
+    user = unit(rng, 1)[0]
+    assert top_k_similar(user, unit(rng, 5), 0)[0].shape == (0,)
+    assert top_k_similar(user, np.zeros((0, 32), "float32"), 5)[0].shape == (0,)
+
+
+def test_batch_rows_match_single_user():
+    rng = np.random.default_rng(1)
+    jobs, users = unit(rng, 300), unit(rng, 7)
+    idx, scores = top_k_similar(users, jobs, 5)
+    assert idx.shape == (7, 5)
+    for u in range(7):
+        single_idx, single_scores = top_k_similar(users[u], jobs, 5)
+        assert idx[u].tolist() == single_idx.tolist()
+        assert np.allclose(scores[u], single_scores)
+
+
+@pytest.mark.parametrize("user_block, job_block", [(3, 17), (256, 65536), (1, 1000)])
+def test_blocked_matches_unblocked(user_block, job_block):
+    rng = np.random.default_rng(2)
+    jobs, users = unit(rng, 1000), unit(rng, 10)
+    idx, scores = top_k_similar_blocked(users, jobs, 8, user_block=user_block, job_block=job_block)
+    ref_idx, ref_scores = top_k_similar(users, jobs, 8)
+    assert idx.tolist() == ref_idx.tolist()
+    assert np.allclose(scores, ref_scores)
+
+
+def test_exclude_mask_leaves_rows_out():
+    rng = np.random.default_rng(3)
+    jobs, users = unit(rng, 200), unit(rng, 4)
+    exclude = rng.random(200) < 0.7
+    keep = np.flatnonzero(~exclude)
+    idx, _ = top_k_similar_blocked(users, jobs, 5, job_block=32, exclude=exclude)
+    ref_idx, _ = top_k_similar(users, jobs[keep], 5)
+    assert idx.tolist() == keep[ref_idx].tolist()
+
+    # Fewer allowed rows than top_k: the excluded ones come last with -inf
+    exclude[:] = True
+    exclude[[3, 9]] = False
+    idx, scores = top_k_similar(users[0], jobs, 4, exclude=exclude)
+    assert sorted(idx[:2].tolist()) == [3, 9]
+    assert np.isneginf(scores[2:]).all()
+
+
+def test_recommend_jobs_maps_ids():
+    rng = np.random.default_rng(4)
+    jobs = unit(rng, 30)
+    job_ids = np.arange(1000, 1030)
+    recs = recommend_jobs(jobs[12], job_ids, jobs, top_k=3)
+    assert recs[0] == {"job_id": 1012, "score": pytest.approx(1.0, abs=1e-5)}
+    assert len(recs) == 3
+
+    batch = recommend_jobs_batch(jobs[[5, 6]], job_ids, jobs, top_k=3)
+    assert [recs[0]["job_id"] for recs in batch] == [1005, 1006]
+    single = recommend_jobs(jobs[5], job_ids, jobs, top_k=3)
+    assert [r["job_id"] for r in batch[0]] == [r["job_id"] for r in single]
+    assert [r["score"] for r in batch[0]] == pytest.approx([r["score"] for r in single], abs=1e-5)
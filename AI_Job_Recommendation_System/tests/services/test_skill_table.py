@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.services.embedding_utils import generate_user_embedding
+from app.services.skill_table import SkillEmbeddingTable, normalize_skill
+
+
+def test_lookup_encodes_only_unseen_normalized_skills(encoder):
+    table = SkillEmbeddingTable(encoder.dim)
+    embs = table.lookup(encoder, ["Python", "  machine   Learning", "python"])
+    assert encoder.calls == [["python", "machine learning"]]
+    assert np.array_equal(embs[0], embs[2])
+    assert np.array_equal(embs[1], encoder.vector("machine learning"))
+
+    table.lookup(encoder, ["PYTHON", "sql"])
+    assert encoder.calls[-1] == ["sql"]
+    assert len(table) == 3 and "Machine Learning" in table
+    assert normalize_skill(" Deep\tLearning ") == "deep learning"
+
+
+def test_user_embedding_with_table_matches_direct_encode(encoder):
+    skills = ["Python", "SQL", "Docker"]
+    direct = generate_user_embedding(encoder, [normalize_skill(s) for s in skills])
+    table = SkillEmbeddingTable(encoder.dim)
+    assert np.allclose(generate_user_embedding(encoder, skills, table), direct, atol=1e-6)
+    assert np.allclose(generate_user_embedding(encoder, skills, table), direct, atol=1e-6)
+    assert not generate_user_embedding(encoder, [], table).any()
+
+
+def test_saved_table_is_memory_mapped_on_reload(tmp_path, encoder):
+    path = str(tmp_path / "skills")
+    table = SkillEmbeddingTable(encoder.dim, path, model_name="m")
+    table.build(encoder, ["python", "sql"])
+    expected = table.lookup(encoder, ["sql", "python"])
+
+    encoder.calls.clear()
+    reloaded = SkillEmbeddingTable(encoder.dim, path, model_name="m")
+    assert isinstance(reloaded._base, np.memmap)
+    assert np.array_equal(reloaded.lookup(encoder, ["sql", "python"]), expected)
+    assert encoder.calls == []
+    assert sorted(os.listdir(path)) == ["lock", "meta.json", "skills.1.json", "skills.1.npy"]
+
+
+def test_autosave_after_enough_new_skills(tmp_path, encoder):
+    path = str(tmp_path / "skills")
+    table = SkillEmbeddingTable(encoder.dim, path, autosave_every=3)
+    table.lookup(encoder, ["a", "b"])
+    assert not os.path.exists(os.path.join(path, "meta.json"))
+    table.lookup(encoder, ["c"])
+    assert len(SkillEmbeddingTable(encoder.dim, path)) == 3
+
+
+def test_concurrent_saves_merge(tmp_path, encoder):
+    path = str(tmp_path / "skills")
+    SkillEmbeddingTable(encoder.dim, path).build(encoder, ["python"])
+    first = SkillEmbeddingTable(encoder.dim, path)
+    second = SkillEmbeddingTable(encoder.dim, path)
+    first.lookup(encoder, ["sql", "go"])
+    second.lookup(encoder, ["rust", "sql"])
+    first.save()
+    second.save()
+
+    merged = SkillEmbeddingTable(encoder.dim, path)
+    assert sorted(merged._skills) == ["go", "python", "rust", "sql"]
+    for skill in merged._skills:
+        assert np.array_equal(merged.lookup(encoder, [skill])[0], encoder.vector(skill))
+    assert sorted(name for name in os.listdir(path) if name.startswith("skills.")) == \
+        ["skills.3.json", "skills.3.npy"]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"dim": 8},
+    {"model_name": "other-model"},
+    {"backend": "onnx"},
+])
+def test_table_built_for_another_model_is_rejected(tmp_path, encoder, kwargs):
+    path = str(tmp_path / "skills")
+    SkillEmbeddingTable(encoder.dim, path, model_name="m").build(encoder, ["python"])
+    args = {"dim": encoder.dim, "model_name": "m", **kwargs}
+    with pytest.raises(ValueError):
+        SkillEmbeddingTable(args.pop("dim"), path, **args)
@@ -0,0 +1,43 @@
+import re
+
+import pandas as pd
+import pytest
+
+from app.services.embedding_utils import clean_text as embedding_clean_text
+from app.services.text_normalization import clean_text, clean_text_series, clean_texts
+
+
+def baseline_clean_text(text):
+    # The four-re.sub implementation whose output cache keys and catalog hashes rely on
+    text = re.sub(r"http\S+|www\.\S+", " ", text)
+    text = re.sub(r"\S+@\S+", " ", text)
+    text = re.sub(r"\+?\d[\d\-\s]{7,}\d", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+TEXTS = [
+    "Apply at https://jobs.example.com or call +20 100 123 4567",
+    "Mail hr@example.com,   visit www.example.com/careers\tnow",
+    "Salary 120000 - 150000, ref 12345678, tel 010-1234-5678",
+    "httpd admin; see http:// and user@ alone",
+    "No\u00a0break\u2003spaces\nand\r\nnewlines\x1cor\x85separators  ",
+    "Ingénieur – Zürich 📈",
+    "",
+    "   ",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_clean_text_matches_baseline(text):
+    assert clean_text(text) == baseline_clean_text(text)
+
+
+def test_batch_and_series_variants_match():
+    expected = [baseline_clean_text(t) for t in TEXTS]
+    assert clean_texts(TEXTS) == expected
+    series = pd.Series(TEXTS, index=range(10, 10 + len(TEXTS)))
+    cleaned = clean_text_series(series)
+    assert cleaned.tolist() == expected
+    assert cleaned.index.tolist() == series.index.tolist()
+    assert embedding_clean_text is clean_text
@@ -0,0 +1,258 @@
+import os
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from app.services.vector_index import VectorIndex
+
+DIM = 8
+
+
+def unit(rng, n):
+    vecs = rng.normal(size=(n, DIM)).astype("float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def exact_top(index, query, k):
+    ids = np.array(sorted(index._pos))
+    vecs = np.stack([index.get(i) for i in ids])
+    return set(ids[np.argsort(-(vecs @ query))[:k]].tolist())
+
+
+def assert_lists_consistent(index):
+    n = len(index)
+    for lst in range(len(index._centroids)):
+        rows = index._lists[lst][: index._list_len[lst]]
+        assert sorted(rows.tolist()) == np.flatnonzero(index._assign[:n] == lst).tolist()
+        assert (index._slot[rows] == np.arange(len(rows))).all()
+
+
+def assert_lists_consistent_with_dead(index):
+    live = set(index._pos.values())
+    in_lists = [int(r) for lst in range(len(index._centroids))
+                for r in index._lists[lst][: index._list_len[lst]]]
+    assert sorted(in_lists) == sorted(live)
+
+
+def test_add_replace_remove_and_search():
+    rng = np.random.default_rng(0)
+    index = VectorIndex(DIM)
+    vecs = unit(rng, 5)
+    index.add([10, 11, 12, 13, 14], vecs)
+    assert len(index) == 5 and 12 in index
+
+    recs = index.search(vecs[2], top_k=2)
+    assert recs[0]["job_id"] == 12 and recs[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+    index.add([12], vecs[:1])  # replace
+    assert np.allclose(index.get(12), vecs[0])
+    assert index.remove([10, 99]) == 1
+    assert len(index) == 4 and index.get(10) is None
+    assert {r["job_id"] for r in index.search(vecs[4], top_k=10)} == {11, 12, 13, 14}
+    assert index.search(vecs[0], top_k=10, ids=[13, 99]) == [
+        {"job_id": 13, "score": pytest.approx(float(vecs[3] @ vecs[0]), abs=1e-5)}
+    ]
+    assert index.search(vecs[0], ids=[99]) == []
+
+
+def test_wal_is_replayed_on_reopen(tmp_path):
+    rng = np.random.default_rng(1)
+    vecs = unit(rng, 4)
+    index = VectorIndex(DIM, str(tmp_path))
+    index.add([1, 2, 3, 4], vecs)
+    index.remove([2])
+    index._wal_file.flush()  # simulate a crash: no snapshot, only the log
+
+    reopened = VectorIndex(DIM, str(tmp_path))
+    assert sorted(reopened._pos) == [1, 3, 4]
+    assert np.allclose(reopened.get(4), vecs[3])
+    assert not os.path.exists(tmp_path / "meta.json")
+
+
+def test_torn_wal_record_is_dropped(tmp_path):
+    rng = np.random.default_rng(2)
+    index = VectorIndex(DIM, str(tmp_path))
+    index.add([1, 2], unit(rng, 2))
+    index._wal_file.flush()
+    wal = tmp_path / "wal.bin"
+    complete = wal.stat().st_size
+    with open(wal, "ab") as f:
+        f.write(b"\x01" * 7)  # half-written record
+
+    reopened = VectorIndex(DIM, str(tmp_path))
+    assert len(reopened) == 2
+    assert wal.stat().st_size == complete
+    reopened.add([3], unit(rng, 1))
+    reopened.close()
+    assert len(VectorIndex(DIM, str(tmp_path))) == 3
+
+
+def test_save_writes_snapshot_and_truncates_wal(tmp_path):
+    rng = np.random.default_rng(3)
+    vecs = unit(rng, 50)
+    index = VectorIndex(DIM, str(tmp_path), compact_every=20)
+    index.add(range(50), vecs)  # crosses compact_every: compacted on add
+    assert (tmp_path / "meta.json").exists()
+    index.add([50], unit(rng, 1))
+    index.close()
+    assert (tmp_path / "wal.bin").stat().st_size == 0
+
+    reopened = VectorIndex(DIM, str(tmp_path))
+    assert len(reopened) == 51
+    assert np.allclose(reopened.get(7), vecs[7])
+    with pytest.raises(ValueError):
+        VectorIndex(DIM + 1, str(tmp_path))
+
+
+def test_ivf_lists_track_mutations_and_probe_matches_assignments(tmp_path):
+    rng = np.random.default_rng(4)
+    index = VectorIndex(DIM, str(tmp_path), train_threshold=200, compact_every=300, nprobe=4)
+    for _ in range(400):
+        if rng.random() < 0.7:
+            ids = rng.integers(0, 600, size=3)
+            index.add(ids, unit(rng, 3))
+        else:
+            index.remove(rng.integers(0, 600, size=2))
+    assert index._centroids is not None
+    assert_lists_consistent(index)
+
+    for query in unit(rng, 20):
+        rows = index._probe(query, 10)
+        order = np.argsort(index._centroids @ query)[::-1]
+        nprobe = index.nprobe
+        while True:
+            expected = np.flatnonzero(np.isin(index._assign[: len(index)], order[:nprobe]))
+            if len(expected) >= 10:
+                break
+            nprobe *= 2
+        assert sorted(rows.tolist()) == expected.tolist()
+
+    index.close()
+    reopened = VectorIndex(DIM, str(tmp_path), train_threshold=200)
+    assert_lists_consistent(reopened)
+
+
+def test_probing_every_list_is_exact():
+    rng = np.random.default_rng(5)
+    index = VectorIndex(DIM, train_threshold=100)
+    index.add(range(300), unit(rng, 300))
+    index.nprobe = len(index._centroids) - 1
+    for query in unit(rng, 10):
+        found = {r["job_id"] for r in index.search(query, top_k=5)}
+        assert found == exact_top(index, query, 5)
+
+
+def test_search_batch_matches_search():
+    rng = np.random.default_rng(6)
+    index = VectorIndex(DIM)
+    index.add(range(40), unit(rng, 40))
+    queries = unit(rng, 3)
+    batch = index.search_batch(queries, top_k=5)
+    for query, recs in zip(queries, batch):
+        assert [r["job_id"] for r in recs] == [r["job_id"] for r in index.search(query, top_k=5)]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="shared mode needs POSIX file locking")
+def test_shared_mode_sees_other_process_changes(tmp_path):
+    rng = np.random.default_rng(7)
+    a = VectorIndex(DIM, str(tmp_path), shared=True, refresh_interval=0, compact_every=10)
+    b = VectorIndex(DIM, str(tmp_path), shared=True, refresh_interval=0, compact_every=10)
+    a.add([1, 2], unit(rng, 2))
+    b.add([3], unit(rng, 1))
+    assert b.remove([1]) == 1
+    a.refresh()
+    assert sorted(a._pos) == sorted(b._pos) == [2, 3]
+
+    b.add(range(100, 115), unit(rng, 15))  # compacts into a new snapshot generation
+    a.refresh()
+    assert len(a) == len(b) == 17
+    a.close()
+    b.close()
+
+
+def test_full_scan_does_not_copy_the_matrix():
+    rng = np.random.default_rng(8)
+    index = VectorIndex(64)
+    vecs = rng.normal(size=(20_000, 64)).astype("float32")
+    index.add(range(20_000), vecs / np.linalg.norm(vecs, axis=1, keepdims=True))
+    query = index.get(5)
+    tracemalloc.start()
+    try:
+        assert index.search(query, top_k=3)[0]["job_id"] == 5
+        assert [recs[0]["job_id"] for recs in index.search_batch(np.stack([query, index.get(9)]), top_k=3)] == [5, 9]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < index._vecs[:len(index)].nbytes / 4
+
+
+def test_rows_are_not_moved_or_overwritten_during_a_scan():
+    rng = np.random.default_rng(9)
+    index = VectorIndex(DIM)
+    vecs = unit(rng, 6)
+    index.add(range(6), vecs)
+    with index.lock:
+        scan = index._pin(None)
+    ids, pinned, n, _ = scan
+    before = pinned[:n].copy(), ids[:n].copy()
+
+    index.remove([0, 3])
+    index.add([4], vecs[:1])  # replace
+    index.add([6], vecs[1:2])
+    assert np.array_equal(pinned[:n], before[0]) and np.array_equal(ids[:n], before[1])
+    assert len(index) == 5 and sorted(index._pos) == [1, 2, 4, 5, 6]
+    assert {r["job_id"] for r in index.search(vecs[0], top_k=10)} == {1, 2, 4, 5, 6}
+    assert np.allclose(index.get(4), vecs[0])
+
+    # The pinned scan sees the index as of its start; dead rows are reclaimed after
+    assert {r["job_id"] for r in index._scan(scan, vecs[:1], 10)[0]} == set(range(6))
+    assert index._scans == 0 and index._n_dead == 0 and index._n == 5
+    assert {r["job_id"] for r in index.search_batch(vecs[:1], top_k=10)[0]} == {1, 2, 4, 5, 6}
+
+
+def test_dead_rows_are_repacked_when_scans_never_pause(tmp_path):
+    rng = np.random.default_rng(10)
+    index = VectorIndex(DIM, str(tmp_path), train_threshold=500)
+    index.add(range(3000), unit(rng, 3000))
+    with index.lock:
+        scan = index._pin(None)
+    index.remove(range(0, 3000, 2))
+    assert index._n_dead <= max(1024, index._n // 64)
+    assert len(index) == 1500
+    assert_lists_consistent_with_dead(index)
+    index._scan(scan, unit(rng, 1), 5)
+    assert index._n == 1500
+    assert_lists_consistent(index)
+    index.close()
+    assert sorted(VectorIndex(DIM, str(tmp_path))._pos) == list(range(1, 3000, 2))
+
+
+def test_concurrent_searches_and_updates():
+    rng = np.random.default_rng(11)
+    index = VectorIndex(DIM, train_threshold=300)
+    index.add(range(400), unit(rng, 400))
+    errors = []
+
+    def search():
+        local = np.random.default_rng()
+        try:
+            for _ in range(200):
+                query = unit(local, 1)
+                recs = index.search(query[0], top_k=5) + index.search_batch(query, top_k=5)[0]
+                assert all(0 <= r["job_id"] < 1000 for r in recs)
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=search) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(300):
+        index.add([int(rng.integers(0, 1000))], unit(rng, 1))
+        index.remove([int(rng.integers(0, 1000))])
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert index._scans == 0 and index._n_dead == 0 and index._n == len(index)
+    assert_lists_consistent(index)
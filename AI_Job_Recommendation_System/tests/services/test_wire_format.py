@@ -0,0 +1,77 @@
+import base64
+import struct
+
+import numpy as np
+import pytest
+
+from app.services.wire_format import (
+    OCTET_STREAM,
+    decode_embedding,
+    decode_matrix,
+    encode_batch,
+    encode_embedding,
+    wants_binary,
+)
+
+VEC = np.array([0.5, -1.25, 3.0, 1e-3], dtype="float32")
+
+
+def test_json_round_trip():
+    encoded = encode_embedding(VEC, "json")
+    assert isinstance(encoded, list)
+    assert np.array_equal(decode_embedding(encoded, "json"), VEC)
+
+
+def test_b64f32_round_trip_is_exact():
+    encoded = encode_embedding(VEC, "b64f32")
+    assert base64.b64decode(encoded) == VEC.astype("<f4").tobytes()
+    decoded = decode_embedding(encoded, "b64f32")
+    assert decoded.dtype == np.float32 and np.array_equal(decoded, VEC)
+
+
+def test_b64f16_round_trip_is_close():
+    decoded = decode_embedding(encode_embedding(VEC, "b64f16"), "b64f16")
+    assert decoded.dtype == np.float32
+    assert np.allclose(decoded, VEC, rtol=1e-3, atol=1e-3)
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        encode_embedding(VEC, "b64f64")
+
+
+@pytest.mark.parametrize("value", [
+    "!!not base64",
+    base64.b64encode(b"abcde").decode(),  # 5 bytes: not whole float32 values
+])
+def test_malformed_base64_raises_value_error(value):
+    with pytest.raises(ValueError):
+        decode_embedding(value, "b64f32")
+
+
+def test_decode_matrix():
+    matrix = np.arange(12, dtype="float32").reshape(3, 4)
+    encoded = base64.b64encode(matrix.tobytes()).decode()
+    assert np.array_equal(decode_matrix(encoded, 3), matrix)
+    assert np.array_equal(decode_matrix(matrix.tolist(), 3, "json"), matrix)
+    with pytest.raises(ValueError):
+        decode_matrix(encoded, 5)
+    with pytest.raises(ValueError):
+        decode_matrix(matrix.tolist(), 2, "json")
+
+
+def test_wants_binary():
+    assert wants_binary(None) is None
+    assert wants_binary("application/json") is None
+    assert wants_binary("application/octet-stream, */*") == OCTET_STREAM
+
+
+def test_octet_stream_batch_layout():
+    ids = [7, 42]
+    embs = np.arange(8, dtype="float32").reshape(2, 4)
+    body = encode_batch(ids, embs, OCTET_STREAM)
+    n, dim = struct.unpack_from("<II", body)
+    assert (n, dim) == (2, 4)
+    assert np.frombuffer(body, "<i8", n, 8).tolist() == ids
+    assert np.array_equal(np.frombuffer(body, "<f4", n * dim, 8 + 8 * n).reshape(n, dim), embs)
+    assert encode_batch([], np.zeros((0, 4), "float32"), OCTET_STREAM) == struct.pack("<II", 0, 0)
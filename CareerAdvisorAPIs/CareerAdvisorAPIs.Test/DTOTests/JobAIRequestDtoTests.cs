@@ -0,0 +1,42 @@
+using CareerAdvisorAPIs.DTOs.JobListing;
+using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
+using NUnit.Framework;
+
+namespace CareerAdvisorAPIs.Tests.DTOs
+{
+    [TestFixture]
+    public class JobAIRequestDtoTests
+    {
+        [TestCase("Cairo", "Egypt", "Cairo, Egypt")]
+        [TestCase(" Cairo ", null, "Cairo")]
+        [TestCase(null, "Egypt", "Egypt")]
+        [TestCase("", " ", null)]
+        [TestCase(null, null, null)]
+        public void FormatLocation_JoinsCityAndCountry(string? city, string? country, string? expected)
+        {
+            Assert.That(JobAIRequestDto.FormatLocation(city, country), Is.EqualTo(expected));
+        }
+
+        [Test]
+        public void Serialize_SendsLocationForTheAIService()
+        {
+            // Arrange
+            var request = new JobAIRequestDto
+            {
+                job_id = 1,
+                title = "Python Developer",
+                location = JobAIRequestDto.FormatLocation("Cairo", "Egypt"),
+                description = "title: Python Developer"
+            };
+
+            // Act
+            var json = JObject.Parse(JsonConvert.SerializeObject(request));
+
+            // Assert: field names match the /ingest/job body of the AI service
+            Assert.That(json["location"]?.ToString(), Is.EqualTo("Cairo, Egypt"));
+            Assert.That(json["title"]?.ToString(), Is.EqualTo("Python Developer"));
+            Assert.That(json["job_id"]?.ToObject<int>(), Is.EqualTo(1));
+        }
+    }
+}
@@ -0,0 +1,77 @@
+﻿using Newtonsoft.Json;
+
+namespace CareerAdvisorAPIs.DTOs.JobListing
+{
+    /// <summary>
+    /// Reads/writes embeddings as base64 of little-endian float32 bytes (the AI service's
+    /// "b64f32" format) instead of JSON number arrays. Plain arrays are still accepted on read.
+    /// </summary>
+    public class Base64EmbeddingConverter : JsonConverter
+    {
+        public override bool CanConvert(Type objectType) => typeof(IEnumerable<double>).IsAssignableFrom(objectType);
+
+        public override object? ReadJson(JsonReader reader, Type objectType, object? existingValue, JsonSerializer serializer)
+        {
+            if (reader.TokenType == JsonToken.Null)
+                return null;
+            if (reader.TokenType == JsonToken.String)
+                return Decode((string)reader.Value!);
+            return serializer.Deserialize<double[]>(reader);
+        }
+
+        public override void WriteJson(JsonWriter writer, object? value, JsonSerializer serializer)
+        {
+            if (value == null)
+                writer.WriteNull();
+            else
+                writer.WriteValue(Encode((IEnumerable<double>)value));
+        }
+
+        public static string Encode(IEnumerable<double> values)
+        {
+            var floats = values.Select(v => (float)v).ToArray();
+            var bytes = new byte[floats.Length * sizeof(float)];
+            Buffer.BlockCopy(floats, 0, bytes, 0, bytes.Length);
+            if (!BitConverter.IsLittleEndian)
+                SwapFloatBytes(bytes);
+            return Convert.ToBase64String(bytes);
+        }
+
+        public static double[] Decode(string base64)
+        {
+            var bytes = Convert.FromBase64String(base64);
+            if (!BitConverter.IsLittleEndian)
+                SwapFloatBytes(bytes);
+            var floats = new float[bytes.Length / sizeof(float)];
+            Buffer.BlockCopy(bytes, 0, floats, 0, floats.Length * sizeof(float));
+            return floats.Select(f => (double)f).ToArray();
+        }
+
+        private static void SwapFloatBytes(byte[] bytes)
+        {
+            for (int i = 0; i + 3 < bytes.Length; i += 4)
+                Array.Reverse(bytes, i, 4);
+        }
+    }
+
+    /// <summary>
+    /// Writes a list of embeddings as one base64 string of the row-major float32 matrix.
+    /// </summary>
+    public class Base64EmbeddingMatrixConverter : JsonConverter
+    {
+        public override bool CanRead => false;
+
+        public override bool CanConvert(Type objectType) => typeof(IEnumerable<IEnumerable<double>>).IsAssignableFrom(objectType);
+
+        public override object? ReadJson(JsonReader reader, Type objectType, object? existingValue, JsonSerializer serializer)
+            => throw new NotSupportedException();
+
+        public override void WriteJson(JsonWriter writer, object? value, JsonSerializer serializer)
+        {
+            if (value == null)
+                writer.WriteNull();
+            else
+                writer.WriteValue(Base64EmbeddingConverter.Encode(((IEnumerable<IEnumerable<double>>)value).SelectMany(row => row)));
+        }
+    }
+}
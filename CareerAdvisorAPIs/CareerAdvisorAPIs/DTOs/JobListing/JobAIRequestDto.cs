@@ -4,5 +4,15 @@
     {
         public int job_id { get; set; }
         public string description { get; set; }
+        public string? title { get; set; }
+        public string? location { get; set; }
+
+        // "City, Country" as indexed by the AI service's location filter; null when neither is set
+        public static string? FormatLocation(string? city, string? country)
+        {
+            var parts = new[] { city, country }.Where(p => !string.IsNullOrWhiteSpace(p)).Select(p => p!.Trim());
+            var location = string.Join(", ", parts);
+            return location.Length > 0 ? location : null;
+        }
     }
 }
@@ -1,9 +1,12 @@
-﻿namespace CareerAdvisorAPIs.DTOs.JobListing
+﻿using Newtonsoft.Json;
+
+namespace CareerAdvisorAPIs.DTOs.JobListing
 {
     public class JobAIResponseDto
     {
         public string status { get; set; }
         public string job_id { get; set; }
+        [JsonConverter(typeof(Base64EmbeddingConverter))]
         public double[] embedding { get; set; }
     }
 }
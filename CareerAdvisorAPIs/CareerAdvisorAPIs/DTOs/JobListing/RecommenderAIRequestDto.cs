@@ -1,11 +1,16 @@
-﻿namespace CareerAdvisorAPIs.DTOs.JobListing
+﻿using Newtonsoft.Json;
+
+namespace CareerAdvisorAPIs.DTOs.JobListing
 {
     public class RecommenderAIRequestDto
     {
         public int user_id { get; set; }
+        [JsonConverter(typeof(Base64EmbeddingConverter))]
         public IEnumerable<double> user_embedding { get; set; }
         public IEnumerable<int> job_ids { get; set; }
+        [JsonConverter(typeof(Base64EmbeddingMatrixConverter))]
         public IEnumerable<IEnumerable<double>> job_embeddings { get; set; }
+        public string embedding_format { get; set; } = "b64f32";
         public int top_k { get; set; }
     }
 }
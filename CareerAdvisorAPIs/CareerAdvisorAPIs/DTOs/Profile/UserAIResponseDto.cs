@@ -1,9 +1,12 @@
-﻿namespace CareerAdvisorAPIs.DTOs.JobListing
+﻿using Newtonsoft.Json;
+
+namespace CareerAdvisorAPIs.DTOs.JobListing
 {
     public class UserAIResponseDto
     {
         public string status { get; set; }
         public string user_id { get; set; }
+        [JsonConverter(typeof(Base64EmbeddingConverter))]
         public double[] embedding { get; set; }
     }
 }
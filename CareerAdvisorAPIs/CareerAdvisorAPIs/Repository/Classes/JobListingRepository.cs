@@ -28,6 +28,8 @@ namespace CareerAdvisorAPIs.Repository.Classes
             var aiRequest = new JobAIRequestDto
             {
                 job_id = job.JobID,
+                title = job.Title,
+                location = JobAIRequestDto.FormatLocation(job.City, job.Country),
                 description = "title: " + job.Title +
                 "\r\nkeywords: " + (job.Keywords ?? "Empty") +
                 "\r\ncategories: " + string.Join(", ", job.JobListingCategories.Select(jc => jc.JobCategory.Name)) +
@@ -71,6 +73,8 @@ namespace CareerAdvisorAPIs.Repository.Classes
             var aiRequest = new JobAIRequestDto
             {
                 job_id = job.JobID,
+                title = job.Title,
+                location = JobAIRequestDto.FormatLocation(job.City, job.Country),
                 description = "title: " + job.Title +
                 "\r\nkeywords: " + (job.Keywords ?? "Empty") +
                 "\r\ncategories: " + string.Join(", ", job.JobListingCategories.Select(jc => jc.JobCategory.Name)) +
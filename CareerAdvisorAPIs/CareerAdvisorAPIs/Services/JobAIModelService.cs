@@ -22,7 +22,7 @@ namespace CareerAdvisorAPIs.Services
         {
             try
             {
-                var api = url + "/ingest/job";
+                var api = url + "/ingest/job?embedding_format=b64f32";
                 var jsonContent = JsonConvert.SerializeObject(job);
                 var content = new StringContent(jsonContent, Encoding.UTF8, "application/json");
 
@@ -51,7 +51,7 @@ namespace CareerAdvisorAPIs.Services
         {
             try
             {
-                var api = url + "/ingest/user";
+                var api = url + "/ingest/user?embedding_format=b64f32";
                 var jsonContent = JsonConvert.SerializeObject(user);
                 var content = new StringContent(jsonContent, Encoding.UTF8, "application/json");
 
@@ -5,6 +5,9 @@ This module defines the JobSkillExtractor class used to extract technical and so
 from unstructured job description text. It matches against predefined categories and allows
 custom skill sets to support domain-specific needs.
 
+All skills are matched in a single pass with a precompiled `SkillMatcher`; large
+taxonomies such as `ai/data/skills.json` can be loaded with `taxonomy_path`.
+
 Classes:
     JobSkillExtractor: Extracts skills from job descriptions, optionally grouped by category.
 
@@ -15,9 +18,10 @@ Typical Use Cases:
 """
 
 
-import re
 from typing import List, Dict, Optional, Union, Set
 
+from ai.utils.skill_matcher import SkillMatcher, load_skill_matcher
+
 
 class JobSkillExtractor:
     """
@@ -31,12 +35,13 @@ class JobSkillExtractor:
         skill_set (Dict[str, List[str]]): Dictionary of categorized skill keywords.
     """
 
-    def __init__(self, skill_set: Optional[Dict[str, List[str]]] = None):
+    def __init__(self, skill_set: Optional[Dict[str, List[str]]] = None, taxonomy_path: Optional[str] = None):
         """
         Initialize the extractor with a default or custom skill set.
 
         Args:
             skill_set (Optional[Dict[str, List[str]]]): Custom mapping of skill categories to skill terms.
+            taxonomy_path (Optional[str]): Skill taxonomy JSON to use instead of `skill_set`.
         """
         self.skill_set = skill_set or {
             "Programming Languages": [
@@ -63,6 +68,12 @@ class JobSkillExtractor:
                 "Critical Thinking", "Leadership", "Creativity"
             ]
         }
+        # A taxonomy file replaces the inline skill set
+        if taxonomy_path:
+            self._matcher = load_skill_matcher(taxonomy_path)
+            self.skill_set = self._matcher.skill_set
+        else:
+            self._matcher = SkillMatcher(self.skill_set)
 
     def extract(self, text: str, return_grouped: bool = False) -> Union[List[str], Dict[str, List[str]]]:
         """
@@ -80,14 +91,11 @@ class JobSkillExtractor:
         text_lower = text.lower()
         skills_found: Union[Set[str], Dict[str, Set[str]]] = {} if return_grouped else set()
 
-        for category, skills in self.skill_set.items():
-            for skill in skills:
-                pattern = rf"\b{re.escape(skill.lower())}\b"
-                if re.search(pattern, text_lower):
-                    if return_grouped:
-                        skills_found.setdefault(category, set()).add(skill)
-                    else:
-                        skills_found.add(skill)
+        for category, skill, _ in self._matcher.matches(text_lower):
+            if return_grouped:
+                skills_found.setdefault(category, set()).add(skill)
+            else:
+                skills_found.add(skill)
 
         if return_grouped:
             return {cat: sorted(list(skills)) for cat, skills in skills_found.items() if skills}
@@ -0,0 +1,245 @@
+"""
+Batch Resume Parsing Module
+
+This module parses large numbers of resumes (e.g. bulk imports of legacy CVs) on a pool
+of worker processes, so that every core is used:
+
+- `parse_many(texts)`: parse resume texts.
+- `parse_files(paths)`: read PDF, DOCX or plain-text resumes and parse them; reading
+  and text extraction also happen in the workers.
+
+Each worker builds its `ResumeExtractor` (compiled skill matcher, section segmenter,
+...) once, when the process starts, and then parses chunks of documents. Results stream
+back as chunks finish, either in input order or as completed, while only a bounded
+number of chunks is in flight, so inputs may be lazy iterables of any size. A
+`BatchStats` object tracks progress and throughput and is passed to an optional
+`progress` callback after every chunk. A document that cannot be read or parsed does
+not stop the batch: its result carries the error message instead.
+
+Functions:
+    parse_many: Parse resume texts in parallel.
+    parse_files: Extract and parse resume files in parallel.
+
+Classes:
+    BatchStats: Progress and throughput of a batch.
+
+Dependencies:
+    - concurrent.futures: for the process pool
+    - ai.extractors.resume.text_extractor: for PDF/DOCX files (imported on first use)
+"""
+
+
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ai.extractors.resume.resume_extractor import ResumeExtractor
+from ai.extractors.resume.section_segmenter import default_segmenter
+
+logger = logging.getLogger(__name__)
+
+# Extractor of the current worker process, built once by `_init_worker`
+_extractor: Optional[ResumeExtractor] = None
+
+
+class BatchStats:
+    """
+    Progress and throughput of a batch parse.
+
+    Attributes:
+        total (Optional[int]): Number of documents, if known.
+        done (int): Documents processed so far (including failures).
+        failed (int): Documents that could not be read or parsed.
+    """
+
+    def __init__(self, total: Optional[int] = None):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._start = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the batch started."""
+        return time.perf_counter() - self._start
+
+    @property
+    def docs_per_sec(self) -> float:
+        """Average throughput so far."""
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        total = f"/{self.total}" if self.total is not None else ""
+        failed = f" ({self.failed} failed)" if self.failed else ""
+        return f"{self.done}{total} resumes{failed} in {self.elapsed:.1f}s, {self.docs_per_sec:.1f} docs/s"
+
+
+def _init_worker() -> None:
+    global _extractor
+    _extractor = ResumeExtractor()
+    default_segmenter()
+
+
+def _read_resume(path: str) -> str:
+    if os.path.splitext(path)[1].lower() == ".txt":
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    # PyMuPDF / python-docx are only needed for PDF and DOCX files
+    from ai.extractors.resume.text_extractor import ResumeTextExtractor
+    return ResumeTextExtractor(path).extract_text()
+
+
+def _parse_texts(chunk: List[Tuple[int, str]], classify_links: bool) -> List[Tuple[int, Dict[str, Any]]]:
+    results = []
+    for i, text in chunk:
+        result = {"parsed": None, "error": None}
+        try:
+            result["parsed"] = _extractor.parse(text, classify_links=classify_links)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        results.append((i, result))
+    return results
+
+
+def _parse_files(
+    chunk: List[Tuple[int, str]],
+    classify_links: bool,
+    return_text: bool
+) -> List[Tuple[int, Dict[str, Any]]]:
+    results = []
+    for i, path in chunk:
+        result = {"path": path, "parsed": None, "text": None, "error": None}
+        try:
+            text = _read_resume(path)
+            result["parsed"] = _extractor.parse(text, classify_links=classify_links)
+            if return_text:
+                result["text"] = text
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        results.append((i, result))
+    return results
+
+
+def _run(
+    fn: Callable,
+    items: Iterable,
+    args: tuple,
+    workers: Optional[int],
+    chunksize: int,
+    ordered: bool,
+    stats: BatchStats,
+    progress: Optional[Callable[[BatchStats], None]]
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Apply `fn(chunk, *args)` to chunks of `(index, item)` pairs and yield its results,
+    updating `stats` and calling `progress` after every chunk.
+    """
+    indexed = enumerate(items)
+    chunks = iter(lambda: list(islice(indexed, chunksize)), [])
+    workers = workers or os.cpu_count() or 1
+
+    def report(results):
+        stats.done += len(results)
+        stats.failed += sum(1 for _, r in results if r["error"])
+        if progress:
+            progress(stats)
+
+    if workers <= 1:
+        # In-process (debugging, or tiny batches not worth a pool)
+        if _extractor is None:
+            _init_worker()
+        for chunk in chunks:
+            results = fn(chunk, *args)
+            report(results)
+            yield from results
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    try:
+        # Bounded window of in-flight chunks keeps memory flat for lazy inputs
+        window = workers * 4
+        pending = deque(pool.submit(fn, chunk, *args) for chunk in islice(chunks, window))
+        while pending:
+            if ordered:
+                results = pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+                pending.remove(future)
+                results = future.result()
+            for chunk in islice(chunks, 1):
+                pending.append(pool.submit(fn, chunk, *args))
+            report(results)
+            yield from results
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    logger.info("Parsed %s", stats)
+
+
+def parse_many(
+    texts: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 16,
+    ordered: bool = True,
+    classify_links: bool = True,
+    progress: Optional[Callable[[BatchStats], None]] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Parse resume texts on a process pool, streaming the results.
+
+    A text that cannot be parsed (e.g. None) does not stop the batch: its result carries
+    the error message instead.
+
+    Args:
+        texts (Iterable[str]): Resume texts (may be a lazy iterable).
+        workers (Optional[int]): Worker processes (default: CPU count); 1 parses in-process.
+        chunksize (int): Documents sent to a worker at a time.
+        ordered (bool): Yield results in input order; otherwise as chunks complete.
+        classify_links (bool): Passed to `ResumeExtractor.parse`.
+        progress (Optional[Callable[[BatchStats], None]]): Called after every chunk.
+
+    Returns:
+        Iterator[Tuple[int, Dict[str, Any]]]: `(input index, result)` pairs, where result
+            has the keys "parsed" (the parsed resume, or None on failure) and "error".
+    """
+    total = len(texts) if hasattr(texts, "__len__") else None
+    return _run(_parse_texts, texts, (classify_links,), workers, chunksize, ordered,
+                BatchStats(total), progress)
+
+
+def parse_files(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+    classify_links: bool = True,
+    return_text: bool = False,
+    progress: Optional[Callable[[BatchStats], None]] = None
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Extract text from resume files (PDF, DOCX or TXT) and parse them on a process pool.
+
+    A file that cannot be read or parsed does not stop the batch: its result carries
+    the error message instead.
+
+    Args:
+        paths (Iterable[str]): Resume file paths (may be a lazy iterable).
+        workers (Optional[int]): Worker processes (default: CPU count); 1 parses in-process.
+        chunksize (int): Files sent to a worker at a time.
+        ordered (bool): Yield results in input order; otherwise as chunks complete.
+        classify_links (bool): Passed to `ResumeExtractor.parse`.
+        return_text (bool): Include the extracted text in each result.
+        progress (Optional[Callable[[BatchStats], None]]): Called after every chunk.
+
+    Returns:
+        Iterator[Tuple[int, Dict[str, Any]]]: `(input index, result)` pairs, where result
+            has the keys "path", "parsed", "text" (None unless `return_text`) and "error".
+    """
+    total = len(paths) if hasattr(paths, "__len__") else None
+    return _run(_parse_files, paths, (classify_links, return_text), workers, chunksize, ordered,
+                BatchStats(total), progress)
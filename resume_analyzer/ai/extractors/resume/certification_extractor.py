@@ -35,6 +35,8 @@ Typical Use Cases:
 import re
 from typing import List, Optional, Union
 
+from ai.extractors.resume.document import ResumeDocument, as_document
+
 
 class CertificationExtractor:
     """
@@ -75,30 +77,31 @@ class CertificationExtractor:
         )
         self.acronym_pattern = re.compile(r'\b(AZ-\d{3}|CKA|CKAD|CSM|PMP|CCNA|OCI|CKS|ITIL)\b')
 
-    def extract(self, text: str, return_lines: bool = False) -> List[str]:
+    def extract(self, text: Union[str, ResumeDocument], return_lines: bool = False) -> List[str]:
         """
         Extract certifications from resume text.
 
         Args:
-            text (str): Raw resume content.
+            text (Union[str, ResumeDocument]): Raw resume content, or a shared ResumeDocument.
             return_lines (bool): If True, return the full matching lines. Otherwise, return only matched certification names.
 
         Returns:
             List[str]: Sorted and deduplicated list of certification names or source lines.
         """
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, (str, ResumeDocument)):
             return []
 
-        lines = [line.strip("•-–—•* ") for line in text.split('\n') if line.strip()]
+        lines = [line.strip("•-–—•* ") for line in as_document(text).lines]
         results = set()
 
         for line in lines:
             normalized = re.sub(r'[^\w\s\-#@.:/()]', '', line).strip()
+            normalized_lower = normalized.lower()
             matched = False
 
             # Match known certifications
             for cert in self.known_certs:
-                if cert.lower() in normalized.lower():
+                if cert.lower() in normalized_lower:
                     results.add(line if return_lines else cert)
                     matched = True
                     break
@@ -0,0 +1,161 @@
+"""
+ResumeDocument Module
+
+This module provides the ResumeDocument class, a resume text tokenized once and shared
+by every extractor of a `ResumeExtractor.parse` call. Instead of each extractor
+lower-casing the text, splitting and stripping its lines and scanning them for its
+section header, the document computes each of these views once, on first use:
+
+- `lower`: the lower-cased text
+- `lines` / `lower_lines`: the stripped, non-empty lines (original and lower-cased)
+- `line_offsets`: the offset of each line's first character in the text
+- `segments`: the section of every line, from the shared `SectionSegmenter`, so that
+  `section(name)` returns a section's lines directly
+- `sections`: the first line mentioning each registered section's keywords, found in one
+  pass (the fallback for resumes whose headers the segmenter does not recognize)
+
+Extractors accept either a plain string or a ResumeDocument; `as_document` wraps a
+string so that standalone calls keep working (and only compute the views they use).
+
+Classes:
+    ResumeDocument: Pre-processed resume text shared across extractors.
+
+Dependencies:
+    - re: for efficient regex matching
+    - functools: for lazily computed, cached views
+    - typing: for type hints and annotations
+    - ai.extractors.resume.section_segmenter: header-based section segmentation
+"""
+
+
+import re
+from functools import cached_property
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ai.extractors.resume.section_segmenter import Segments, default_segmenter
+
+
+class ResumeDocument:
+    """
+    Resume text with its lower-cased form, stripped lines, line offsets and section
+    headers, each computed once and reused by every extractor.
+
+    Attributes:
+        text (str): The raw resume text.
+        section_headers (Dict[str, List[str]]): Header keywords per section name; the
+            first line containing one of a section's keywords is its header.
+    """
+
+    def __init__(self, text: str, section_headers: Optional[Dict[str, Sequence[str]]] = None):
+        """
+        Initializes the ResumeDocument.
+
+        Args:
+            text (str): Raw resume text.
+            section_headers (Optional[Dict[str, Sequence[str]]]): Sections to locate in
+                `sections`, mapped to their (lower-case) header keywords.
+        """
+        self.text = text
+        self.section_headers = section_headers or {}
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def _tokens(self) -> Tuple[List[str], List[int]]:
+        lines, offsets = [], []
+        pos = 0
+        for raw in self.text.split('\n'):
+            line = raw.strip()
+            if line:
+                lines.append(line)
+                offsets.append(pos + len(raw) - len(raw.lstrip()))
+            pos += len(raw) + 1
+        return lines, offsets
+
+    @property
+    def lines(self) -> List[str]:
+        """Stripped, non-empty lines of the text."""
+        return self._tokens[0]
+
+    @property
+    def line_offsets(self) -> List[int]:
+        """Offset in `text` of the first character of each entry of `lines`."""
+        return self._tokens[1]
+
+    @cached_property
+    def lower_lines(self) -> List[str]:
+        """Lower-cased `lines`."""
+        return [line.lower() for line in self.lines]
+
+    @cached_property
+    def segments(self) -> Segments:
+        """Section labels and line ranges of `lines`, from the shared SectionSegmenter."""
+        return default_segmenter().segment(self.lines)
+
+    def section(self, name: str) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Lines of a section, as detected by the segmenter.
+
+        Args:
+            name (str): Section name (see `DEFAULT_SECTION_HEADERS`).
+
+        Returns:
+            Optional[Tuple[List[str], List[str]]]: The body lines of every header of the
+                section and their lower-cased copies, or None if it has no header line.
+        """
+        lines = self.segments.select(name, self.lines)
+        if lines is None:
+            return None
+        return lines, self.segments.select(name, self.lower_lines)
+
+    @cached_property
+    def sections(self) -> Dict[str, int]:
+        """
+        Index (into `lines`) of the first header line of every section of
+        `section_headers` present in the text, found in a single pass over the lines.
+        """
+        patterns = {
+            name: re.compile("|".join(re.escape(k) for k in keywords))
+            for name, keywords in self.section_headers.items() if keywords
+        }
+        sections: Dict[str, int] = {}
+        for i, line in enumerate(self.lower_lines):
+            for name, pattern in patterns.items():
+                if name not in sections and pattern.search(line):
+                    sections[name] = i
+            if len(sections) == len(patterns):
+                break
+        return sections
+
+    def header_line(self, name: str, keywords: Sequence[str]) -> Optional[int]:
+        """
+        Index of the first line containing one of `keywords`, or None.
+
+        Uses the precomputed `sections` map when `keywords` are the ones registered for
+        `name`, and scans the lines otherwise (e.g. for a standalone extractor).
+
+        Args:
+            name (str): Section name.
+            keywords (Sequence[str]): Lower-case header keywords.
+
+        Returns:
+            Optional[int]: Index into `lines` / `lower_lines`.
+        """
+        if self.section_headers.get(name) == keywords:
+            return self.sections.get(name)
+        for i, line in enumerate(self.lower_lines):
+            if any(k in line for k in keywords):
+                return i
+        return None
+
+
+def as_document(text: Union[str, ResumeDocument]) -> ResumeDocument:
+    """
+    Return `text` unchanged if it is already a ResumeDocument, else wrap it in one.
+    """
+    return text if isinstance(text, ResumeDocument) else ResumeDocument(text)
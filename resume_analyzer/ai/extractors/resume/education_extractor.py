@@ -1,5 +1,7 @@
 import re
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+
+from ai.extractors.resume.document import ResumeDocument, as_document
 
 class EducationExtractor:
     """
@@ -27,8 +29,27 @@ class EducationExtractor:
             "B.Tech", "M.Tech", "MBA", "MCA", "BBA", "LLB", "LLM", "MD", "DDS", "Diploma", "High School",
             "Associate Degree", "Doctorate", "Postgraduate", "Undergraduate", "MBBS", "CFA", "CA", "M.Ed", "EdD"
         ]
+        self._compiled = (None, None, [])
+
+    def _degree_patterns(self) -> Tuple[Optional[re.Pattern], List[Tuple[str, re.Pattern]]]:
+        """
+        Returns the compiled degree patterns, rebuilt only when `known_degrees` changes.
 
-    def extract(self, text: str) -> Optional[List[Dict[str, Optional[str]]]]:
+        Returns:
+            Tuple[Optional[re.Pattern], List[Tuple[str, re.Pattern]]]: A combined pattern
+                matching any degree (used to skip lines without one), and one pattern per
+                degree in list order.
+        """
+        key = tuple(self.known_degrees)
+        if self._compiled[0] != key:
+            per_degree = [(degree, re.compile(rf'\b{re.escape(degree)}\b', re.IGNORECASE)) for degree in key]
+            any_degree = re.compile(
+                r'\b(?:' + '|'.join(re.escape(degree) for degree in key) + r')\b', re.IGNORECASE
+            ) if key else None
+            self._compiled = (key, any_degree, per_degree)
+        return self._compiled[1], self._compiled[2]
+
+    def extract(self, text: Union[str, ResumeDocument]) -> Optional[List[Dict[str, Optional[str]]]]:
         """
         Extracts education entries from the given resume text.
 
@@ -36,7 +57,8 @@ class EducationExtractor:
         institution name, graduation year, and the raw line from the text.
 
         Args:
-            text (str): The resume text to extract education information from.
+            text (Union[str, ResumeDocument]): The resume text to extract education information from,
+                or a shared ResumeDocument.
 
         Returns:
             Optional[List[Dict[str, Optional[str]]]]: A list of dictionaries, each containing:
@@ -49,14 +71,16 @@ class EducationExtractor:
         if not text:
             return None
 
-        lines = text.split('\n')
         education_data = []
+        any_degree, degree_patterns = self._degree_patterns()
+        if any_degree is None:
+            return None
 
-        for line in lines:
-            line_clean = line.strip()
-            for degree in self.known_degrees:
-                pattern = rf'\b{re.escape(degree)}\b'
-                if re.search(pattern, line_clean, re.IGNORECASE):
+        for line_clean in as_document(text).lines:
+            if not any_degree.search(line_clean):
+                continue
+            for degree, pattern in degree_patterns:
+                if pattern.search(line_clean):
                     # Extract year: Look for 4-digit numbers or date formats like "Month Year"
                     year_match = re.search(r'\b(19|20)\d{2}\b', line_clean)
                     if not year_match:
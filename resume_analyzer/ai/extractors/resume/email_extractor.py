@@ -23,6 +23,8 @@ Typical Use Cases:
 import re
 from typing import List, Optional, Union
 
+from ai.extractors.resume.document import ResumeDocument
+
 class EmailExtractor:
     """
     A utility class to extract email addresses from unstructured text such as resumes,
@@ -45,22 +47,23 @@ class EmailExtractor:
         ]
         self.email_pattern = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
 
-    def extract(self, text: str, return_all: bool = False) -> Union[str, List[str], None]:
+    def extract(self, text: Union[str, ResumeDocument], return_all: bool = False) -> Union[str, List[str], None]:
         """
         Extract email addresses from a block of text, correcting common obfuscations.
 
         Args:
-            text (str): The input text (e.g., resume content or job post).
+            text (Union[str, ResumeDocument]): The input text (e.g., resume content or job post),
+                or a shared ResumeDocument.
             return_all (bool): If True, return all detected emails. If False, return only the first match.
 
         Returns:
             Union[str, List[str], None]: The first email address (default), a list of all emails,
                                             or None if no match is found.
         """
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, (str, ResumeDocument)):
             return None
 
-        cleaned_text = text.lower()
+        cleaned_text = text.lower if isinstance(text, ResumeDocument) else text.lower()
         for pattern, replacement in self.obfuscations:
             cleaned_text = re.sub(pattern, replacement, cleaned_text, flags=re.IGNORECASE)
 
@@ -11,8 +11,10 @@ section headers and extracts key components such as:
 - Bullet-point Descriptions
 - Raw Matched Line
 
-The parser uses regex patterns to match title-company formats and date ranges, and stops 
-at common section boundaries such as "Education" or "Certifications".
+The parser uses regex patterns to match title-company formats and date ranges within the
+"Experience" section found by the section segmenter. Without a recognizable header line,
+it scans below the first line mentioning experience and stops at common section
+boundaries such as "Education" or "Certifications".
 
 Classes:
     ExperienceExtractor: Extracts structured experience blocks from resume content.
@@ -24,7 +26,9 @@ Dependencies:
 
 
 import re
-from typing import List, Dict
+from typing import List, Dict, Union
+
+from ai.extractors.resume.document import ResumeDocument, as_document
 
 
 class ExperienceExtractor:
@@ -36,7 +40,7 @@ class ExperienceExtractor:
     employment dates, and bullet-point descriptions.
 
     Methods:
-        extract(text: str, max_lines: int = 40) -> List[Dict[str, str]]:
+        extract(text: Union[str, ResumeDocument], max_lines: int = 40) -> List[Dict[str, str]]:
             Extracts experience entries from resume text.
     """
 
@@ -50,37 +54,37 @@ class ExperienceExtractor:
         )
         self.date_pattern = re.compile(r'(\b\d{4}\b).{0,5}(\bPresent\b|\b\d{4}\b)', re.IGNORECASE)
 
-    def extract(self, text: str, max_lines: int = 40) -> List[Dict[str, str]]:
+    def extract(self, text: Union[str, ResumeDocument], max_lines: int = 40) -> List[Dict[str, str]]:
         """
         Extract structured work experience entries from resume text.
 
         Args:
-            text (str): The full resume text to parse.
-            max_lines (int): Maximum number of lines to scan below the experience header.
+            text (Union[str, ResumeDocument]): The full resume text to parse, or a shared ResumeDocument.
+            max_lines (int): Maximum number of lines to scan below the experience keyword when no
+                experience header line is recognized.
 
         Returns:
             List[Dict[str, str]]: A list of experience entries with keys: Title, Company, Date, Description, Raw.
         """
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        experience_section = []
-        section_found = False
-
-        # Locate the start of the experience section
-        for i, line in enumerate(lines):
-            if not section_found and any(k in line.lower() for k in self.section_keywords):
-                experience_section = lines[i + 1: i + 1 + max_lines]
-                section_found = True
-                break
-
-        if not experience_section:
-            return []
+        doc = as_document(text)
+        experience_section = doc.section("experience")
+        stop_keywords = []
+
+        if experience_section is None:
+            # No header line: scan below the first line mentioning a section keyword
+            header = doc.header_line("experience", self.section_keywords)
+            if header is None:
+                return []
+            start, end = header + 1, header + 1 + max_lines
+            experience_section = (doc.lines[start:end], doc.lower_lines[start:end])
+            stop_keywords = self.stop_keywords
 
         experiences = []
         current = {}
         buffer = []
 
-        for line in experience_section:
-            if any(stop in line.lower() for stop in self.stop_keywords):
+        for line, lower_line in zip(*experience_section):
+            if any(stop in lower_line for stop in stop_keywords):
                 break  # Stop when reaching a new section
 
             # Detect job title - company line
@@ -2,8 +2,9 @@
 InterestExtractor Module
 
 This module provides the InterestExtractor class for parsing and extracting personal interests 
-or hobbies from unstructured resume text. It searches for section headers such as "Interests", 
-"Hobbies", or "Activities", and returns a clean list of individual interest items.
+or hobbies from unstructured resume text. It takes the section under headers such as "Interests", 
+"Hobbies", or "Activities" (from the section segmenter, or the lines after the first mention of
+one of them), and returns a clean list of individual interest items.
 
 The extractor removes bullet points, dashes, and other common delimiters, and splits multi-item lines
 into separate entries. It is useful for resume parsing pipelines, candidate profiling, or personalizing 
@@ -27,7 +28,9 @@ Typical Use Cases:
 
 
 import re
-from typing import List, Optional
+from typing import List, Optional, Union
+
+from ai.extractors.resume.document import ResumeDocument, as_document
 
 
 class InterestExtractor:
@@ -39,7 +42,7 @@ class InterestExtractor:
     splitting section content.
 
     Methods:
-        extract(text: str) -> Optional[List[str]]:
+        extract(text: Union[str, ResumeDocument]) -> Optional[List[str]]:
             Extracts a list of interests from the resume text.
     """
 
@@ -49,35 +52,36 @@ class InterestExtractor:
         """
         self.interest_headers = ["interests", "hobbies", "personal interests", "activities"]
 
-    def extract(self, text: str) -> Optional[List[str]]:
+    def extract(self, text: Union[str, ResumeDocument]) -> Optional[List[str]]:
         """
         Extract interests or hobbies from resume text.
 
         Args:
-            text (str): Full resume content as a string.
+            text (Union[str, ResumeDocument]): Full resume content as a string, or a shared ResumeDocument.
 
         Returns:
             Optional[List[str]]: A list of extracted interest strings, or None if not found.
         """
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, (str, ResumeDocument)):
             return None
 
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        interests_section = []
-        start_collecting = False
-
-        for line in lines:
-            lower_line = line.lower().strip()
-
-            if any(header in lower_line for header in self.interest_headers):
-                start_collecting = True
-                continue
-
-            # Stop collecting if another major section starts (e.g., "Education:", "Skills:")
-            if start_collecting and (re.match(r'^[A-Z][a-zA-Z ]+:$', line) or len(line.split()) <= 2):
-                break
+        doc = as_document(text)
+        section = doc.section("interests")
+        if section is not None:
+            interests_section = section[0]
+        else:
+            # No header line: collect below the first line mentioning interests
+            interests_section = []
+            header = doc.header_line("interests", self.interest_headers)
+            lines = zip(doc.lines[header + 1:], doc.lower_lines[header + 1:]) if header is not None else []
+            for line, lower_line in lines:
+                if any(h in lower_line for h in self.interest_headers):
+                    continue
+
+                # Stop collecting if another major section starts (e.g., "Education:", "Skills:")
+                if re.match(r'^[A-Z][a-zA-Z ]+:$', line) or len(line.split()) <= 2:
+                    break
 
-            if start_collecting:
                 interests_section.append(line)
 
         # Clean and split interest lines
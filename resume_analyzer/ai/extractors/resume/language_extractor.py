@@ -18,7 +18,9 @@ Dependencies:
 
 
 import re
-from typing import List, Optional
+from typing import List, Optional, Union
+
+from ai.extractors.resume.document import ResumeDocument
 
 
 class LanguageExtractor:
@@ -49,20 +51,20 @@ class LanguageExtractor:
             "Finnish", "Ukrainian", "Persian", "Punjabi", "Serbian", "Croatian"
         ]
 
-    def extract(self, text: str) -> Optional[List[str]]:
+    def extract(self, text: Union[str, ResumeDocument]) -> Optional[List[str]]:
         """
         Extracts spoken or written languages from resume text.
 
         Args:
-            text (str): Raw resume or job description text.
+            text (Union[str, ResumeDocument]): Raw resume or job description text, or a shared ResumeDocument.
 
         Returns:
             Optional[List[str]]: Sorted list of detected language names, or None if none found.
         """
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, (str, ResumeDocument)):
             return None
 
-        lower_text = text.lower()
+        lower_text = text.lower if isinstance(text, ResumeDocument) else text.lower()
         results = set()
 
         for lang in self.language_list:
@@ -32,6 +32,8 @@ Typical Use Cases:
 import re
 from typing import List, Dict, Optional, Union
 
+from ai.extractors.resume.document import ResumeDocument
+
 
 class LinkExtractor:
     """
@@ -55,17 +57,20 @@ class LinkExtractor:
         self.custom_domains = custom_domains or {}
         self.strict_mode = strict_mode
 
-    def extract(self, text: str, classify: bool = False) -> Union[List[str], Dict[str, List[str]]]:
+    def extract(self, text: Union[str, ResumeDocument], classify: bool = False) -> Union[List[str], Dict[str, List[str]]]:
         """
         Extract and optionally classify links from the input text.
 
         Args:
-            text (str): The unstructured text (e.g., resume content).
+            text (Union[str, ResumeDocument]): The unstructured text (e.g., resume content),
+                or a shared ResumeDocument.
             classify (bool): If True, categorize the links by type.
 
         Returns:
             Union[List[str], Dict[str, List[str]]]: A list of extracted links, or a categorized dictionary.
         """
+        if isinstance(text, ResumeDocument):
+            text = text.text
         raw_links = set()
 
         # Normalize obfuscations
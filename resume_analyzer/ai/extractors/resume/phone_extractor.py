@@ -27,6 +27,8 @@ Typical Use Cases:
 import re
 from typing import List, Optional, Union
 
+from ai.extractors.resume.document import ResumeDocument
+
 
 class PhoneExtractor:
     """
@@ -52,7 +54,7 @@ class PhoneExtractor:
 
     def extract(
         self,
-        text: str,
+        text: Union[str, ResumeDocument],
         return_all: bool = False,
         format_output: bool = False
     ) -> Union[str, List[str], None]:
@@ -60,17 +62,18 @@ class PhoneExtractor:
         Extract and optionally format phone numbers from raw text using regex.
 
         Args:
-            text (str): Raw text (e.g., resume content or scraped HTML).
+            text (Union[str, ResumeDocument]): Raw text (e.g., resume content or scraped HTML),
+                or a shared ResumeDocument.
             return_all (bool): If True, return all matched phone numbers. Otherwise, return the first.
             format_output (bool): If True, format local 10-digit numbers as (XXX) XXX-XXXX.
 
         Returns:
             Union[str, List[str], None]: The extracted phone number(s), or None if no match is found.
         """
-        if not text or not isinstance(text, str):
+        if not text or not isinstance(text, (str, ResumeDocument)):
             return None
 
-        cleaned = text.lower()
+        cleaned = text.lower if isinstance(text, ResumeDocument) else text.lower()
         for word, digit in self.replacements.items():
             cleaned = cleaned.replace(word, digit)
 
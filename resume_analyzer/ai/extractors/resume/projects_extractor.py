@@ -7,6 +7,7 @@ extracts technologies or skills mentioned in each project using a pluggable skil
 
 Features:
     - Detects project section from standard headers like "Projects" or "Capstone"
+      (via the section segmenter, falling back to keyword search)
     - Extracts project titles and descriptions from unstructured text
     - Optionally extracts technologies using a custom skill extraction function
     - Supports structured or raw output for further processing
@@ -27,7 +28,9 @@ Typical Use Cases:
 
 
 import re
-from typing import List, Optional, Callable, Dict
+from typing import List, Optional, Callable, Dict, Union
+
+from ai.extractors.resume.document import ResumeDocument, as_document
 
 
 class ProjectExtractor:
@@ -63,12 +66,12 @@ class ProjectExtractor:
         self.stop_keywords = ["education", "experience", "certifications", "languages", "interests"]
         self.title_pattern = re.compile(r'^[A-Z][A-Za-z0-9\s\-\(\)]{3,40}$')
 
-    def extract(self, text: str, return_structured: bool = True, max_lines: int = 10) -> List[Dict[str, str]]:
+    def extract(self, text: Union[str, ResumeDocument], return_structured: bool = True, max_lines: int = 10) -> List[Dict[str, str]]:
         """
         Extracts project information from resume text.
 
         Args:
-            text (str): Resume full text.
+            text (Union[str, ResumeDocument]): Resume full text, or a shared ResumeDocument.
             return_structured (bool): If True, return dicts with title, description, technologies.
             max_lines (int): Maximum lines to scan after the section header.
 
@@ -78,23 +81,21 @@ class ProjectExtractor:
                 - 'Description': Project summary text
                 - 'Technologies': List of skills (if extract_skills_fn is provided)
         """
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        project_start = None
-
-        for i, line in enumerate(lines):
-            if any(kw in line.lower() for kw in self.project_keywords):
-                project_start = i + 1
-                break
-
-        if project_start is None:
-            return []
-
-        # Collect lines after the project section until a new section
-        block = []
-        for line in lines[project_start:]:
-            if any(kw in line.lower() for kw in self.stop_keywords):
-                break
-            block.append(line)
+        doc = as_document(text)
+        section = doc.section("projects")
+        if section is not None:
+            block = section[0]
+        else:
+            # No header line: collect lines after the first project keyword until a new section
+            header = doc.header_line("projects", self.project_keywords)
+            if header is None:
+                return []
+
+            block = []
+            for line, lower_line in zip(doc.lines[header + 1:], doc.lower_lines[header + 1:]):
+                if any(kw in lower_line for kw in self.stop_keywords):
+                    break
+                block.append(line)
 
         projects = []
         current = {"Title": None, "Description": [], "Technologies": []}
@@ -13,7 +13,13 @@ The ResumeExtractor leverages modular components to extract:
 - Personal interests or hobbies
 
 Each component uses pattern matching, heuristics, and customizable keyword lists to handle 
-varied resume formats reliably.
+varied resume formats reliably. The text is tokenized once per parse into a shared
+`ResumeDocument` (lower-cased text, stripped lines, line offsets, sections labelled by the
+`SectionSegmenter`), so the extractors do not each re-split and re-scan it, and the
+section-based extractors only read their own section.
+
+For bulk parsing on every core, `ai.extractors.resume.batch_parser` provides `parse_many`
+(texts) and `parse_files` (PDF/DOCX/TXT files) on a pool of pre-initialized workers.
 
 Returns:
     A structured dictionary containing:
@@ -37,6 +43,7 @@ Typical Use Cases:
 
 from typing import Dict, Any, Optional
 
+from ai.extractors.resume.document import ResumeDocument
 from ai.extractors.resume.skiils_extractor import SkillExtractor
 from ai.extractors.resume.email_extractor import EmailExtractor
 from ai.extractors.resume.phone_extractor import PhoneExtractor
@@ -94,6 +101,13 @@ class ResumeExtractor:
         self.interest_extractor = InterestExtractor()
         self.language_extractor = LanguageExtractor()
         self.education_extractor = EducationExtractor()
+        # Keyword fallback of the section-based extractors, located once per document when the
+        # segmenter finds no header line for their section
+        self.section_headers = {
+            "experience": self.experience_extractor.section_keywords,
+            "projects": self.project_extractor.project_keywords,
+            "interests": self.interest_extractor.interest_headers,
+        }
 
     def parse(self, text: str, classify_links: bool = True) -> Dict[str, Optional[Any]]:
         """
@@ -106,17 +120,18 @@ class ResumeExtractor:
         Returns:
             Dict[str, Optional[Any]]: Parsed resume content.
         """
+        doc = ResumeDocument(text, self.section_headers)
         return {
-            "Email": self.email_extractor.extract(text),
-            "Phone": self.phone_extractor.extract(text),
-            "Links": self.link_extractor.extract(text, classify=classify_links),
-            "Skills": self.skill_extractor.extract_skills(text),
-            "Projects": self.project_extractor.extract(text),
-            "Experience": self.experience_extractor.extract(text),
-            "Certifications": self.certification_extractor.extract(text),
-            "Languages": self.language_extractor.extract(text),
-            "Interests": self.interest_extractor.extract(text),
-            "Education": self.education_extractor.extract(text)
+            "Email": self.email_extractor.extract(doc),
+            "Phone": self.phone_extractor.extract(doc),
+            "Links": self.link_extractor.extract(doc, classify=classify_links),
+            "Skills": self.skill_extractor.extract_skills(doc),
+            "Projects": self.project_extractor.extract(doc),
+            "Experience": self.experience_extractor.extract(doc),
+            "Certifications": self.certification_extractor.extract(doc),
+            "Languages": self.language_extractor.extract(doc),
+            "Interests": self.interest_extractor.extract(doc),
+            "Education": self.education_extractor.extract(doc)
         }
         
 
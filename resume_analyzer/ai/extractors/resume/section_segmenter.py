@@ -0,0 +1,211 @@
+"""
+SectionSegmenter Module
+
+This module provides the SectionSegmenter class, which splits resume lines into sections
+(Experience, Education, Projects, ...) in a single pass. All known header phrases are
+compiled into one anchored regular expression, so each line is tested against every
+header at once instead of once per keyword. A line is a header when, apart from bullets
+or decoration, it consists of a header phrase, optionally followed by a colon and inline
+content (e.g. "WORK EXPERIENCE", "Skills: Python, SQL", "## Projects ##"). A phrase
+inside a sentence ("5 years of experience") or on a bullet line ("- Research") is not a
+header.
+
+Headers outside the vocabulary still end the previous section when the document writes
+its headers in capitals: a short bare ALL-CAPS line (at most four words of letters, no
+digits or sentence punctuation) is then a generic boundary, and its lines belong to no
+section. Title-Case lines are not treated this way, because job titles, project names
+and one-per-line interests look the same.
+
+Every line is labelled with the section it belongs to, and each section's line ranges
+are kept in a dictionary, so an extractor can slice out its own section directly.
+
+Classes:
+    SectionSegmenter: Compiles the header vocabulary and segments lists of lines.
+    Segments: The result of segmenting one document.
+
+Dependencies:
+    - re: for efficient regex matching
+    - functools: for the shared default segmenter
+    - typing: for type hints and annotations
+"""
+
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Canonical section -> header phrases (lower-case)
+DEFAULT_SECTION_HEADERS: Dict[str, List[str]] = {
+    "summary": ["summary", "professional summary", "career summary", "career objective", "objective",
+                "profile", "professional profile", "about me"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "skills & tools", "skills and tools",
+               "core competencies", "competencies", "soft skills"],
+    "experience": ["experience", "work experience", "professional experience", "relevant experience",
+                   "work history", "employment", "employment history", "professional background", "internships"],
+    "education": ["education", "academic background", "education and training", "academic qualifications"],
+    "certifications": ["certifications", "certification", "certificates", "licenses & certifications",
+                       "licenses and certifications"],
+    "courses": ["courses", "coursework", "relevant coursework", "training", "trainings", "courses & training",
+                "courses and training", "training & courses", "training and courses"],
+    "projects": ["projects", "project", "personal projects", "personal project", "academic projects",
+                 "key projects", "capstone", "capstone project"],
+    "languages": ["languages", "language skills"],
+    "interests": ["interests", "personal interests", "hobbies", "hobbies & interests", "hobbies and interests",
+                  "interests & hobbies", "interests and hobbies", "activities", "extracurricular activities"],
+    "awards": ["awards", "honors", "honors & awards", "awards & honors", "achievements", "accomplishments"],
+    "publications": ["publications"],
+    "volunteer": ["volunteer", "volunteering", "volunteer experience"],
+    "references": ["references"],
+    "contact": ["contact", "contact information", "personal information", "personal details"],
+    "declaration": ["declaration", "self declaration"],
+}
+
+# A bare line of up to four words of letters, decorated like a header
+_GENERIC_HEADER_RE = re.compile(r"^[#=_~|>\s]*[^\W\d_]+(?:\s*[&/-]?\s*[^\W\d_]+){0,3}\s*:?[\s#=_~|-]*$")
+
+
+class Segments:
+    """
+    Sections of one segmented document.
+
+    Attributes:
+        labels (List[Optional[str]]): Section of every line (header lines carry their own
+            section; lines before the first header are None).
+        headers (List[Tuple[int, Optional[str], str]]): `(line index, section, inline
+            content)` of every header line, in order; generic boundaries have section None.
+        spans (Dict[str, List[Tuple[int, int]]]): `[start, end)` line ranges of each
+            section's body (the lines after its header), in document order.
+    """
+
+    def __init__(self, labels: List[Optional[str]], headers: List[Tuple[int, Optional[str], str]]):
+        self.labels = labels
+        self.headers = headers
+        self.spans: Dict[str, List[Tuple[int, int]]] = {}
+        ends = [i for i, _, _ in headers[1:]] + [len(labels)]
+        for (i, section, _), end in zip(headers, ends):
+            if section is not None:
+                self.spans.setdefault(section, []).append((i + 1, end))
+
+    def __contains__(self, section: str) -> bool:
+        return section in self.spans
+
+    def select(self, section: str, lines: Sequence[str]) -> Optional[List[str]]:
+        """
+        Body lines of `section` (all of its spans, in order) taken from `lines`, the
+        sequence that was segmented (or one aligned with it, e.g. its lower-cased copy).
+
+        Args:
+            section (str): Section name.
+            lines (Sequence[str]): Lines aligned with the segmented ones.
+
+        Returns:
+            Optional[List[str]]: The section's lines, or None if it has no header.
+        """
+        spans = self.spans.get(section)
+        if spans is None:
+            return None
+        if len(spans) == 1:
+            start, end = spans[0]
+            return list(lines[start:end])
+        return [line for start, end in spans for line in lines[start:end]]
+
+
+class SectionSegmenter:
+    """
+    Labels resume lines with their section using one compiled header pattern.
+
+    Attributes:
+        section_headers (Dict[str, List[str]]): Header phrases per section name.
+    """
+
+    def __init__(self, section_headers: Optional[Dict[str, List[str]]] = None):
+        """
+        Initializes the SectionSegmenter and compiles its header pattern.
+
+        Args:
+            section_headers (Optional[Dict[str, List[str]]]): Header phrases per section.
+                If None, DEFAULT_SECTION_HEADERS is used.
+        """
+        self.section_headers = section_headers or DEFAULT_SECTION_HEADERS
+        self._sections: Dict[str, str] = {}
+        for section, phrases in self.section_headers.items():
+            for phrase in phrases:
+                self._sections[" ".join(phrase.lower().split())] = section
+
+        # Longest phrases first, so "work experience" is not read as "work" + text
+        alternatives = sorted(self._sections, key=len, reverse=True)
+        header = "|".join(r"\s+".join(re.escape(word) for word in phrase.split()) for phrase in alternatives)
+        self.pattern = re.compile(
+            rf"^[#=_~|>\s]*(?P<header>{header})(?:\s*:(?P<inline>.*)|[^\w\n]*)$",
+            re.IGNORECASE
+        )
+
+    def match(self, line: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Test whether a line is a section header.
+
+        Args:
+            line (str): A single line of text.
+
+        Returns:
+            Optional[Tuple[str, str, str]]: `(section, header text, inline content)` for a
+                header line, otherwise None.
+        """
+        m = self.pattern.match(line)
+        section = self._section(m)
+        if section is None:
+            return None
+        return section, " ".join(m.group("header").split()), (m.group("inline") or "").strip()
+
+    def _section(self, m: Optional[re.Match]) -> Optional[str]:
+        # Unicode case folding can match characters that lower() does not map back
+        return self._sections.get(" ".join(m.group("header").lower().split())) if m else None
+
+    def segment(self, lines: Sequence[str]) -> Segments:
+        """
+        Label every line with its section in a single pass.
+
+        Args:
+            lines (Sequence[str]): Document lines.
+
+        Returns:
+            Segments: Per-line labels, header lines and per-section line ranges.
+        """
+        match = self.pattern.match
+        found = [(m, self._section(m)) for m in map(match, lines)]
+        # Unknown ALL-CAPS headers only count in documents whose known headers are capitals
+        caps = any(section is not None and m.group("header").isupper() for m, section in found)
+
+        labels: List[Optional[str]] = []
+        headers: List[Tuple[int, Optional[str], str]] = []
+        current = None
+        for i, (line, (m, section)) in enumerate(zip(lines, found)):
+            if section is not None:
+                current = section
+                headers.append((i, current, (m.group("inline") or "").strip()))
+            elif caps and self.is_generic_header(line):
+                current = None
+                headers.append((i, None, ""))
+            labels.append(current)
+        return Segments(labels, headers)
+
+    @staticmethod
+    def is_generic_header(line: str) -> bool:
+        """
+        Test whether a line outside the header vocabulary looks like an ALL-CAPS header.
+
+        Args:
+            line (str): A single line of text.
+
+        Returns:
+            bool: True for a short bare ALL-CAPS line without digits or sentence punctuation.
+        """
+        return line.isupper() and sum(c.isalpha() for c in line) >= 4 and bool(_GENERIC_HEADER_RE.match(line))
+
+
+@lru_cache(maxsize=1)
+def default_segmenter() -> SectionSegmenter:
+    """
+    Shared SectionSegmenter for DEFAULT_SECTION_HEADERS, compiled on first use.
+    """
+    return SectionSegmenter()
@@ -8,11 +8,16 @@ It supports skill frequency counting, category grouping, case preservation,
 minimum frequency filtering, and efficient precompiled regex matching. 
 Skill categories can be customized or default to a comprehensive modern tech stack.
 
+All skills are compiled once, at construction, into a single `SkillMatcher` regex, so
+each text is scanned once instead of once per skill. Large external taxonomies such as
+`ai/data/skills.json` (with synonyms and categories) can replace the default skills via
+`taxonomy_path`; their compiled matcher is cached on disk and shared in-process.
+
 Classes:
     SkillExtractor: Extracts relevant skills from text based on predefined or user-supplied categories.
     
 Dependencies:
-    - re: for efficient regex matching
+    - ai.utils.skill_matcher: single-pass compiled skill matching
     - collections: for efficient data structures and operations
     - typing: for type hints and annotations
 
@@ -23,10 +28,12 @@ Typical Use Cases:
     - Career recommendation systems
 """
 
-import re
 from collections import defaultdict
 from typing import Optional, Union, List, Dict
 
+from ai.extractors.resume.document import ResumeDocument
+from ai.utils.skill_matcher import SkillMatcher, load_skill_matcher
+
 class SkillExtractor:
     """
     Extracts technical and soft skills from a resume or job description text using customizable skill categories.
@@ -35,15 +42,22 @@ class SkillExtractor:
         skill_set (dict): A dictionary mapping skill categories to lists of skill keywords.
     """
 
-    def __init__(self, skill_set: Optional[dict] = None):
+    def __init__(self, skill_set: Optional[dict] = None, taxonomy_path: Optional[str] = None):
         """
         Initialize the SkillExtractor with an optional custom skill set.
 
         Args:
             skill_set (dict, optional): A dictionary mapping categories to skill keywords.
                 If not provided, default categories and skills will be used.
+            taxonomy_path (str, optional): Skill taxonomy JSON (e.g. `ai/data/skills.json`)
+                to use instead of `skill_set`; synonyms are reported as their skill.
         """
-        self.skill_set = skill_set or self._default_skills()
+        if taxonomy_path:
+            self._matcher = load_skill_matcher(taxonomy_path)
+            self.skill_set = self._matcher.skill_set
+        else:
+            self.skill_set = skill_set or self._default_skills()
+            self._matcher = SkillMatcher(self.skill_set)
         
         
     def _default_skills(self) -> dict:
@@ -94,7 +108,7 @@ class SkillExtractor:
 
     def extract_skills(
         self,
-        text: str,
+        text: Union[str, ResumeDocument],
         return_freq: bool = False,
         return_grouped: bool = False
     ) -> Union[List[str], Dict[str, Union[int, List[str]]], None]:
@@ -102,7 +116,8 @@ class SkillExtractor:
         Extract skills from a given text based on the provided or default skill set.
 
         Args:
-            text (str): The input resume or job description text.
+            text (Union[str, ResumeDocument]): The input resume or job description text,
+                or a shared ResumeDocument (its lower-cased text is reused).
             return_freq (bool): If True, returns a dictionary with skill frequencies.
             return_grouped (bool): If True, returns a dictionary grouping skills by category.
 
@@ -112,20 +127,16 @@ class SkillExtractor:
                 - If return_freq is True: Dictionary with skill name as key and frequency as value.
                 - Otherwise: List of matched skill names.
         """
-        text = text.lower()
+        text = text.lower if isinstance(text, ResumeDocument) else text.lower()
         skills_found = defaultdict(list if return_grouped else int)
 
-        for category, skills in self.skill_set.items():
-            for skill in skills:
-                pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-                matches = re.findall(pattern, text)
-                if matches:
-                    if return_grouped:
-                        skills_found[category].append(skill)
-                    elif return_freq:
-                        skills_found[skill] += len(matches)
-                    else:
-                        skills_found[skill] = 1
+        for category, skill, count in self._matcher.matches(text):
+            if return_grouped:
+                skills_found[category].append(skill)
+            elif return_freq:
+                skills_found[skill] += count
+            else:
+                skills_found[skill] = 1
 
         if return_grouped:
             return {k: sorted(set(v)) for k, v in skills_found.items() if v}
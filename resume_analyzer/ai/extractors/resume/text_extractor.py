@@ -29,6 +29,8 @@ from docx import Document
 import os
 import re
 
+from ai.extractors.resume.section_segmenter import default_segmenter
+
 class ResumeTextExtractor:
     """
     Extracts and cleans text from resumes in PDF or DOCX format.
@@ -141,7 +143,9 @@ class ResumeTextExtractor:
         Cleans the extracted raw text by normalizing layout and section headers.
 
         This includes collapsing extra newlines, standardizing bullet characters,
-        and converting section headers (like 'Education', 'Skills') to a consistent format.
+        and converting section header lines (like 'EDUCATION', 'Work Experience') to a
+        consistent 'Title:' format. Header lines are recognized by the shared
+        SectionSegmenter, so section words inside sentences are left untouched.
 
         Args:
             raw_text (str): The raw text extracted from the resume.
@@ -158,12 +162,12 @@ class ResumeTextExtractor:
         text = re.sub(r'^\s*[•·●‣▪]', '-', text, flags=re.MULTILINE)
 
         # Normalize section headers
-        section_keywords = [
-            "Summary", "Professional Summary", "Career Objective",
-            "Skills", "Experience", "Education", "Certifications",
-            "Projects", "Languages", "Interests", "Volunteer", "References"
-        ]
-        for keyword in section_keywords:
-            text = re.sub(rf"\b{re.escape(keyword)}\b", f"{keyword}:", text, flags=re.IGNORECASE)
-
-        return text
+        segmenter = default_segmenter()
+        lines = text.split("\n")
+        for i, line in enumerate(lines):
+            header = segmenter.match(line)
+            if header:
+                _, title, inline = header
+                lines[i] = f"{title.title()}:" + (f" {inline}" if inline else "")
+
+        return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""
+Benchmark SkillExtractor's single-pass matcher against the previous per-skill regex loop.
+
+Resumes are read from the given text files (or every `.txt` file of a directory);
+without paths, synthetic resumes are assembled from the default skill names and filler
+text. Every output mode is checked for identical results before timing. `--taxonomy`
+benchmarks a large JSON skill dictionary (e.g. `ai/data/skills.json`, synonyms ignored by
+the baseline) instead of the built-in skill set.
+
+Usage:
+    python -m ai.scripts.benchmark_skill_extractor
+    python -m ai.scripts.benchmark_skill_extractor resumes/ --repeat 5
+    python -m ai.scripts.benchmark_skill_extractor --taxonomy ai/data/skills.json
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+from collections import defaultdict
+from typing import List
+
+from ai.extractors.resume.skiils_extractor import SkillExtractor
+
+MODES = [
+    {},
+    {"return_freq": True},
+    {"return_grouped": True},
+]
+
+FILLER = (
+    "Worked with cross-functional teams to deliver features on time. Responsible for design, "
+    "code review and deployment. Improved performance by 30% and reduced costs. "
+).split()
+
+
+def baseline_extract_skills(skill_set: dict, text: str, return_freq: bool = False, return_grouped: bool = False):
+    # Previous implementation: one regex scan of the text per skill
+    text = text.lower()
+    skills_found = defaultdict(list if return_grouped else int)
+    for category, skills in skill_set.items():
+        for skill in skills:
+            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
+            matches = re.findall(pattern, text)
+            if matches:
+                if return_grouped:
+                    skills_found[category].append(skill)
+                elif return_freq:
+                    skills_found[skill] += len(matches)
+                else:
+                    skills_found[skill] = 1
+    if return_grouped:
+        return {k: sorted(set(v)) for k, v in skills_found.items() if v}
+    elif return_freq:
+        return dict(sorted(skills_found.items(), key=lambda x: -x[1]))
+    else:
+        return sorted(skills_found.keys()) if skills_found else None
+
+
+def load_texts(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, f) for f in sorted(os.listdir(path)) if f.endswith(".txt"))
+        else:
+            files.append(path)
+    texts = []
+    for file in files:
+        with open(file, encoding="utf-8", errors="ignore") as f:
+            texts.append(f.read())
+    return texts
+
+
+def synthetic_texts(skill_set: dict, count: int, words: int = 600) -> List[str]:
+    rng = random.Random(0)
+    skills = [skill for skills in skill_set.values() for skill in skills]
+    return [
+        " ".join(rng.choice(skills) if rng.random() < 0.08 else rng.choice(FILLER) for _ in range(words))
+        for _ in range(count)
+    ]
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="Resume .txt files or directories")
+    parser.add_argument("--count", type=int, default=200, help="Synthetic resumes when no paths are given")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--taxonomy", default=None, help="Skill taxonomy JSON to load instead of the defaults")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    extractor = SkillExtractor(taxonomy_path=args.taxonomy)
+    build_ms = (time.perf_counter() - start) * 1e3
+    skill_set = extractor.skill_set
+    texts = load_texts(args.paths) if args.paths else synthetic_texts(skill_set, args.count)
+    n_skills = sum(len(skills) for skills in skill_set.values())
+    print(f"{len(texts)} resumes, {n_skills} skills, matcher compiled in {build_ms:.1f}ms")
+
+    for mode in MODES:
+        for text in texts:
+            assert extractor.extract_skills(text, **mode) == baseline_extract_skills(skill_set, text, **mode), \
+                f"results differ from the baseline ({mode})"
+
+    print(f"{'mode':>16} {'baseline ms':>12} {'matcher ms':>11} {'speedup':>8}")
+    for mode in MODES:
+        name = next(iter(mode), "list")
+        t_base = best_of(lambda: [baseline_extract_skills(skill_set, t, **mode) for t in texts], args.repeat)
+        t_new = best_of(lambda: [extractor.extract_skills(t, **mode) for t in texts], args.repeat)
+        per_doc = 1e3 / len(texts)
+        print(f"{name:>16} {t_base * per_doc:>12.3f} {t_new * per_doc:>11.3f} {t_base / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
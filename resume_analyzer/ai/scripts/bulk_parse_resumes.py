@@ -0,0 +1,67 @@
+"""
+Parse a large collection of resume files in parallel and write the results as JSON lines.
+
+Files are read from the given paths (directories are walked recursively for `.pdf`,
+`.docx` and `.txt` files) and parsed on a process pool with one pre-initialized
+`ResumeExtractor` per worker. Each output line holds the file path, the parsed fields
+and, for files that could not be processed, the error. Progress and throughput are
+printed to stderr.
+
+Usage:
+    python -m ai.scripts.bulk_parse_resumes legacy_cvs/ --out parsed.jsonl
+    python -m ai.scripts.bulk_parse_resumes legacy_cvs/ --out parsed.jsonl --workers 16 --unordered
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Iterator, List
+
+from ai.extractors.resume.batch_parser import BatchStats, parse_files
+
+EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+def iter_files(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Resume files or directories")
+    parser.add_argument("--out", required=True, help="Output .jsonl file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=8, help="Files sent to a worker at a time")
+    parser.add_argument("--unordered", action="store_true", help="Write results as they complete")
+    parser.add_argument("--every", type=float, default=5.0, help="Seconds between progress lines")
+    args = parser.parse_args()
+
+    state = {"stats": None, "printed": 0.0}
+
+    def progress(stats: BatchStats):
+        state["stats"] = stats
+        if time.perf_counter() - state["printed"] >= args.every:
+            state["printed"] = time.perf_counter()
+            print(stats, file=sys.stderr)
+
+    results = parse_files(iter_files(args.paths), workers=args.workers, chunksize=args.chunksize,
+                          ordered=not args.unordered, progress=progress)
+    with open(args.out, "w", encoding="utf-8") as out:
+        for _, result in results:
+            del result["text"]
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    if state["stats"]:
+        print(f"Done: {state['stats']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from ai.utils.text_processing import normalize_text
+
 # Initialize the SentenceTransformer model (using a pre-trained model)
 model = SentenceTransformer('all-MiniLM-L6-v2')  # Example model for sentence embeddings
 
@@ -19,16 +21,7 @@ def clean_text(text):
     Returns:
         str: Cleaned text.
     """
-    # Convert to lowercase
-    text = text.lower()
-
-    # Remove special characters and numbers
-    text = ''.join([char for char in text if char.isalpha() or char.isspace()])
-
-    # Remove extra spaces
-    text = ' '.join(text.split())
-
-    return text
+    return normalize_text(text)
 
 def get_embeddings(texts):
     """
@@ -0,0 +1,29 @@
+from ai.extractors.resume.batch_parser import parse_files, parse_many
+
+RESUME = "Jane Doe\njane@example.com\nSkills: Python, SQL\n"
+
+
+def test_parse_many_isolates_failures():
+    seen = []
+    results = list(parse_many([RESUME, None, RESUME], workers=1, chunksize=2, progress=seen.append))
+    assert [i for i, _ in results] == [0, 1, 2]
+    assert results[0][1]["error"] is None
+    assert results[0][1]["parsed"]["Email"] == "jane@example.com"
+    assert results[1][1]["parsed"] is None
+    assert results[1][1]["error"].startswith("TypeError")
+    assert seen[-1].done == 3 and seen[-1].failed == 1 and seen[-1].total == 3
+
+
+def test_parse_many_on_a_pool_keeps_input_order():
+    texts = [RESUME.replace("jane", f"user{i}") for i in range(10)]
+    results = list(parse_many(texts, workers=2, chunksize=3))
+    assert [i for i, _ in results] == list(range(10))
+    assert [r["parsed"]["Email"] for _, r in results] == [f"user{i}@example.com" for i in range(10)]
+
+
+def test_parse_files_reports_unreadable_files(tmp_path):
+    path = tmp_path / "cv.txt"
+    path.write_text(RESUME)
+    results = dict(parse_files([str(path), str(tmp_path / "missing.txt")], workers=1, return_text=True))
+    assert results[0]["text"] == RESUME and results[0]["error"] is None
+    assert results[1]["parsed"] is None and results[1]["error"].startswith("FileNotFoundError")
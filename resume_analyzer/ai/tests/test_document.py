@@ -0,0 +1,87 @@
+import pytest
+
+from ai.extractors.resume.document import ResumeDocument, as_document
+from ai.extractors.resume.resume_extractor import ResumeExtractor
+
+RESUME = """
+    Jane Doe
+    jane.doe@example.com | +1 (555) 123-4567
+    github.com/janedoe
+
+    Skills: Python, SQL, Docker
+
+    Projects
+    Resume Parser
+    Built an NLP resume parser in Python.
+
+    Experience
+    Software Engineer - Acme
+    2021 - Present
+    - Built APIs with FastAPI
+
+    Certifications
+    AWS Certified Solutions Architect
+
+    Languages
+    English, French
+
+    Interests
+    Hiking, Chess
+"""
+
+
+def test_lines_and_offsets():
+    doc = ResumeDocument("  Jane Doe \n\n\tSkills: Python\nlast")
+    assert doc.lines == ["Jane Doe", "Skills: Python", "last"]
+    assert doc.lower_lines == ["jane doe", "skills: python", "last"]
+    assert [doc.text[i:i + len(line)] for i, line in zip(doc.line_offsets, doc.lines)] == doc.lines
+    assert doc.lower == doc.text.lower()
+    assert len(doc) == len(doc.text)
+
+
+def test_views_are_computed_once():
+    doc = ResumeDocument(RESUME)
+    assert doc.lines is doc.lines
+    assert doc.segments is doc.segments
+    assert doc.lower_lines is doc.lower_lines
+
+
+def test_sections_finds_first_keyword_line_in_one_pass():
+    doc = ResumeDocument(RESUME, {"projects": ["project"], "hobbies": ["hobbies"], "langs": ["language"]})
+    assert doc.sections == {"projects": 4, "langs": 13}
+    assert doc.header_line("projects", ["project"]) == 4
+    # Keywords other than the registered ones fall back to a scan
+    assert doc.header_line("projects", ["experience"]) == 7
+    assert doc.header_line("hobbies", ["hobbies"]) is None
+
+
+def test_section_reads_segmenter_lines():
+    doc = ResumeDocument("Jane\n\n  Interests  \n Reading, Chess \nDeclaration\nI hereby declare this is true.")
+    assert doc.section("interests") == (["Reading, Chess"], ["reading, chess"])
+    assert doc.section("projects") is None
+
+
+def test_as_document_wraps_strings_only():
+    doc = ResumeDocument(RESUME)
+    assert as_document(doc) is doc
+    assert as_document(RESUME).text == RESUME
+
+
+@pytest.mark.parametrize("text", [RESUME, RESUME.upper(), "", "just one line"])
+def test_parse_matches_standalone_extractors(text):
+    extractor = ResumeExtractor()
+    # Every extractor still accepts a plain string, and sharing one document must
+    # not change its output
+    standalone = {
+        "Email": extractor.email_extractor.extract(text),
+        "Phone": extractor.phone_extractor.extract(text),
+        "Links": extractor.link_extractor.extract(text, classify=True),
+        "Skills": extractor.skill_extractor.extract_skills(text),
+        "Projects": extractor.project_extractor.extract(text),
+        "Experience": extractor.experience_extractor.extract(text),
+        "Certifications": extractor.certification_extractor.extract(text),
+        "Languages": extractor.language_extractor.extract(text),
+        "Interests": extractor.interest_extractor.extract(text),
+        "Education": extractor.education_extractor.extract(text),
+    }
+    assert extractor.parse(text) == standalone
@@ -0,0 +1,92 @@
+import pytest
+
+from ai.extractors.resume.hobbies_extractor import InterestExtractor
+from ai.extractors.resume.section_segmenter import SectionSegmenter, default_segmenter
+
+
+@pytest.fixture(scope="module")
+def segmenter():
+    return default_segmenter()
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("Experience", ("experience", "Experience", "")),
+    ("WORK EXPERIENCE", ("experience", "WORK EXPERIENCE", "")),
+    ("Work   Experience:", ("experience", "Work Experience", "")),
+    ("Skills: Python, SQL", ("skills", "Skills", "Python, SQL")),
+    ("## Projects ##", ("projects", "Projects", "")),
+    ("=== EDUCATION ===", ("education", "EDUCATION", "")),
+    ("Hobbies & Interests", ("interests", "Hobbies & Interests", "")),
+    ("Declaration", ("declaration", "Declaration", "")),
+    ("Soft Skills", ("skills", "Soft Skills", "")),
+    ("Courses", ("courses", "Courses", "")),
+])
+def test_header_lines(segmenter, line, expected):
+    assert segmenter.match(line) == expected
+
+
+@pytest.mark.parametrize("line", [
+    "5 years of experience in Python",
+    "- Research",
+    "• Projects",
+    "Experienced engineer",
+    "Skills Python",
+    "",
+])
+def test_non_header_lines(segmenter, line):
+    assert segmenter.match(line) is None
+
+
+def test_segment_labels_and_spans(segmenter):
+    lines = ["John Doe", "Summary", "Engineer", "Experience", "Dev - Acme", "Built things",
+             "Skills: Python", "Education", "BSc", "Projects", "App"]
+    segments = segmenter.segment(lines)
+    assert segments.labels == [None, "summary", "summary", "experience", "experience", "experience",
+                               "skills", "education", "education", "projects", "projects"]
+    assert segments.spans == {"summary": [(2, 3)], "experience": [(4, 6)], "skills": [(7, 7)],
+                              "education": [(8, 9)], "projects": [(10, 11)]}
+    assert segments.select("experience", lines) == ["Dev - Acme", "Built things"]
+    assert segments.select("languages", lines) is None
+    assert "skills" in segments and "languages" not in segments
+
+
+def test_repeated_section_spans_are_joined(segmenter):
+    lines = ["Projects", "A", "Education", "B", "Projects", "C"]
+    assert segmenter.segment(lines).select("projects", lines) == ["A", "C"]
+
+
+def test_unknown_capital_header_ends_section_in_capitalized_resume(segmenter):
+    lines = ["EXPERIENCE", "Dev - Acme", "INTERESTS", "Reading, Chess", "LEADERSHIP ROLES", "Team captain"]
+    segments = segmenter.segment(lines)
+    assert segments.select("interests", lines) == ["Reading, Chess"]
+    assert segments.labels[-2:] == [None, None]
+
+
+def test_title_case_lines_do_not_end_sections(segmenter):
+    lines = ["Projects", "Resume Analyzer", "Parses resumes.", "Weather App", "Shows forecasts."]
+    assert segmenter.segment(lines).select("projects", lines) == lines[1:]
+
+
+@pytest.mark.parametrize("line, expected", [
+    ("LEADERSHIP ROLES", True),
+    ("== EXTRA CURRICULAR ==", True),
+    ("R&D / TESTING:", True),
+    ("AWS", False),
+    ("SQL SERVER 2019", False),
+    ("I AM HERE.", False),
+    ("ONE TWO THREE FOUR FIVE", False),
+    ("Leadership", False),
+])
+def test_generic_header(line, expected):
+    assert SectionSegmenter.is_generic_header(line) is expected
+
+
+def test_custom_vocabulary():
+    segmenter = SectionSegmenter({"experience": ["Berufserfahrung"]})
+    assert segmenter.match("BERUFSERFAHRUNG") == ("experience", "BERUFSERFAHRUNG", "")
+    assert segmenter.match("Experience") is None
+
+
+def test_declaration_does_not_leak_into_interests():
+    text = "Interests\nReading, Chess\nDeclaration\nI hereby declare that the above information is true."
+    assert InterestExtractor().extract(text) == ["Reading, Chess"]
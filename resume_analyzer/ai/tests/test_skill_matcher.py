@@ -0,0 +1,184 @@
+import json
+import random
+import re
+from collections import defaultdict
+
+import pytest
+
+from ai.extractors.resume.skiils_extractor import SkillExtractor
+from ai.utils import skill_matcher
+from ai.utils.skill_matcher import SkillMatcher, load_skill_matcher, parse_skill_taxonomy
+
+SKILL_SET = {
+    "Programming": ["python", "c", "c++", "c#", "java", "javascript", "go", "r"],
+    "Databases": ["sql", "sql server", "nosql", "mongodb", "postgresql"],
+    "Web": ["node.js", "react", "react native", "html", "css", ".net"],
+    "Soft": ["communication", "team work", "leadership"],
+    "Other": ["machine learning", "deep learning", "ml", "a/b testing", "ci/cd", "python"],
+}
+
+WORDS = [
+    "python", "c", "c++", "c#", "java", "javascript", "go", "r", "sql", "server", "nosql",
+    "mongodb", "postgresql", "node.js", "node", "js", "react", "native", ".net", "net",
+    "html", "css", "communication", "team", "work", "leadership", "machine", "learning",
+    "deep", "ml", "a/b", "testing", "ci/cd", "ci", "and", "with", "in", "of", "the",
+]
+SEPARATORS = [" ", " ", " ", ", ", ". ", "\n", "/", "-", "(", ")", "_", ""]
+
+
+def reference_counts(skill_set, text):
+    """The per-skill regex loop SkillMatcher replaces."""
+    counts = {}
+    for skills in skill_set.values():
+        for skill in skills:
+            matches = re.findall(r"\b" + re.escape(skill.lower()) + r"\b", text)
+            if matches:
+                counts[skill.lower()] = len(matches)
+    return counts
+
+
+def reference_extract(skill_set, text, return_freq=False, return_grouped=False):
+    """The per-skill loop SkillExtractor.extract_skills used to run."""
+    text = text.lower()
+    found = defaultdict(list if return_grouped else int)
+    for category, skills in skill_set.items():
+        for skill in skills:
+            matches = re.findall(r"\b" + re.escape(skill.lower()) + r"\b", text)
+            if matches:
+                if return_grouped:
+                    found[category].append(skill)
+                elif return_freq:
+                    found[skill] += len(matches)
+                else:
+                    found[skill] = 1
+    if return_grouped:
+        return {k: sorted(set(v)) for k, v in found.items() if v}
+    if return_freq:
+        return dict(sorted(found.items(), key=lambda x: -x[1]))
+    return sorted(found.keys()) if found else None
+
+
+def random_text(rng, n_words=60):
+    return "".join(rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(n_words))
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return SkillMatcher(SKILL_SET)
+
+
+def test_counts_match_per_skill_regex_loop(matcher):
+    rng = random.Random(0)
+    for _ in range(500):
+        text = random_text(rng)
+        assert matcher.count(text) == reference_counts(SKILL_SET, text), text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("sql server and sql", {"sql": 2, "sql server": 1}),
+    # `\b` needs a word character on one side, so "c++"/"c#" before a space and
+    # ".net" after one never match, exactly as with the per-skill loop
+    ("c++ and c# but not cobol", {"c": 2}),
+    ("react native apps in react", {"react": 2, "react native": 1}),
+    ("node.js, .net and asp.net", {"node.js": 1, ".net": 1}),
+    ("nothing relevant here", {}),
+])
+def test_prefix_and_symbol_skills(matcher, text, expected):
+    assert matcher.count(text) == expected == reference_counts(SKILL_SET, text)
+
+
+def test_matches_reports_entries_in_skill_set_order(matcher):
+    assert matcher.matches("python, sql and leadership; python again") == [
+        ("Programming", "python", 2),
+        ("Databases", "sql", 1),
+        ("Soft", "leadership", 1),
+        ("Other", "python", 2),
+    ]
+
+
+def test_empty_skill_set_matches_nothing():
+    assert SkillMatcher({}).matches("python") == []
+
+
+def test_skill_extractor_matches_old_loop_on_default_skills():
+    extractor = SkillExtractor()
+    words = [skill for skills in extractor.skill_set.values() for skill in skills] + WORDS
+    rng = random.Random(2)
+    for _ in range(200):
+        text = "".join(rng.choice(words).title() + rng.choice(SEPARATORS) for _ in range(40))
+        for mode in ({}, {"return_freq": True}, {"return_grouped": True}):
+            assert extractor.extract_skills(text, **mode) == reference_extract(extractor.skill_set, text, **mode)
+
+
+def test_synonyms_count_towards_their_skill():
+    matcher = SkillMatcher({"Cloud": ["amazon web services"]}, {"amazon web services": ["aws"]})
+    assert matcher.matches("aws lambda on amazon web services and aws s3") == [
+        ("Cloud", "amazon web services", 3)
+    ]
+
+
+def test_parse_skill_taxonomy_formats():
+    skill_set, synonyms = parse_skill_taxonomy([
+        "git",
+        {"skill": "python", "category": "Programming", "synonyms": ["py"]},
+        {"skill": "python", "category": "Programming", "synonyms": ["py", "python3"]},
+    ])
+    assert skill_set == {"Other": ["git"], "Programming": ["python"]}
+    assert synonyms == {"python": ["py", "python3"]}
+    assert parse_skill_taxonomy({"Data": ["sql", {"skill": "pandas"}]}) == ({"Data": ["sql", "pandas"]}, {})
+
+
+def test_state_round_trips_through_json(matcher):
+    restored = SkillMatcher.from_state(json.loads(json.dumps(matcher.to_state())))
+    rng = random.Random(1)
+    for _ in range(100):
+        text = random_text(rng)
+        assert restored.matches(text) == matcher.matches(text)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_matcher, "_MATCHERS", {})
+    monkeypatch.setattr(skill_matcher, "CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+def test_load_skill_matcher_uses_and_refreshes_json_cache(tmp_path, cache_dir):
+    taxonomy = tmp_path / "skills.json"
+    taxonomy.write_text(json.dumps([{"skill": "python", "synonyms": ["py"]}, "sql"]))
+
+    first = load_skill_matcher(str(taxonomy))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cache", "skills.json"]  # nothing next to the taxonomy
+    [cache] = cache_dir.iterdir()
+    assert cache.name.startswith("skills.") and cache.name.endswith(".matcher.json")
+    assert load_skill_matcher(str(taxonomy)) is first  # memoized per process
+
+    skill_matcher._MATCHERS.clear()
+    cached = load_skill_matcher(str(taxonomy))
+    assert cached is not first
+    assert cached.matches("py and sql") == first.matches("py and sql") == [
+        ("Other", "python", 1), ("Other", "sql", 1)
+    ]
+
+    # A changed taxonomy invalidates the cache
+    taxonomy.write_text(json.dumps(["rust"]))
+    assert load_skill_matcher(str(taxonomy)).matches("rust and sql") == [("Other", "rust", 1)]
+
+
+def test_taxonomies_with_the_same_name_get_separate_caches(tmp_path, cache_dir):
+    for name, skill in (("a", "python"), ("b", "rust")):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "skills.json").write_text(json.dumps([skill]))
+        load_skill_matcher(str(tmp_path / name / "skills.json"))
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path, cache_dir):
+    taxonomy = tmp_path / "skills.json"
+    taxonomy.write_text(json.dumps(["python"]))
+    cache = tmp_path / "cache.json"
+    cache.write_text("{not json")
+
+    assert load_skill_matcher(str(taxonomy), str(cache)).matches("python") == [("Other", "python", 1)]
+    assert json.loads(cache.read_text())["version"] == skill_matcher._CACHE_VERSION
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
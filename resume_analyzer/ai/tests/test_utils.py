@@ -0,0 +1,26 @@
+import pytest
+
+from ai.utils.text_processing import normalize_text
+
+
+def reference_normalize(text):
+    # The per-character filter normalize_text replaced
+    text = "".join(char for char in text.lower() if char.isalpha() or char.isspace())
+    return " ".join(text.split())
+
+
+@pytest.mark.parametrize("text", [
+    "Senior C++/C# Developer (5+ yrs) @ ACME, Inc.",
+    "  python\tSQL\n\nDocker 2024!  ",
+    "Ingénieur logiciel – Zürich",
+    "مهندس بيانات 3",
+    "İstanbul ǅ ß",
+    "",
+])
+def test_normalize_text_matches_character_filter(text):
+    assert normalize_text(text) == reference_normalize(text)
+
+
+def test_normalize_text_ascii_table_covers_every_character():
+    text = "".join(chr(c) for c in range(128))
+    assert normalize_text(text) == reference_normalize(text)
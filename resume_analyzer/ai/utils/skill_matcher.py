@@ -0,0 +1,289 @@
+"""
+Single-pass skill matching shared by the resume and job skill extractors.
+
+`SkillMatcher` compiles every skill of a categorized skill set into one regular
+expression: the lower-cased skill strings are merged into a trie and emitted as nested
+alternations (longest first), wrapped in a lookahead so that matches starting at
+different positions may overlap, exactly like running one `\\b<skill>\\b` search per
+skill. At each start position the regex reports the longest skill followed by a word
+boundary; shorter skills that are prefixes of it ("sql" in "sql server") are then
+checked with a precomputed prefix table. Counts per skill are non-overlapping, as with
+`re.findall`, so results are identical to the per-skill regex loop while the text is
+scanned once.
+
+Large external taxonomies (e.g. `ai/data/skills.json`, with optional categories and
+synonyms) are loaded with `load_skill_matcher`, which keeps the built matcher's pattern
+source and lookup tables in a JSON cache and rebuilds them only when the taxonomy
+content changes. Cache files go to `SKILL_MATCHER_CACHE_DIR` (default
+`$XDG_CACHE_HOME/resume_analyzer/skill_matchers`, i.e. under `~/.cache`), never into the
+source tree. Python cannot persist a compiled regex program, so
+the cached pattern is re-compiled on load; the cache skips the taxonomy parsing, trie
+construction and prefix tables. Being plain data, a cache file in a writable cache
+directory cannot run code when loaded. Matchers are also memoized per process, so every
+extractor instance shares one.
+
+Taxonomy formats:
+    - A list of entries: `"python"` or `{"skill": "python", "category": "...", "synonyms": [...]}`
+      (entries without a category go to "Other").
+    - A mapping `{category: [entry, ...]}` with entries as above.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY = "Other"
+# Bump when the cached SkillMatcher state layout changes
+_CACHE_VERSION = 2
+# Directory for cached matcher states, one file per taxonomy path
+CACHE_DIR = os.getenv("SKILL_MATCHER_CACHE_DIR") or os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "resume_analyzer",
+    "skill_matchers",
+)
+_MATCHERS: Dict[Tuple[str, str], "SkillMatcher"] = {}
+
+
+def _is_word(char: str) -> bool:
+    # Same definition of a word character as the `re` module's `\b` / `\w`
+    return char.isalnum() or char == "_"
+
+
+def _trie_pattern(node: dict) -> str:
+    """
+    Regex for a trie node: children as alternations (longest-first via greedy optional
+    groups), `""` marking that a skill ends at this node.
+    """
+    terminal = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    if terminal:
+        # Greedy optional group: the longer skill is tried first, then this one
+        return "(?:" + "|".join(branches) + ")?"
+    return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+
+class SkillMatcher:
+    """
+    Compiled matcher for a `{category: [skill, ...]}` skill set.
+
+    Attributes:
+        skill_set (Dict[str, List[str]]): The categorized skills.
+        synonyms (Dict[str, List[str]]): Alternative spellings per skill, reported as the skill.
+        entries (List[Tuple[str, str, Tuple[str, ...]]]): `(category, skill, keys)` per
+            skill-set entry, in skill-set order; `keys` are the lower-cased skill and synonyms.
+    """
+
+    def __init__(self, skill_set: Dict[str, List[str]], synonyms: Optional[Dict[str, List[str]]] = None):
+        self.skill_set = skill_set
+        self.synonyms = synonyms or {}
+        self.entries: List[Tuple[str, str, Tuple[str, ...]]] = [
+            (category, skill, tuple(dict.fromkeys(
+                [skill.lower()] + [alias.lower() for alias in self.synonyms.get(skill, [])]
+            )))
+            for category, skills in skill_set.items()
+            for skill in skills
+        ]
+        self._entries_by_key: Dict[str, List[int]] = defaultdict(list)
+        for i, (_, _, keys) in enumerate(self.entries):
+            for key in keys:
+                if key:
+                    self._entries_by_key[key].append(i)
+
+        keys = set(self._entries_by_key)
+        # Shorter skills that can match at the same start as a longer one
+        self._prefixes: Dict[str, List[str]] = {
+            key: [key[:n] for n in range(1, len(key)) if key[:n] in keys] for key in keys
+        }
+
+        trie: dict = {}
+        for key in keys:
+            node = trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        self.pattern: Optional[re.Pattern] = (
+            re.compile(r"\b(?=(" + _trie_pattern(trie) + r")\b)") if keys else None
+        )
+
+    def to_state(self) -> dict:
+        """
+        JSON-serializable state of the built matcher (see `from_state`).
+        """
+        return {
+            "skill_set": self.skill_set,
+            "synonyms": self.synonyms,
+            "entries": self.entries,
+            "entries_by_key": self._entries_by_key,
+            "prefixes": self._prefixes,
+            "pattern": self.pattern.pattern if self.pattern is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "SkillMatcher":
+        """
+        Rebuild a matcher from `to_state` output without re-deriving its tables.
+
+        Args:
+            state (dict): Output of `to_state`, e.g. read back from JSON.
+
+        Returns:
+            SkillMatcher: A matcher equivalent to the one that produced `state`.
+        """
+        matcher = cls.__new__(cls)
+        matcher.skill_set = state["skill_set"]
+        matcher.synonyms = state["synonyms"]
+        matcher.entries = [(category, skill, tuple(keys)) for category, skill, keys in state["entries"]]
+        matcher._entries_by_key = defaultdict(list, state["entries_by_key"])
+        matcher._prefixes = state["prefixes"]
+        matcher.pattern = re.compile(state["pattern"]) if state["pattern"] is not None else None
+        return matcher
+
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Count each skill's non-overlapping whole-word occurrences in lower-cased `text`.
+
+        Args:
+            text (str): Lower-cased text.
+
+        Returns:
+            Dict[str, int]: Lower-cased skill -> number of matches (matched skills only).
+        """
+        counts: Dict[str, int] = {}
+        if self.pattern is None:
+            return counts
+        last_end: Dict[str, int] = {}
+        size = len(text)
+
+        def hit(key: str, start: int) -> None:
+            if start < last_end.get(key, 0):
+                return  # overlaps this skill's previous match (findall semantics)
+            last_end[key] = start + len(key)
+            counts[key] = counts.get(key, 0) + 1
+
+        for match in self.pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1)
+            for key in self._prefixes[longest]:
+                # A shorter skill needs its own trailing word boundary
+                end = start + len(key)
+                if _is_word(text[end - 1]) != (end < size and _is_word(text[end])):
+                    hit(key, start)
+            hit(longest, start)
+        return counts
+
+    def matches(self, text: str) -> List[Tuple[str, str, int]]:
+        """
+        Matched skill-set entries with their counts, in skill-set order.
+
+        Args:
+            text (str): Lower-cased text.
+
+        Returns:
+            List[Tuple[str, str, int]]: `(category, skill, count)` for every entry whose
+                skill (or a synonym) occurs in the text; a skill listed under two categories
+                appears twice. Synonym matches add to their skill's count.
+        """
+        counts = self.count(text)
+        hits = sorted({i for key in counts for i in self._entries_by_key[key]})
+        result = []
+        for i in hits:
+            category, skill, keys = self.entries[i]
+            result.append((category, skill, sum(counts.get(key, 0) for key in keys)))
+        return result
+
+
+def parse_skill_taxonomy(data) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    Convert a taxonomy (see the module docstring) into `(skill_set, synonyms)`.
+
+    Args:
+        data: Parsed taxonomy JSON (a list of entries or a category mapping).
+
+    Returns:
+        Tuple[Dict[str, List[str]], Dict[str, List[str]]]: Skills per category, and
+            synonyms per skill.
+    """
+    skill_set: Dict[str, List[str]] = {}
+    synonyms: Dict[str, List[str]] = {}
+    if isinstance(data, dict):
+        items = [(category, entry) for category, entries in data.items() for entry in entries]
+    else:
+        items = [(None, entry) for entry in data]
+    for category, entry in items:
+        if isinstance(entry, str):
+            skill, aliases = entry, []
+        else:
+            skill, aliases = entry["skill"], entry.get("synonyms", [])
+            category = category or entry.get("category")
+        skills = skill_set.setdefault(category or DEFAULT_CATEGORY, [])
+        if skill not in skills:
+            skills.append(skill)
+        for alias in aliases:
+            known = synonyms.setdefault(skill, [])
+            if alias not in known:
+                known.append(alias)
+    return skill_set, synonyms
+
+
+def load_skill_matcher(path: str, cache_path: Optional[str] = None) -> SkillMatcher:
+    """
+    Load a skill taxonomy JSON into a `SkillMatcher`, reusing the matcher state cached
+    at `cache_path` (default: a file in `CACHE_DIR` named after the taxonomy path)
+    while the JSON content is unchanged.
+
+    Args:
+        path (str): Taxonomy JSON file.
+        cache_path (str, optional): Where to keep the cached matcher state.
+
+    Returns:
+        SkillMatcher: The matcher, shared by every caller in this process.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    abspath = os.path.abspath(path)
+    memo_key = (abspath, digest)
+    matcher = _MATCHERS.get(memo_key)
+    if matcher is not None:
+        return matcher
+
+    if cache_path is None:
+        path_key = hashlib.sha1(abspath.encode("utf-8")).hexdigest()[:12]
+        name = f"{os.path.splitext(os.path.basename(path))[0]}.{path_key}.matcher.json"
+        cache_path = os.path.join(CACHE_DIR, name)
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == _CACHE_VERSION and cached.get("sha256") == digest:
+            matcher = SkillMatcher.from_state(cached["matcher"])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError, re.error):
+        matcher = None
+
+    if matcher is None:
+        matcher = SkillMatcher(*parse_skill_taxonomy(json.loads(raw)))
+        try:
+            cache_dir = os.path.dirname(os.path.abspath(cache_path))
+            os.makedirs(cache_dir, exist_ok=True)
+            # Unique temporary name, so concurrent writers never interleave
+            fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": _CACHE_VERSION, "sha256": digest, "matcher": matcher.to_state()}, f)
+                os.replace(tmp, cache_path)
+            except BaseException:
+                os.remove(tmp)
+                raise
+        except OSError:
+            logger.warning("Could not write skill matcher cache %s", cache_path)
+
+    _MATCHERS[memo_key] = matcher
+    return matcher
@@ -0,0 +1,32 @@
+"""
+Text normalization shared by the resume analyzer's similarity scripts.
+
+`normalize_text` lower-cases a text, drops every character that is neither a letter
+nor whitespace, and collapses whitespace. ASCII input (the common case) is filtered
+with a precomputed `str.translate` deletion table in a single C-level pass; other
+input falls back to the per-character `isalpha()`/`isspace()` filter, so results
+are identical either way.
+"""
+
+# Deletes every ASCII character that is neither a letter nor whitespace
+_ASCII_NON_LETTERS = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if not (chr(c).isalpha() or chr(c).isspace()))
+)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lower-case, keep only letters and whitespace, and collapse whitespace.
+
+    Args:
+        text (str): Raw text.
+
+    Returns:
+        str: Normalized text.
+    """
+    text = text.lower()
+    if text.isascii():
+        text = text.translate(_ASCII_NON_LETTERS)
+    else:
+        text = "".join([char for char in text if char.isalpha() or char.isspace()])
+    return " ".join(text.split())
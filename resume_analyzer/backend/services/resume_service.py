@@ -1,12 +1,23 @@
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, Callable, Iterator, List, Optional
 from sqlalchemy.orm import Session
 from backend.models.resume_model import Resume
+from ai.extractors.resume.batch_parser import BatchStats, parse_files
 from ai.extractors.resume.resume_extractor import ResumeExtractor
 from ai.extractors.resume.text_extractor import ResumeTextExtractor
 import os
 import json
 
 
+@lru_cache(maxsize=1)
+def get_resume_extractor() -> ResumeExtractor:
+    """
+    Shared ResumeExtractor, built (skill matcher and patterns compiled) on first use
+    instead of once per upload.
+    """
+    return ResumeExtractor()
+
+
 def extract_resume_data(file_path: str) -> Dict[str, Any]:
     """
     Extract structured resume information from a PDF or DOCX file.
@@ -30,9 +41,41 @@ def extract_resume_data(file_path: str) -> Dict[str, Any]:
     if not raw_text or len(raw_text.strip()) < 20:
         raise ValueError("Text extraction failed or content is too short.")
 
-    extractor = ResumeExtractor()
-    parsed = extractor.parse(raw_text)
+    parsed = get_resume_extractor().parse(raw_text)
+    return _to_resume_data(file_path, raw_text, parsed)
+
 
+def extract_resume_data_batch(
+    file_paths: List[str],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[BatchStats], None]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Extract structured resume information from many files on a process pool (bulk
+    imports), streaming results in input order.
+
+    Args:
+        file_paths (List[str]): Paths of PDF, DOCX or TXT resume files.
+        workers (Optional[int]): Worker processes (default: CPU count).
+        progress (Optional[Callable[[BatchStats], None]]): Called with progress and
+            throughput after every chunk of files.
+
+    Returns:
+        Iterator[Dict[str, Any]]: Per file, the parsed fields suitable for the Resume
+            model, or {"file_name", "error"} if the file could not be processed.
+    """
+    for _, result in parse_files(file_paths, workers=workers, return_text=True, progress=progress):
+        raw_text = result["text"]
+        if result["error"] or not raw_text or len(raw_text.strip()) < 20:
+            yield {
+                "file_name": os.path.basename(result["path"]),
+                "error": result["error"] or "Text extraction failed or content is too short."
+            }
+            continue
+        yield _to_resume_data(result["path"], raw_text, result["parsed"])
+
+
+def _to_resume_data(file_path: str, raw_text: str, parsed: Dict[str, Any]) -> Dict[str, Any]:
     def to_json(value: Any) -> str | None:
         if value is None:
             return None